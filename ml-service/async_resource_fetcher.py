@@ -0,0 +1,315 @@
+import asyncio
+import json
+import os
+import threading
+import time
+from contextvars import copy_context
+from typing import Callable, Dict, List, Optional, Tuple
+import logging
+
+import aiohttp
+
+from resource_fetcher import Deadline, UniversalResourceFetcher, fetch_deadline
+
+logger = logging.getLogger(__name__)
+
+class AsyncResourceFetcher:
+    """asyncio counterpart of UniversalResourceFetcher with the same method surface.
+
+    Request building, response parsing, fallbacks and caching come from the sync
+    fetcher passed in as ``base``; only the transport is different. One aiohttp
+    session multiplexes every provider call, so a single event loop can keep
+    hundreds of them in flight.
+    """
+
+    def __init__(self, base: UniversalResourceFetcher, max_connections: Optional[int] = None, timeout: float = 10):
+        self.base = base
+        self.max_connections = max_connections or int(os.getenv('ASYNC_MAX_CONNECTIONS', 200))
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self._session: Optional[aiohttp.ClientSession] = None
+
+        # Identical provider queries in flight at the same time share one task
+        self._in_flight: Dict[str, asyncio.Task] = {}
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Create the shared session lazily, inside the running event loop"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.max_connections, ttl_dns_cache=300)
+            self._session = aiohttp.ClientSession(connector=connector, timeout=self.timeout)
+        return self._session
+
+    async def close(self):
+        """Close the underlying HTTP session"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+    async def _get_json(self, provider: str, url: str, params: Dict, on_response: Optional[Callable] = None,
+                        etag: Optional[str] = None) -> Tuple[Optional[object], Optional[str]]:
+        """GET a provider endpoint and decode its JSON body.
+
+        Returns the decoded body and the response ETag. With a stored ETag the
+        request is conditional, and a 304 answer returns ``None`` as the body.
+        """
+        session = await self._get_session()
+        headers = dict(self.base.provider_headers.get(provider) or {})
+        if etag:
+            headers["If-None-Match"] = etag
+        start = time.monotonic()
+        try:
+            async with session.get(url, params=params, headers=headers) as response:
+                body = await response.text()
+        except Exception:
+            self.base._record_provider_outcome(provider, None, time.monotonic() - start)
+            raise
+        self.base._record_provider_outcome(provider, response.status, time.monotonic() - start)
+
+        if on_response is not None:
+            on_response(response.status, body)
+        if etag and response.status == 304:
+            return None, None
+        response.raise_for_status()
+        return json.loads(body), response.headers.get("ETag")
+
+    async def _single_flight(self, key: str, fetch):
+        """Await the in-flight task for ``key``, starting it if there is none"""
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fetch())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda t: self._in_flight.pop(key, None))
+        # Shield so one cancelled waiter does not cancel the call for everyone else
+        return await asyncio.shield(task)
+
+    async def _cached_query(self, cache_key: str, max_results: int, fetch) -> List[Dict]:
+        """Serve a provider query from the shared query cache, like UniversalResourceFetcher._cached_query.
+
+        A soft-expired entry is served as is while the refresh runs on this loop,
+        driven from the cache's refresh pool.
+        """
+        cache = self.base.cache
+        if cache is None:
+            return (await self._single_flight(cache_key, fetch))[:max_results]
+
+        found, items, soft_expired = cache.lookup(cache_key)
+        if found:
+            if soft_expired:
+                loop = asyncio.get_running_loop()
+                cache.refresh_in_background(
+                    cache_key,
+                    lambda: asyncio.run_coroutine_threadsafe(self._single_flight(cache_key, fetch), loop).result(),
+                    self.base._is_real_result
+                )
+            return items[:max_results]
+
+        start = time.monotonic()
+        items = await self._single_flight(cache_key, fetch)
+        cache.metrics.record_fetch(cache_key, time.monotonic() - start)
+        if self.base._is_real_result(items):
+            items = cache.set(cache_key, items)
+        return items[:max_results]
+
+    async def warm_connections(self):
+        """Open connections to the configured providers so the first fetch skips the handshake"""
+        enabled = {
+            "youtube": bool(self.base.youtube_api_key),
+            "github": bool(self.base.github_token),
+            "devto": True
+        }
+        session = await self._get_session()
+        for provider, base_url in self.base.base_urls.items():
+            if not enabled[provider]:
+                continue
+            try:
+                async with session.head(base_url):
+                    logger.info(f"Warmed {provider} connection to {base_url}")
+            except Exception as e:
+                logger.warning(f"Could not warm {provider} connection: {str(e)}")
+
+    async def get_youtube_videos(self, keywords: List[str], difficulty: str = "beginner", max_results: int = 5) -> List[Dict]:
+        """Fetch educational videos from YouTube API"""
+        if not self.base.youtube_api_key:
+            logger.warning("YouTube API key not found, using fallback")
+            return self.base._disabled_fallback(self.base._get_fallback_videos(keywords, difficulty))
+
+        cache_key = self.base._provider_cache_key("youtube", keywords, difficulty)
+        page_size = max(max_results, self.base.provider_page_size)
+        return await self._cached_query(cache_key, max_results, lambda: self._fetch_youtube_videos(cache_key, keywords, difficulty, page_size))
+
+    async def _fetch_youtube_videos(self, cache_key: str, keywords: List[str], difficulty: str, max_results: int) -> List[Dict]:
+        """Quota-aware, rate-limited provider call behind get_youtube_videos"""
+        # The checks may wait for a rate-limit token, so they run off the event loop
+        if not await asyncio.to_thread(self.base._youtube_call_allowed):
+            return self.base._stale_or_fallback(cache_key, lambda: self.base._get_fallback_videos(keywords, difficulty))
+
+        try:
+            url, params, search_terms = self.base._youtube_request(keywords, difficulty, max_results)
+            etag = self.base._stored_etag(cache_key)
+            data, response_etag = await self._get_json("youtube", url, params, on_response=self.base._record_youtube_response, etag=etag)
+            if data is None:
+                return self.base._revalidated(cache_key)
+
+            videos = self.base._parse_youtube_videos(data, difficulty)
+            self.base.validators.set(cache_key, response_etag if videos else None)
+            logger.info(f"Fetched {len(videos)} YouTube videos for: {search_terms}")
+            return videos
+
+        except Exception as e:
+            logger.error(f"YouTube API error: {str(e)}")
+            return self.base._get_fallback_videos(keywords, difficulty)
+
+    async def get_github_projects(self, keywords: List[str], difficulty: str = "beginner", max_results: int = 5) -> List[Dict]:
+        """Fetch relevant GitHub repositories"""
+        if not self.base.github_token:
+            logger.warning("GitHub token not found, using fallback")
+            return self.base._disabled_fallback(self.base._get_fallback_projects(keywords, difficulty))
+
+        cache_key = self.base._provider_cache_key("github", keywords, difficulty)
+        page_size = max(max_results, self.base.provider_page_size)
+        return await self._cached_query(cache_key, max_results, lambda: self._fetch_github_projects(cache_key, keywords, difficulty, page_size))
+
+    async def _fetch_github_projects(self, cache_key: str, keywords: List[str], difficulty: str, max_results: int) -> List[Dict]:
+        """Rate-limited provider call behind get_github_projects"""
+        if not await asyncio.to_thread(self.base._github_call_allowed):
+            return self.base._stale_or_fallback(cache_key, lambda: self.base._get_fallback_projects(keywords, difficulty))
+
+        try:
+            url, params, search_terms = self.base._github_request(keywords, difficulty, max_results)
+            etag = self.base._stored_etag(cache_key)
+            data, response_etag = await self._get_json("github", url, params, etag=etag)
+            if data is None:
+                return self.base._revalidated(cache_key)
+
+            projects = self.base._parse_github_projects(data, difficulty)
+            self.base.validators.set(cache_key, response_etag if projects else None)
+            logger.info(f"Fetched {len(projects)} GitHub projects for: {search_terms}")
+            return projects
+
+        except Exception as e:
+            logger.error(f"GitHub API error: {str(e)}")
+            return self.base._get_fallback_projects(keywords, difficulty)
+
+    async def get_dev_articles(self, keywords: List[str], max_results: int = 5) -> List[Dict]:
+        """Fetch articles from Dev.to"""
+        cache_key = self.base._provider_cache_key("devto", keywords, "any")
+        page_size = max(max_results, self.base.provider_page_size)
+        return await self._cached_query(cache_key, max_results, lambda: self._fetch_dev_articles(cache_key, keywords, page_size))
+
+    async def _fetch_dev_articles(self, cache_key: str, keywords: List[str], max_results: int) -> List[Dict]:
+        """Provider call behind get_dev_articles"""
+        if not self.base._circuit_allows("devto"):
+            return self.base._stale_or_fallback(cache_key, lambda: self.base._get_fallback_articles(keywords))
+
+        try:
+            url, params, search_terms = self.base._devto_request(keywords, max_results)
+            etag = self.base._stored_etag(cache_key)
+            data, response_etag = await self._get_json("devto", url, params, etag=etag)
+            if data is None:
+                return self.base._revalidated(cache_key)
+
+            articles = self.base._parse_dev_articles(data)
+            self.base.validators.set(cache_key, response_etag if articles else None)
+            logger.info(f"Fetched {len(articles)} Dev.to articles for: {search_terms}")
+            return articles
+
+        except Exception as e:
+            logger.error(f"Dev.to API error: {str(e)}")
+            return self.base._get_fallback_articles(keywords)
+
+    async def get_comprehensive_resources(self, domain: str, subdomain: str, difficulty: str, deadline: Optional[Deadline] = None) -> Dict:
+        """Get comprehensive resources for a specific domain and subdomain"""
+        try:
+            subdomain_data = self.base.domain_keywords.get(domain, {}).get(subdomain, {})
+
+            if not subdomain_data:
+                logger.warning(f"No keywords found for {domain}/{subdomain}")
+                return self.base._get_fallback_comprehensive_resources(domain, difficulty)
+
+            queries = self.base._comprehensive_queries(subdomain_data)
+            provider_calls = self.base._comprehensive_calls(self, queries, difficulty)
+            with fetch_deadline(deadline):
+                fetched = await self._fetch_concurrently(provider_calls, self.base.fanout_deadline, deadline)
+
+            resources = self.base._assemble_comprehensive_resources(domain, subdomain, difficulty, subdomain_data, fetched)
+            logger.info(f"Generated comprehensive resources for {domain}/{subdomain} ({difficulty})")
+            return resources
+
+        except Exception as e:
+            logger.error(f"Error generating comprehensive resources: {str(e)}")
+            return self.base._get_fallback_comprehensive_resources(domain, difficulty)
+
+    async def _fetch_concurrently(self, calls: Dict, timeout: float, deadline: Optional[Deadline] = None) -> Dict[str, List[Dict]]:
+        """Run provider coroutines as tasks and wait for all of them under one deadline.
+
+        Calls whose query is warm in the cache are answered without a task. Tasks that
+        miss the deadline are answered with their fallback and keep running, so their
+        real result is still cached once it arrives. The wait is also capped by the
+        request's latency budget when one is given.
+        """
+        results = {}
+        tasks = {}
+
+        for section, (cache_key, fetch, fallback) in calls.items():
+            if self.base.cache is not None and self.base.cache.is_warm(cache_key):
+                results[section] = await fetch()
+                continue
+
+            tasks[asyncio.ensure_future(fetch())] = (section, fallback)
+
+        if tasks:
+            if deadline is not None:
+                timeout = deadline.bounded(timeout)
+            done, _ = await asyncio.wait(tasks, timeout=timeout)
+            for task, (section, fallback) in tasks.items():
+                if task in done and task.exception() is None:
+                    results[section] = task.result()
+                else:
+                    logger.warning(f"Provider call for {section} missed the {timeout:.2f}s deadline, using fallback")
+                    results[section] = fallback()
+                    if deadline is not None and task not in done:
+                        deadline.mark_degraded(f"resources.{section}")
+
+        return results
+
+class SyncFetcherBridge:
+    """Blocking UniversalResourceFetcher interface on top of an AsyncResourceFetcher.
+
+    Coroutines run on one background event loop per worker, so every request thread
+    shares the same connection pool instead of holding its own sockets. Each runs in
+    a copy of its caller's context, so the fetch priority and deadline set by the
+    caller (see resource_fetcher.background_priority and fetch_deadline) still apply.
+    """
+
+    def __init__(self, fetcher: AsyncResourceFetcher):
+        self.fetcher = fetcher
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name="async-resource-fetcher", daemon=True)
+        self.thread.start()
+
+    def _run(self, coro):
+        """Run a coroutine on the bridge loop, in the caller's context, and wait for its result"""
+        context = copy_context()
+
+        async def in_caller_context():
+            return await asyncio.get_running_loop().create_task(coro, context=context)
+
+        return asyncio.run_coroutine_threadsafe(in_caller_context(), self.loop).result()
+
+    def get_youtube_videos(self, keywords: List[str], difficulty: str = "beginner", max_results: int = 5) -> List[Dict]:
+        return self._run(self.fetcher.get_youtube_videos(keywords, difficulty, max_results))
+
+    def get_github_projects(self, keywords: List[str], difficulty: str = "beginner", max_results: int = 5) -> List[Dict]:
+        return self._run(self.fetcher.get_github_projects(keywords, difficulty, max_results))
+
+    def get_dev_articles(self, keywords: List[str], max_results: int = 5) -> List[Dict]:
+        return self._run(self.fetcher.get_dev_articles(keywords, max_results))
+
+    def get_comprehensive_resources(self, domain: str, subdomain: str, difficulty: str, deadline: Optional[Deadline] = None) -> Dict:
+        return self._run(self.fetcher.get_comprehensive_resources(domain, subdomain, difficulty, deadline))
+
+    def warm_connections(self):
+        """Warm connections on the bridge loop without waiting for them"""
+        asyncio.run_coroutine_threadsafe(self.fetcher.warm_connections(), self.loop)
+
+    def __getattr__(self, name):
+        # Keyword tables, fallbacks and the cache are shared with the sync fetcher
+        return getattr(self.fetcher.base, name)
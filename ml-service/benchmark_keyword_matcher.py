@@ -0,0 +1,77 @@
+"""Per-call cost of keyword scoring as the keyword tables grow.
+
+Compares the compiled matcher against checking every keyword with ``keyword in text``
+(how domains and subdomains used to be scored) on typical goal descriptions, with the
+domain and subdomain tables padded to several times their size.
+
+    python benchmark_keyword_matcher.py [--repeat 2000]
+"""
+import argparse
+import os
+import random
+import string
+import time
+
+os.environ.setdefault('HTTP_PREWARM', 'false')
+os.environ.setdefault('CACHE_WARM_ON_STARTUP', 'false')
+os.environ.setdefault('RESOURCE_CACHE_SNAPSHOT', 'false')
+
+from enhanced_app import DOMAIN_KEYWORDS, SUBDOMAIN_KEYWORDS
+from keyword_matcher import KeywordMatcher
+
+TEXTS = [
+    "become a full stack developer build web apps with react node and express apis",
+    "learn machine learning with python pandas and deep learning for data analysis dashboards",
+    "ship ios and android apps with flutter and react native, then publish a mobile app",
+    "move our services to aws with docker kubernetes and a ci/cd deployment pipeline",
+    "i want to understand how to design accessible user interfaces and prototype in figma " * 3,
+]
+
+def keyword_groups(scale: int, rng: random.Random):
+    """Domain and subdomain tables with ``scale - 1`` made-up keywords added per real one"""
+    groups = {**DOMAIN_KEYWORDS}
+    for domain, subdomains in SUBDOMAIN_KEYWORDS.items():
+        for subdomain, keywords in subdomains.items():
+            groups[(domain, subdomain)] = keywords
+    padded = {}
+    for label, keywords in groups.items():
+        extra = [''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 12)))
+                 for _ in range(len(keywords) * (scale - 1))]
+        padded[label] = list(keywords) + extra
+    return padded
+
+def substring_scores(groups, text):
+    return {label: sum(1 for keyword in keywords if keyword in text) for label, keywords in groups.items()}
+
+def per_call_microseconds(score, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for text in TEXTS:
+            score(text)
+    return (time.perf_counter() - started) / (repeat * len(TEXTS)) * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark keyword scoring against keyword table size")
+    parser.add_argument("--repeat", type=int, default=2000, help="Passes over the sample texts per measurement")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    print(f"{'keywords':>9} {'substring µs':>13} {'matcher µs':>11} {'build ms':>9}")
+    for scale in (1, 4, 16, 64):
+        groups = keyword_groups(scale, rng)
+        started = time.perf_counter()
+        matcher = KeywordMatcher(groups)
+        build_ms = (time.perf_counter() - started) * 1000
+
+        for text in TEXTS:
+            expected = {label: score for label, score in substring_scores(groups, text).items() if score}
+            assert matcher.counts(text) == expected
+
+        repeat = max(1, args.repeat // scale)
+        substring = per_call_microseconds(lambda text: substring_scores(groups, text), repeat)
+        compiled = per_call_microseconds(matcher.counts, args.repeat)
+        keywords = sum(len(keywords) for keywords in groups.values())
+        print(f"{keywords:>9} {substring:>13.1f} {compiled:>11.1f} {build_ms:>9.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+import threading
+from collections import defaultdict
+from typing import Dict, Iterable, Tuple
+
+NAMESPACE_PREFIXES = ("comprehensive", "provider", "preview")
+
+def cache_namespace(key: str) -> str:
+    """Namespace of a cache key from its prefix; topic keys have none of their own.
+
+    Previews have no entries of their own: their lookups are counted under a
+    ``preview_`` key for the comprehensive entry they read (see ResourceCache.peek_for).
+    """
+    prefix = key.split("_", 1)[0]
+    return prefix if prefix in NAMESPACE_PREFIXES else "topic"
+
+class CacheMetrics:
+    """Per-namespace counters for one worker's view of the resource cache.
+
+    Lookups are counted as hits (fresh), stale hits (served past the soft TTL or from
+    the stale window) and misses; fetches as a count with total and maximum latency.
+    Each update is a few integer additions under one lock, cheap enough for every
+    lookup. Counters are per process, while entries and bytes come from the store.
+    """
+
+    COUNTERS = ("hits", "stale_hits", "misses", "evictions", "fetches", "fetch_errors")
+
+    def __init__(self):
+        self.counters = defaultdict(lambda: dict.fromkeys(self.COUNTERS, 0))
+        self.fetch_seconds = defaultdict(float)
+        self.max_fetch_seconds = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def record(self, key: str, counter: str):
+        namespace = cache_namespace(key)
+        with self._lock:
+            self.counters[namespace][counter] += 1
+
+    def record_fetch(self, key: str, seconds: float, failed: bool = False):
+        namespace = cache_namespace(key)
+        with self._lock:
+            counters = self.counters[namespace]
+            counters["fetch_errors" if failed else "fetches"] += 1
+            self.fetch_seconds[namespace] += seconds
+            self.max_fetch_seconds[namespace] = max(self.max_fetch_seconds[namespace], seconds)
+
+    def snapshot(self, key_sizes: Iterable[Tuple[str, int]]) -> Dict[str, Dict]:
+        """Counters, hit ratio, fetch latency, entries and bytes for every namespace"""
+        entries = defaultdict(int)
+        sizes = defaultdict(int)
+        for key, size in key_sizes:
+            namespace = cache_namespace(key)
+            entries[namespace] += 1
+            sizes[namespace] += size
+
+        with self._lock:
+            counters = {namespace: dict(values) for namespace, values in self.counters.items()}
+            fetch_seconds = dict(self.fetch_seconds)
+            max_fetch_seconds = dict(self.max_fetch_seconds)
+
+        namespaces = {}
+        for namespace in sorted(set(counters) | set(entries)):
+            values = counters.get(namespace, dict.fromkeys(self.COUNTERS, 0))
+            lookups = values["hits"] + values["stale_hits"] + values["misses"]
+            fetches = values["fetches"] + values["fetch_errors"]
+            namespaces[namespace] = {
+                **values,
+                "hit_ratio": round((values["hits"] + values["stale_hits"]) / lookups, 3) if lookups else None,
+                "average_fetch_seconds": round(fetch_seconds.get(namespace, 0.0) / fetches, 3) if fetches else None,
+                "max_fetch_seconds": round(max_fetch_seconds.get(namespace, 0.0), 3),
+                "entries": entries[namespace],
+                "bytes": sizes[namespace]
+            }
+        return namespaces
@@ -0,0 +1,168 @@
+import atexit
+import glob
+import os
+import pickle
+import signal
+import threading
+import time
+from typing import List, Optional
+import logging
+
+from rate_limiter import default_state_dir
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_VERSION = 2  # records gained a per-entry TTL; version 1 files are still read
+
+class CacheSnapshot:
+    """Disk snapshot of a ResourceCache, so a restarted or redeployed worker starts warm.
+
+    The snapshot is a stream of pickled (key, data, stored_at, ttl) records written to a
+    temporary file and renamed into place, so readers never see a partial file. Each
+    worker saves its own file, ``<path>.<pid>``, periodically and on shutdown. Loading
+    merges every worker's file in a background thread, keeping the newest copy of each
+    entry with its original timestamp, so TTLs carry over and startup is not held up by
+    large files. Files left by workers that have exited are removed once a live worker
+    has saved the entries it loaded from them.
+    """
+
+    def __init__(self, cache, path: Optional[str] = None, interval_seconds: Optional[float] = None,
+                 worker_id: Optional[str] = None):
+        self.cache = cache
+        self.path = path or os.getenv('RESOURCE_CACHE_SNAPSHOT_PATH') or os.path.join(default_state_dir(), "resource_cache.snapshot")
+        self.worker_path = f"{self.path}.{worker_id or os.getpid()}"
+        self.interval = interval_seconds or float(os.getenv('RESOURCE_CACHE_SNAPSHOT_SECONDS', 600))
+        self.loaded = threading.Event()
+        self._save_lock = threading.Lock()
+        self._stopped = threading.Event()
+
+    def start(self):
+        """Load the last snapshot in the background, then save periodically and on shutdown"""
+        if self.cache.store.persistent:
+            logger.info("Resource cache store is persistent, snapshots are not needed")
+            self.loaded.set()
+            return
+
+        threading.Thread(target=self.load, name="cache-snapshot-load", daemon=True).start()
+        threading.Thread(target=self._save_periodically, name="cache-snapshot-save", daemon=True).start()
+        atexit.register(self.save)
+        self._chain_sigterm()
+
+    def save(self):
+        """Write the cache's live entries to this worker's snapshot file atomically"""
+        with self._save_lock:
+            cutoff = time.time() - self._retention_seconds()
+            temp_path = f"{self.worker_path}.tmp"
+            saved = 0
+            try:
+                # Owner-only: the snapshot is unpickled on load
+                with os.fdopen(os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "wb") as handle:
+                    pickle.dump({"version": SNAPSHOT_VERSION, "saved_at": time.time()}, handle)
+                    for record in self.cache.store.items():
+                        if record[2] >= cutoff:
+                            pickle.dump(record, handle, protocol=pickle.HIGHEST_PROTOCOL)
+                            saved += 1
+                    handle.flush()
+                    os.fsync(handle.fileno())
+                os.replace(temp_path, self.worker_path)
+                logger.info(f"Saved {saved} resource cache entries to {self.worker_path}")
+            except Exception as e:
+                logger.error(f"Could not save resource cache snapshot: {str(e)}")
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                return
+            self._remove_exited_workers_files()
+
+    def load(self):
+        """Merge every worker's snapshot into the cache, keeping the newest copy of each entry"""
+        try:
+            for path in self._snapshot_files():
+                self._load_file(path)
+        finally:
+            self.loaded.set()
+
+    def _load_file(self, path: str):
+        """Stream entries from one snapshot file into the cache, keeping their original timestamps"""
+        loaded = 0
+        try:
+            with open(path, "rb") as handle:
+                header = pickle.load(handle)
+                if header.get("version") not in (1, SNAPSHOT_VERSION):
+                    logger.warning(f"Ignoring resource cache snapshot {path} with version {header.get('version')}")
+                    return
+
+                cutoff = time.time() - self._retention_seconds()
+                while True:
+                    try:
+                        key, data, stored_at, *ttl = pickle.load(handle)
+                    except EOFError:
+                        break
+                    # Entries written since startup, or found in another worker's file, may be newer
+                    current = self.cache.store.peek(key)
+                    if stored_at >= cutoff and (current is None or current[1] < stored_at):
+                        # The store freezes values, including plain ones from files written before freezing
+                        self.cache.store.put(key, data, stored_at, ttl[0] if ttl else None)
+                        loaded += 1
+            logger.info(f"Loaded {loaded} resource cache entries from {path}")
+        except FileNotFoundError:
+            logger.info(f"Resource cache snapshot {path} is gone, skipping it")
+        except Exception as e:
+            logger.error(f"Could not load resource cache snapshot {path} after {loaded} entries: {str(e)}")
+
+    def _snapshot_files(self) -> List[str]:
+        """Every worker's snapshot file, and the single shared file older versions wrote"""
+        paths = [path for path in glob.glob(f"{glob.escape(self.path)}.*") if not path.endswith(".tmp")]
+        if os.path.exists(self.path):
+            paths.insert(0, self.path)
+        if not paths:
+            logger.info("No resource cache snapshot to load")
+        return paths
+
+    def _remove_exited_workers_files(self):
+        """Delete snapshot files of workers that are no longer running; their entries were loaded at startup"""
+        for path in self._snapshot_files():
+            if path == self.worker_path:
+                continue
+            # The shared file older versions wrote, or the file of a worker process that has exited
+            worker = path[len(self.path) + 1:]
+            if path != self.path and not (worker.isdigit() and not _process_alive(int(worker))):
+                continue
+            try:
+                os.remove(path)
+                logger.info(f"Removed resource cache snapshot {path} of an exited worker")
+            except OSError:
+                pass
+
+    def _retention_seconds(self) -> float:
+        """How long an entry stays worth keeping: its TTL plus the stale window"""
+        return (self.cache.cache_duration + self.cache.stale_duration).total_seconds()
+
+    def _save_periodically(self):
+        while not self._stopped.wait(self.interval):
+            self.save()
+
+    def _chain_sigterm(self):
+        """Save on SIGTERM, then hand over to the handler that was installed before"""
+        if threading.current_thread() is not threading.main_thread():
+            return
+        previous = signal.getsignal(signal.SIGTERM)
+
+        def handle_sigterm(signum, frame):
+            self._stopped.set()
+            self.save()
+            if callable(previous):
+                previous(signum, frame)
+            elif previous != signal.SIG_IGN:
+                signal.signal(signal.SIGTERM, signal.SIG_DFL)
+                os.kill(os.getpid(), signal.SIGTERM)
+
+        signal.signal(signal.SIGTERM, handle_sigterm)
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:  # exists, owned by someone else
+        return True
+    return True
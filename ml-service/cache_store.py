@@ -0,0 +1,412 @@
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import logging
+
+from rate_limiter import default_state_dir
+
+try:
+    import zstandard
+except ImportError:  # optional: RESOURCE_CACHE_COMPRESSION=zstd falls back to zlib
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+class FrozenDict(dict):
+    """Read-only dict for cached values.
+
+    Still a dict, so it serializes to JSON and reads like any other resource record,
+    but mutation raises TypeError; one cached object can be handed to every thread
+    and request without a defensive copy.
+    """
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("cached resources are read-only; copy with dict() before changing them")
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __reduce__(self):
+        # Unpickling must not go through __setitem__
+        return (FrozenDict, (dict(self),))
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+def freeze(value: Any) -> Any:
+    """Deeply immutable version of a value: dicts become FrozenDicts and lists tuples"""
+    if isinstance(value, FrozenDict):
+        return value
+    if isinstance(value, dict):
+        return FrozenDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+def _compression_dictionary() -> bytes:
+    """Preset zlib dictionary: pickled provider records, whose field names and values every entry repeats"""
+    common = {"title": "", "description": "", "type": "", "free": True, "difficulty": "beginner"}
+    return pickle.dumps(freeze([
+        {**common, "url": "https://www.youtube.com/watch?v=", "thumbnail": "https://i.ytimg.com/vi/", "channel": "",
+         "type": "video", "platform": "YouTube", "estimated_time": "10-20 minutes"},
+        {**common, "url": "https://github.com/", "stars": 0, "language": "JavaScript", "type": "project",
+         "platform": "GitHub", "last_updated": "2024-01-01T00:00:00Z", "difficulty": "intermediate"},
+        {**common, "url": "https://dev.to/", "author": "", "reading_time": "5 min read", "tags": (), "type": "article",
+         "platform": "Dev.to", "published_at": "2024-01-01T00:00:00Z", "difficulty": "advanced"},
+        {"domain": "", "subdomain": "", "fetched_at": "2024-01-01T00:00:00.000000", "fallback": True}
+    ]), protocol=pickle.HIGHEST_PROTOCOL)
+
+class ZlibCodec:
+    """Pickle + zlib encoding for compressed in-memory entries.
+
+    A preset dictionary of typical records primes the compressor, which matters
+    because most entries are only a few kilobytes.
+    """
+
+    name = "zlib"
+
+    def __init__(self, level: int = 6):
+        self.level = level
+        self.zdict = _compression_dictionary()
+
+    def encode(self, data: Any) -> Tuple[bytes, int]:
+        """(compressed bytes, uncompressed size)"""
+        raw = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+        compressor = zlib.compressobj(self.level, zdict=self.zdict)
+        return compressor.compress(raw) + compressor.flush(), len(raw)
+
+    def decode(self, blob: bytes) -> Any:
+        decompressor = zlib.decompressobj(zdict=self.zdict)
+        return pickle.loads(decompressor.decompress(blob) + decompressor.flush())
+
+class ZstdCodec:
+    """Pickle + zstandard encoding: faster than zlib at a similar ratio"""
+
+    name = "zstd"
+
+    def __init__(self, level: int = 3):
+        self.level = level
+        self.dictionary = zstandard.ZstdCompressionDict(_compression_dictionary())
+        self._local = threading.local()  # zstandard (de)compressors are not thread-safe
+
+    def encode(self, data: Any) -> Tuple[bytes, int]:
+        """(compressed bytes, uncompressed size)"""
+        if not hasattr(self._local, "compressor"):
+            self._local.compressor = zstandard.ZstdCompressor(level=self.level, dict_data=self.dictionary)
+        raw = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+        return self._local.compressor.compress(raw), len(raw)
+
+    def decode(self, blob: bytes) -> Any:
+        if not hasattr(self._local, "decompressor"):
+            self._local.decompressor = zstandard.ZstdDecompressor(dict_data=self.dictionary)
+        return pickle.loads(self._local.decompressor.decompress(blob))
+
+class MemoryCacheStore:
+    """Per-process LRU store with an entry limit and a byte budget.
+
+    Entries live in an OrderedDict from least to most recently used, so eviction is
+    O(1) from the cold end whenever ``max_entries`` or ``max_bytes`` is exceeded.
+    With a ``codec`` entries are kept compressed and only decoded when read, so the
+    same byte budget holds several times more of them; each read then returns a
+    fresh (still frozen) copy instead of the shared object.
+    """
+
+    backend = "memory"
+    persistent = False
+
+    def __init__(self, max_entries: int, max_bytes: int, codec=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.codec = codec
+        self.on_evict: Optional[Callable[[str], None]] = None
+        self.entries: "OrderedDict[str, Tuple[Any, float, Optional[float]]]" = OrderedDict()
+        self.sizes: Dict[str, int] = {}
+        self.raw_sizes: Dict[str, int] = {}
+        self.total_bytes = 0
+        self.raw_bytes = 0
+        self.evictions = 0
+        self._lock = threading.RLock()
+
+    def get(self, key: str) -> Optional[Tuple[Any, float, Optional[float]]]:
+        """(data, stored_at, ttl) for a key, marking it recently used"""
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+        return self._decode(entry)
+
+    def peek(self, key: str) -> Optional[Tuple[Any, float, Optional[float]]]:
+        """(data, stored_at, ttl) for a key, without touching its recency"""
+        with self._lock:
+            entry = self.entries.get(key)
+        return self._decode(entry)
+
+    def _decode(self, entry):
+        if entry is None or self.codec is None:
+            return entry
+        blob, stored_at, ttl = entry
+        return self.codec.decode(blob), stored_at, ttl
+
+    def put(self, key: str, data: Any, stored_at: float, ttl: Optional[float] = None):
+        """Store a frozen copy of an entry; ``ttl`` overrides the cache's default lifetime for it"""
+        data = freeze(data)
+        if self.codec is not None:
+            data, raw_size = self.codec.encode(data)
+            size = len(data)
+        else:
+            size = raw_size = self._estimate_size(data)
+        with self._lock:
+            self._remove(key)
+            if size > self.max_bytes:
+                logger.warning(f"Not caching {key}: {size} bytes exceeds the cache budget")
+                return
+            self.entries[key] = (data, stored_at, ttl)
+            self.sizes[key] = size
+            self.raw_sizes[key] = raw_size
+            self.total_bytes += size
+            self.raw_bytes += raw_size
+
+            while self.entries and (len(self.entries) > self.max_entries or self.total_bytes > self.max_bytes):
+                victim = next(iter(self.entries))
+                self._remove(victim)
+                self.evictions += 1
+                if self.on_evict is not None:
+                    self.on_evict(victim)
+
+    def sweep(self, cutoff: float):
+        """Drop entries stored before ``cutoff``"""
+        with self._lock:
+            for key in [key for key, (_, stored_at, _) in self.entries.items() if stored_at < cutoff]:
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self.entries.clear()
+            self.sizes.clear()
+            self.raw_sizes.clear()
+            self.total_bytes = 0
+            self.raw_bytes = 0
+
+    def keys(self) -> List[str]:
+        """Stored keys, from least to most recently used"""
+        with self._lock:
+            return list(self.entries.keys())
+
+    def items(self) -> List[Tuple[str, Any, float, Optional[float]]]:
+        """(key, data, stored_at, ttl) for every entry, from least to most recently used"""
+        with self._lock:
+            entries = list(self.entries.items())
+        return [(key, *self._decode(entry)) for key, entry in entries]
+
+    def key_sizes(self) -> List[Tuple[str, int]]:
+        """(key, estimated bytes) for every entry"""
+        with self._lock:
+            return list(self.sizes.items())
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "backend": self.backend,
+                "entries": len(self.entries),
+                "max_entries": self.max_entries,
+                "bytes": self.total_bytes,
+                "max_bytes": self.max_bytes,
+                "evictions": self.evictions,
+                "compression": self.codec.name if self.codec is not None else None,
+                "uncompressed_bytes": self.raw_bytes,
+                "compression_ratio": round(self.raw_bytes / self.total_bytes, 2) if self.total_bytes else None
+            }
+
+    def _remove(self, key: str):
+        if key in self.entries:
+            del self.entries[key]
+            self.total_bytes -= self.sizes.pop(key, 0)
+            self.raw_bytes -= self.raw_sizes.pop(key, 0)
+
+    def _estimate_size(self, data: Any) -> int:
+        """Approximate memory cost of an entry, from its JSON encoding"""
+        try:
+            return len(json.dumps(data, default=str))
+        except (TypeError, ValueError):
+            return 0
+
+class SQLiteCacheStore:
+    """LRU store in a SQLite database in WAL mode, shared by every worker on the host.
+
+    Each statement runs in its own transaction, so get/put are atomic across
+    processes; eviction happens inside the writing transaction. Recency is refreshed
+    at most every ``touch_interval`` seconds per key to keep reads from turning into
+    writes.
+    """
+
+    backend = "sqlite"
+    persistent = True
+
+    def __init__(self, path: str, max_entries: int, max_bytes: int, touch_interval: float = 30):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.touch_interval = touch_interval
+        self.on_evict: Optional[Callable[[str], None]] = None
+        self._local = threading.local()
+
+        with self._connection() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, stored_at REAL NOT NULL, "
+                "accessed_at REAL NOT NULL, size INTEGER NOT NULL, ttl REAL)"
+            )
+            columns = [row[1] for row in connection.execute("PRAGMA table_info(entries)")]
+            if "ttl" not in columns:  # database created before per-entry TTLs
+                connection.execute("ALTER TABLE entries ADD COLUMN ttl REAL")
+            connection.execute("CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at)")
+            connection.execute("CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+
+    def _connection(self) -> sqlite3.Connection:
+        """One connection per thread and process, opened lazily"""
+        # A connection inherited through fork (gunicorn --preload) must not be reused
+        if getattr(self._local, "pid", None) != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return self._local.connection
+
+    def get(self, key: str) -> Optional[Tuple[Any, float, Optional[float]]]:
+        """(data, stored_at, ttl) for a key, marking it recently used"""
+        connection = self._connection()
+        row = connection.execute(
+            "SELECT value, stored_at, ttl, accessed_at FROM entries WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        value, stored_at, ttl, accessed_at = row
+        now = time.time()
+        if now - accessed_at >= self.touch_interval:
+            with connection:
+                connection.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+        return pickle.loads(value), stored_at, ttl
+
+    def peek(self, key: str) -> Optional[Tuple[Any, float, Optional[float]]]:
+        """(data, stored_at, ttl) for a key, without touching its recency"""
+        row = self._connection().execute("SELECT value, stored_at, ttl FROM entries WHERE key = ?", (key,)).fetchone()
+        return (pickle.loads(row[0]), row[1], row[2]) if row is not None else None
+
+    def put(self, key: str, data: Any, stored_at: float, ttl: Optional[float] = None):
+        """Store a frozen copy of an entry; ``ttl`` overrides the cache's default lifetime for it"""
+        value = pickle.dumps(freeze(data), protocol=pickle.HIGHEST_PROTOCOL)
+        connection = self._connection()
+        if len(value) > self.max_bytes:
+            logger.warning(f"Not caching {key}: {len(value)} bytes exceeds the cache budget")
+            with connection:
+                connection.execute("DELETE FROM entries WHERE key = ?", (key,))
+            return
+
+        with connection:
+            connection.execute("BEGIN IMMEDIATE")
+            connection.execute(
+                "INSERT OR REPLACE INTO entries (key, value, stored_at, accessed_at, size, ttl) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, value, stored_at, time.time(), len(value), ttl)
+            )
+            victims = self._evict(connection)
+
+        if self.on_evict is not None:
+            for victim, in victims:
+                self.on_evict(victim)
+
+    def _evict(self, connection: sqlite3.Connection) -> List[Tuple[str]]:
+        """Delete least recently used entries until the store is within its limits, returning their keys"""
+        count, total_bytes = connection.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        if count <= self.max_entries and total_bytes <= self.max_bytes:
+            return []
+
+        victims = []
+        for key, size in connection.execute("SELECT key, size FROM entries ORDER BY accessed_at"):
+            if count <= self.max_entries and total_bytes <= self.max_bytes:
+                break
+            victims.append((key,))
+            count -= 1
+            total_bytes -= size
+
+        connection.executemany("DELETE FROM entries WHERE key = ?", victims)
+        connection.execute(
+            "INSERT INTO counters (name, value) VALUES ('evictions', ?) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+            (len(victims),)
+        )
+        return victims
+
+    def sweep(self, cutoff: float):
+        """Drop entries stored before ``cutoff``"""
+        connection = self._connection()
+        with connection:
+            connection.execute("DELETE FROM entries WHERE stored_at < ?", (cutoff,))
+
+    def clear(self):
+        connection = self._connection()
+        with connection:
+            connection.execute("DELETE FROM entries")
+
+    def keys(self) -> List[str]:
+        """Stored keys, from least to most recently used"""
+        return [key for key, in self._connection().execute("SELECT key FROM entries ORDER BY accessed_at")]
+
+    def key_sizes(self) -> List[Tuple[str, int]]:
+        """(key, stored bytes) for every entry"""
+        return self._connection().execute("SELECT key, size FROM entries").fetchall()
+
+    def stats(self) -> Dict:
+        connection = self._connection()
+        count, total_bytes = connection.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        evictions = connection.execute("SELECT value FROM counters WHERE name = 'evictions'").fetchone()
+        return {
+            "backend": self.backend,
+            "path": self.path,
+            "entries": count,
+            "max_entries": self.max_entries,
+            "bytes": total_bytes,
+            "max_bytes": self.max_bytes,
+            "evictions": evictions[0] if evictions else 0
+        }
+
+def create_cache_store(max_entries: Optional[int] = None, max_bytes: Optional[int] = None):
+    """Store selected by RESOURCE_CACHE_BACKEND: ``memory`` (per worker) or ``sqlite`` (shared by the host)"""
+    max_entries = max_entries or int(os.getenv('RESOURCE_CACHE_MAX_ENTRIES', 5000))
+    max_bytes = max_bytes or int(os.getenv('RESOURCE_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+    backend = os.getenv('RESOURCE_CACHE_BACKEND', 'memory').lower()
+
+    if backend == "sqlite":
+        path = os.getenv('RESOURCE_CACHE_PATH') or os.path.join(default_state_dir(), "resource_cache.sqlite3")
+        try:
+            return SQLiteCacheStore(path, max_entries, max_bytes)
+        except sqlite3.Error as e:
+            logger.error(f"Could not open shared cache at {path}, using an in-memory cache: {str(e)}")
+    elif backend != "memory":
+        logger.warning(f"Unknown RESOURCE_CACHE_BACKEND '{backend}', using an in-memory cache")
+
+    return MemoryCacheStore(max_entries, max_bytes, codec=create_codec())
+
+def create_codec():
+    """In-memory entry codec selected by RESOURCE_CACHE_COMPRESSION: ``none``, ``zlib`` or ``zstd``"""
+    compression = os.getenv('RESOURCE_CACHE_COMPRESSION', 'none').lower()
+    if compression == "zstd":
+        if zstandard is not None:
+            return ZstdCodec()
+        logger.warning("zstandard is not installed, compressing the resource cache with zlib")
+        return ZlibCodec()
+    if compression == "zlib":
+        return ZlibCodec()
+    if compression != "none":
+        logger.warning(f"Unknown RESOURCE_CACHE_COMPRESSION '{compression}', storing entries uncompressed")
+    return None
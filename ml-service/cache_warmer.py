@@ -0,0 +1,194 @@
+import argparse
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterator, List, Optional, Tuple
+import logging
+
+from rate_limiter import default_state_dir
+from resource_fetcher import YOUTUBE_SEARCH_COST, background_priority
+
+try:
+    import fcntl
+except ImportError:  # Windows: no host-wide lock, every process may warm
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+class CacheWarmer:
+    """Fills the resource cache ahead of traffic by walking the whole catalog.
+
+    The key space is finite: a comprehensive entry for every domain, subdomain a request
+    can resolve to and difficulty, and a topic entry for every topic of the catalog.
+    Entries that are already warm are skipped, so an interrupted run resumes where it
+    stopped as long as the cache survives the restart (the SQLite store, or the in-memory
+    store with its snapshot).
+
+    Only one warmer runs per host at a time. With the in-memory store the worker that
+    gets the lock warms its own cache, and the others pick its entries up from the
+    snapshot on their next start.
+
+    Jobs run ``concurrency`` at a time. Before each one the warmer waits for a spare
+    token in the shared YouTube and GitHub rate limiters, leaving ``token_reserve``
+    for interactive requests, and stops once the quota scheduler refuses background
+    spending; the next run picks up from there. Provider calls made while warming
+    spend quota at background priority.
+    """
+
+    def __init__(self, generator, concurrency: Optional[int] = None, token_reserve: Optional[float] = None,
+                 domains: Optional[List[str]] = None, force: bool = False):
+        self.generator = generator
+        self.fetcher = generator.resource_fetcher
+        self.cache = generator.cache
+        self.concurrency = concurrency or int(os.getenv('CACHE_WARM_CONCURRENCY', 2))
+        self.token_reserve = token_reserve if token_reserve is not None else float(os.getenv('CACHE_WARM_TOKEN_RESERVE', 1))
+        self.domains = domains
+        self.force = force
+        self.lock_path = os.path.join(default_state_dir(), "cache_warmer.lock")
+
+        self.progress = {"total": 0, "warmed": 0, "skipped": 0, "fallback": 0, "failed": 0}
+        self._progress_lock = threading.Lock()
+        self._stopped = threading.Event()
+
+    def start(self, ready: Optional[threading.Event] = None):
+        """Warm in a background thread, once ``ready`` (e.g. a snapshot load) is set"""
+        def run():
+            if ready is not None:
+                ready.wait()
+            self.run()
+
+        threading.Thread(target=run, name="cache-warmer", daemon=True).start()
+
+    def stop(self):
+        self._stopped.set()
+
+    def run(self) -> dict:
+        """Warm every catalog entry that is not warm yet and return the progress counters"""
+        with open(self.lock_path, "a") as lock_file:
+            # One warmer per host at a time, whatever the store: every worker warming would spend the
+            # shared rate limits and quota once per worker
+            if fcntl is not None:
+                try:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except OSError:
+                    logger.info("Another cache warmer is running on this host, not starting")
+                    return self.progress
+            return self._run()
+
+    def _run(self) -> dict:
+        jobs = list(self.jobs())
+        self.progress["total"] = len(jobs)
+        started = time.time()
+        logger.info(f"Warming {len(jobs)} resource cache entries with concurrency {self.concurrency}")
+
+        slots = threading.BoundedSemaphore(self.concurrency)
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="cache-warm") as executor:
+            for cache_key, fetch in jobs:
+                if self._stopped.is_set():
+                    break
+                if not self.force and self.cache.is_warm(cache_key):
+                    self._record("skipped", cache_key)
+                    continue
+                if not self._wait_for_budget():
+                    break
+
+                slots.acquire()
+                future = executor.submit(self._warm, cache_key, fetch)
+                future.add_done_callback(lambda _: slots.release())
+
+        p = self.progress
+        logger.info(f"Cache warming finished in {time.time() - started:.0f}s: {p['warmed']} warmed, "
+                    f"{p['skipped']} already warm, {p['fallback']} fallback, {p['failed']} failed of {p['total']}")
+        return self.progress
+
+    def jobs(self) -> Iterator[Tuple[str, Callable]]:
+        """(cache_key, fetch) for every catalog entry, comprehensive resources first"""
+        catalog = self._catalog()
+        for domain, subdomain, difficulty, _ in catalog:
+            yield (
+                self.generator._comprehensive_cache_key(domain, subdomain, difficulty),
+                lambda d=domain, s=subdomain, l=difficulty: self.fetcher.get_comprehensive_resources(d, s, l)
+            )
+        # Topic entries do not depend on the subdomain: each is warmed once
+        topic_keys = set()
+        for domain, _, difficulty, topics in catalog:
+            for topic in topics:
+                cache_key = self.generator._topic_cache_key(domain, topic, difficulty)
+                if cache_key in topic_keys:
+                    continue
+                topic_keys.add(cache_key)
+                keywords = topic.get('keywords', [topic['name']])
+                yield (
+                    cache_key,
+                    lambda t=topic, k=keywords, l=difficulty: self.generator._fetch_topic_resources(t, k, l)
+                )
+
+    def _catalog(self) -> List[Tuple[str, str, str, List]]:
+        """(domain, subdomain, difficulty, topics) for every combination a request can ask for"""
+        catalog = []
+        for domain, levels in self.generator.database.items():
+            if self.domains and domain not in self.domains:
+                continue
+            for subdomain in self.generator.catalog_subdomains(domain):
+                for difficulty, content in levels.items():
+                    catalog.append((domain, subdomain, difficulty, content.get('topics', [])))
+        return catalog
+
+    def _wait_for_budget(self) -> bool:
+        """Wait for spare rate-limit tokens; False once background quota spending is refused"""
+        if not self.fetcher.quota_scheduler.should_spend(YOUTUBE_SEARCH_COST, "background"):
+            logger.warning("YouTube quota left for background work is used up, stopping cache warming; "
+                           "the next run resumes from here")
+            return False
+
+        needed = 1 + self.token_reserve
+        for limiter, delay in ((self.fetcher.youtube_limiter, self.fetcher.youtube_delay),
+                               (self.fetcher.github_limiter, self.fetcher.github_delay)):
+            while limiter.available() < needed:
+                if self._stopped.wait(delay):
+                    return False
+        return True
+
+    def _warm(self, cache_key: str, fetch: Callable):
+        try:
+            with background_priority():
+                value = fetch()
+            self.cache.set(cache_key, value)
+            self._record("fallback" if self.cache._is_negative(value) else "warmed", cache_key)
+        except Exception as e:
+            logger.error(f"Could not warm {cache_key}: {str(e)}")
+            self._record("failed", cache_key)
+
+    def _record(self, outcome: str, cache_key: str):
+        with self._progress_lock:
+            self.progress[outcome] += 1
+            p = self.progress
+            done = p["warmed"] + p["skipped"] + p["fallback"] + p["failed"]
+        if outcome != "skipped" or done == p["total"]:
+            logger.info(f"Cache warming {done}/{p['total']}: {cache_key} {outcome}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Fill the resource cache for every catalog combination")
+    parser.add_argument("--domain", action="append", dest="domains", help="Only warm this domain (repeatable)")
+    parser.add_argument("--concurrency", type=int, help="Entries fetched at a time (default CACHE_WARM_CONCURRENCY or 2)")
+    parser.add_argument("--force", action="store_true", help="Refetch entries that are already warm")
+    args = parser.parse_args()
+
+    os.environ.setdefault('HTTP_PREWARM', 'false')
+    os.environ['CACHE_WARM_ON_STARTUP'] = 'false'
+    import enhanced_app
+
+    if enhanced_app.cache_snapshot is not None:
+        enhanced_app.cache_snapshot.loaded.wait()
+
+    warmer = CacheWarmer(enhanced_app.path_generator, concurrency=args.concurrency, domains=args.domains, force=args.force)
+    try:
+        warmer.run()
+    except KeyboardInterrupt:
+        warmer.stop()
+        logger.info("Cache warming interrupted; the next run resumes from the entries cached so far")
+    # An in-memory cache is written to its snapshot at exit, for the workers' next start
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+import threading
+import time
+from collections import deque
+from typing import Dict
+import logging
+
+logger = logging.getLogger(__name__)
+
+class CircuitBreaker:
+    """Per-provider circuit breaker driven by recent failures and latencies.
+
+    closed:    calls go through; outcomes are kept for a sliding window. Errors and
+               calls slower than ``slow_call_seconds`` count as failures, and the
+               circuit opens once enough calls in the window have failed.
+    open:      calls are refused so callers go straight to cached or fallback data.
+    half_open: after ``recovery_seconds`` a limited number of probe calls are let
+               through; a successful probe closes the circuit, a failed one reopens it.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_rate: float = 0.5, min_calls: int = 5, window_seconds: float = 60,
+                 slow_call_seconds: float = 5, recovery_seconds: float = 30, half_open_probes: int = 1):
+        self.name = name
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.window_seconds = window_seconds
+        self.slow_call_seconds = slow_call_seconds
+        self.recovery_seconds = recovery_seconds
+        self.half_open_probes = half_open_probes
+
+        self.state = self.CLOSED
+        self.opened_at = 0.0
+        self.probes_in_flight = 0
+        self.outcomes = deque()  # (timestamp, failed, latency)
+        self._lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        """Whether a call to the provider may go out now"""
+        with self._lock:
+            if self.state == self.OPEN:
+                if time.monotonic() - self.opened_at < self.recovery_seconds:
+                    return False
+                self.state = self.HALF_OPEN
+                self.probes_in_flight = 0
+                logger.info(f"Circuit for {self.name} half-open, probing")
+
+            if self.state == self.HALF_OPEN:
+                if self.probes_in_flight >= self.half_open_probes:
+                    return False
+                self.probes_in_flight += 1
+            return True
+
+    def cancel_request(self):
+        """Hand back a call let through by allow_request that was not made after all"""
+        with self._lock:
+            if self.state == self.HALF_OPEN and self.probes_in_flight > 0:
+                self.probes_in_flight -= 1
+
+    def record_success(self, latency: float):
+        """Record a completed call; slow calls count as failures"""
+        if latency > self.slow_call_seconds:
+            self.record_failure(latency)
+            return
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self.state = self.CLOSED
+                self.outcomes.clear()
+                logger.info(f"Circuit for {self.name} closed")
+            self._add_outcome(False, latency)
+
+    def record_failure(self, latency: float):
+        """Record a failed or too-slow call"""
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self._open()
+                return
+            self._add_outcome(True, latency)
+            failures = sum(1 for _, failed, _ in self.outcomes if failed)
+            if (self.state == self.CLOSED and len(self.outcomes) >= self.min_calls
+                    and failures / len(self.outcomes) >= self.failure_rate):
+                self._open()
+
+    def _add_outcome(self, failed: bool, latency: float):
+        now = time.monotonic()
+        self.outcomes.append((now, failed, latency))
+        while self.outcomes and now - self.outcomes[0][0] > self.window_seconds:
+            self.outcomes.popleft()
+
+    def _open(self):
+        self.state = self.OPEN
+        self.opened_at = time.monotonic()
+        self.probes_in_flight = 0
+        logger.warning(f"Circuit for {self.name} opened, serving cached or fallback results for {self.recovery_seconds}s")
+
+    def snapshot(self) -> Dict:
+        """Current state and recent outcomes, for health reporting"""
+        with self._lock:
+            calls = len(self.outcomes)
+            failures = sum(1 for _, failed, _ in self.outcomes if failed)
+            latencies = [latency for _, _, latency in self.outcomes]
+            return {
+                "state": self.state,
+                "recent_calls": calls,
+                "recent_failures": failures,
+                "average_latency_seconds": round(sum(latencies) / calls, 3) if calls else None
+            }
@@ -1,16 +1,29 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
 from flask_cors import CORS
 import json
 from datetime import datetime, timedelta
 import uuid
 import os
-from resource_fetcher import resource_fetcher, resource_cache
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError, wait
+from functools import lru_cache, partial
+from resource_fetcher import Deadline, fetch_deadline, resource_fetcher, resource_cache
+from cache_snapshot import CacheSnapshot
+from cache_store import freeze
+from cache_warmer import CacheWarmer
+from keyword_matcher import KeywordMatcher
 import logging
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Optionally serve provider calls from the asyncio fetcher through its sync bridge
+if os.getenv('RESOURCE_FETCHER_MODE', 'sync').lower() == 'async':
+    from async_resource_fetcher import AsyncResourceFetcher, SyncFetcherBridge
+    resource_fetcher = SyncFetcherBridge(AsyncResourceFetcher(resource_fetcher))
+    logger.info("Using asyncio resource fetcher")
+
 app = Flask(__name__)
 CORS(app)
 
@@ -619,11 +632,96 @@ LEARNING_DATABASE = {
     }
 }
 
+# Keywords that point free-text goals at a domain, and at a subdomain within it
+DOMAIN_KEYWORDS = {
+    'web-development': [
+        'web', 'frontend', 'backend', 'fullstack', 'react', 'javascript', 'html', 'css',
+        'node', 'express', 'website', 'app', 'vue', 'angular', 'typescript', 'api'
+    ],
+    'data-science': [
+        'data', 'analytics', 'machine learning', 'ai', 'pandas', 'python', 'statistics',
+        'visualization', 'analysis', 'ml', 'numpy', 'scikit', 'tensorflow', 'pytorch'
+    ],
+    'mobile-development': [
+        'mobile', 'ios', 'android', 'swift', 'kotlin', 'react native', 'flutter',
+        'app development', 'mobile app', 'smartphone'
+    ],
+    'cloud-computing': [
+        'cloud', 'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'devops',
+        'infrastructure', 'serverless', 'microservices'
+    ],
+    'cybersecurity': [
+        'security', 'cybersecurity', 'hacking', 'penetration', 'vulnerability',
+        'encryption', 'firewall', 'malware', 'threat'
+    ],
+    'ui-ux-design': [
+        'design', 'ui', 'ux', 'user interface', 'user experience', 'figma',
+        'sketch', 'prototype', 'wireframe'
+    ],
+    'game-development': [
+        'game', 'gaming', 'unity', 'unreal', 'game development', 'game design',
+        'gamedev', 'indie game'
+    ],
+    'blockchain': [
+        'blockchain', 'crypto', 'cryptocurrency', 'bitcoin', 'ethereum', 'smart contract',
+        'defi', 'nft', 'web3'
+    ]
+}
+
+SUBDOMAIN_KEYWORDS = {
+    'web-development': {
+        'frontend': ['react', 'vue', 'angular', 'frontend', 'ui', 'css', 'html'],
+        'backend': ['node', 'express', 'api', 'backend', 'server', 'database'],
+        'fullstack': ['fullstack', 'full stack', 'mern', 'mean', 'end to end'],
+        'devops': ['devops', 'docker', 'kubernetes', 'ci/cd', 'deployment']
+    },
+    'data-science': {
+        'analytics': ['analytics', 'analysis', 'business intelligence', 'dashboard'],
+        'machine-learning': ['machine learning', 'ml', 'model', 'prediction'],
+        'ai': ['ai', 'artificial intelligence', 'deep learning', 'neural'],
+        'data-engineering': ['data engineering', 'pipeline', 'etl', 'big data']
+    },
+    'mobile-development': {
+        'ios': ['ios', 'swift', 'iphone', 'ipad'],
+        'android': ['android', 'kotlin', 'java'],
+        'react-native': ['react native', 'react-native'],
+        'flutter': ['flutter', 'dart']
+    },
+    'cloud-computing': {
+        'aws': ['aws', 'amazon web services'],
+        'azure': ['azure', 'microsoft'],
+        'gcp': ['gcp', 'google cloud'],
+        'cloud-devops': ['devops', 'ci/cd', 'deployment']
+    }
+}
+
+# Compiled once: domains are labelled by name, subdomains by (domain, subdomain)
+KEYWORD_MATCHER = KeywordMatcher({
+    **DOMAIN_KEYWORDS,
+    **{(domain, subdomain): keywords
+       for domain, subdomains in SUBDOMAIN_KEYWORDS.items() for subdomain, keywords in subdomains.items()}
+})
+
 class AdvancedLearningPathGenerator:
     def __init__(self):
         self.database = LEARNING_DATABASE
         self.resource_fetcher = resource_fetcher
         self.cache = resource_cache
+        
+        # Topic resources for a whole plan are fetched in parallel before weeks are built
+        self.prefetch_deadline = float(os.getenv('TOPIC_PREFETCH_DEADLINE_SECONDS', 15))
+        self.prefetch_executor = ThreadPoolExecutor(
+            max_workers=int(os.getenv('TOPIC_PREFETCH_WORKERS', 8)), thread_name_prefix="topic-prefetch"
+        )
+        
+        # End-to-end latency budget for one path; requests may override it with latencyBudgetMs
+        # (see latency_budget_seconds)
+        self.latency_budget = float(os.getenv('PATH_LATENCY_BUDGET_SECONDS', 20))
+        # Budget for a whole /generate-paths batch, whose fetches are shared by all of its paths
+        self.batch_latency_budget = float(os.getenv('BATCH_LATENCY_BUDGET_SECONDS', 60))
+        
+        # Path skeletons per (domain, subdomain, difficulty, weeks, hours); they never change at runtime
+        self.path_skeleton = lru_cache(maxsize=int(os.getenv('PATH_SKELETON_CACHE_SIZE', 1024)))(self._build_path_skeleton)
     
     def analyze_user_input(self, user_input):
         """Enhanced analysis that handles frontend domain selection"""
@@ -649,55 +747,15 @@ class AdvancedLearningPathGenerator:
         # Combine all text for analysis
         combined_text = f"{goal_title} {description} {' '.join(goals)} {' '.join(preferred_topics)}".lower()
         
-        # Enhanced domain detection with scoring
-        domain_scores = {}
-        
-        # Define keywords for each domain
-        domain_keywords = {
-            'web-development': [
-                'web', 'frontend', 'backend', 'fullstack', 'react', 'javascript', 'html', 'css', 
-                'node', 'express', 'website', 'app', 'vue', 'angular', 'typescript', 'api'
-            ],
-            'data-science': [
-                'data', 'analytics', 'machine learning', 'ai', 'pandas', 'python', 'statistics', 
-                'visualization', 'analysis', 'ml', 'numpy', 'scikit', 'tensorflow', 'pytorch'
-            ],
-            'mobile-development': [
-                'mobile', 'ios', 'android', 'swift', 'kotlin', 'react native', 'flutter', 
-                'app development', 'mobile app', 'smartphone'
-            ],
-            'cloud-computing': [
-                'cloud', 'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'devops', 
-                'infrastructure', 'serverless', 'microservices'
-            ],
-            'cybersecurity': [
-                'security', 'cybersecurity', 'hacking', 'penetration', 'vulnerability', 
-                'encryption', 'firewall', 'malware', 'threat'
-            ],
-            'ui-ux-design': [
-                'design', 'ui', 'ux', 'user interface', 'user experience', 'figma', 
-                'sketch', 'prototype', 'wireframe'
-            ],
-            'game-development': [
-                'game', 'gaming', 'unity', 'unreal', 'game development', 'game design', 
-                'gamedev', 'indie game'
-            ],
-            'blockchain': [
-                'blockchain', 'crypto', 'cryptocurrency', 'bitcoin', 'ethereum', 'smart contract', 
-                'defi', 'nft', 'web3'
-            ]
-        }
-        
-        # Calculate scores for each domain
-        for domain, keywords in domain_keywords.items():
-            score = sum(1 for keyword in keywords if keyword in combined_text)
-            domain_scores[domain] = score
+        # Score every domain and subdomain in one pass over the text
+        keyword_counts = KEYWORD_MATCHER.counts(combined_text)
+        domain_scores = {domain: keyword_counts.get(domain, 0) for domain in DOMAIN_KEYWORDS}
         
         # Determine primary domain
         primary_domain = max(domain_scores, key=domain_scores.get) if max(domain_scores.values()) > 0 else 'web-development'
         
         # Determine subdomain based on specific keywords
-        subdomain = self._determine_subdomain(primary_domain, combined_text, preferred_topics)
+        subdomain = self._determine_subdomain(primary_domain, combined_text, preferred_topics, keyword_counts)
         
         return {
             'domain': primary_domain,
@@ -706,180 +764,280 @@ class AdvancedLearningPathGenerator:
             'scores': domain_scores
         }
     
-    def _determine_subdomain(self, domain, combined_text, preferred_topics):
+    def catalog_subdomains(self, domain):
+        """Subdomains keyword analysis can resolve a request for ``domain`` to"""
+        return list(SUBDOMAIN_KEYWORDS.get(domain, {})) or ['general']
+    
+    def _determine_subdomain(self, domain, combined_text, preferred_topics, keyword_counts=None):
         """Determine the most appropriate subdomain"""
-        subdomain_keywords = {
-            'web-development': {
-                'frontend': ['react', 'vue', 'angular', 'frontend', 'ui', 'css', 'html'],
-                'backend': ['node', 'express', 'api', 'backend', 'server', 'database'],
-                'fullstack': ['fullstack', 'full stack', 'mern', 'mean', 'end to end'],
-                'devops': ['devops', 'docker', 'kubernetes', 'ci/cd', 'deployment']
-            },
-            'data-science': {
-                'analytics': ['analytics', 'analysis', 'business intelligence', 'dashboard'],
-                'machine-learning': ['machine learning', 'ml', 'model', 'prediction'],
-                'ai': ['ai', 'artificial intelligence', 'deep learning', 'neural'],
-                'data-engineering': ['data engineering', 'pipeline', 'etl', 'big data']
-            },
-            'mobile-development': {
-                'ios': ['ios', 'swift', 'iphone', 'ipad'],
-                'android': ['android', 'kotlin', 'java'],
-                'react-native': ['react native', 'react-native'],
-                'flutter': ['flutter', 'dart']
-            },
-            'cloud-computing': {
-                'aws': ['aws', 'amazon web services'],
-                'azure': ['azure', 'microsoft'],
-                'gcp': ['gcp', 'google cloud'],
-                'cloud-devops': ['devops', 'ci/cd', 'deployment']
-            }
-        }
-        
-        if domain not in subdomain_keywords:
+        if domain not in SUBDOMAIN_KEYWORDS:
             return 'general'
         
-        subdomain_scores = {}
-        for subdomain, keywords in subdomain_keywords[domain].items():
-            score = sum(1 for keyword in keywords if keyword in combined_text)
-            # Also check preferred topics
-            score += sum(1 for topic in preferred_topics if any(keyword in topic.lower() for keyword in keywords))
-            subdomain_scores[subdomain] = score
+        if keyword_counts is None:
+            keyword_counts = KEYWORD_MATCHER.counts(combined_text)
+        subdomain_scores = {
+            subdomain: keyword_counts.get((domain, subdomain), 0) for subdomain in SUBDOMAIN_KEYWORDS[domain]
+        }
+        # Also check preferred topics: one point per topic mentioning any of a subdomain's keywords
+        for topic in preferred_topics:
+            for label in KEYWORD_MATCHER.counts(topic.lower()):
+                if isinstance(label, tuple) and label[0] == domain:
+                    subdomain_scores[label[1]] += 1
         
-        return max(subdomain_scores, key=subdomain_scores.get) if max(subdomain_scores.values()) > 0 else list(subdomain_keywords[domain].keys())[0]
+        return max(subdomain_scores, key=subdomain_scores.get) if max(subdomain_scores.values()) > 0 else list(SUBDOMAIN_KEYWORDS[domain].keys())[0]
     
-    def generate_detailed_weekly_plan(self, domain, subdomain, difficulty, duration_weeks, hours_per_week, user_goals):
+    def generate_detailed_weekly_plan(self, domain, subdomain, difficulty, duration_weeks, hours_per_week, user_goals, deadline=None):
         """Generate comprehensive weekly learning plan with real resources"""
         if domain not in self.database or difficulty not in self.database[domain]:
             # Fallback to available domain/difficulty
             domain = 'web-development' if domain not in self.database else domain
             difficulty = 'beginner' if difficulty not in self.database[domain] else difficulty
         
+        skeleton = self.path_skeleton(domain, subdomain, difficulty, duration_weeks, hours_per_week)
+        return self._fill_weekly_resources(skeleton, domain, difficulty, deadline)
+    
+    def _fill_weekly_resources(self, skeleton, domain, difficulty, deadline=None):
+        """The skeleton's weeks with each topic's resources filled in"""
+        # Fetch resources for every distinct topic in the schedule at once, then only read them
+        topic_resources = self.prefetch_topic_resources(domain, skeleton['topics'], difficulty, deadline)
+        return self._weeks_with_resources(skeleton, topic_resources)
+    
+    def _weeks_with_resources(self, skeleton, topic_resources):
+        """The skeleton's weeks with resources already resolved per topic name"""
+        return [
+            {**week, "resources_needed": topic_resources[week['primary_topic']]}
+            for week in skeleton['weekly_plan']
+        ]
+    
+    def _build_path_skeleton(self, domain, subdomain, difficulty, duration_weeks, hours_per_week):
+        """Everything in a path that depends only on its parameters, frozen so requests can share it.
+        
+        Weeks carry no resources and milestones no ids; generate_path fills those in per request.
+        """
         content = self.database[domain][difficulty]
         topics = content['topics']
         
-        weekly_plan = []
-        current_week = 1
-        current_topic_index = 0
+        schedule = list(self._schedule_weeks(topics, duration_weeks, hours_per_week))
+        scheduled_topics = list({topic['name']: topic for _, topic, _, _ in schedule}.values())
+        
+        weekly_plan = [
+            self._build_week(current_week, topic, week_in_topic, weeks_for_topic, duration_weeks, hours_per_week)
+            for current_week, topic, week_in_topic, weeks_for_topic in schedule
+        ]
+        
+        milestones = self.generate_comprehensive_milestones(weekly_plan, domain, subdomain, difficulty)
+        return freeze({
+            "topics": scheduled_topics,
+            "weekly_plan": weekly_plan,
+            "milestones": [{key: value for key, value in milestone.items() if key != "id"} for milestone in milestones],
+            "learning_metrics": self.calculate_learning_metrics(weekly_plan, duration_weeks, hours_per_week, domain, subdomain)
+        })
+    
+    def _build_week(self, current_week, topic, week_in_topic, weeks_for_topic, duration_weeks, hours_per_week):
+        """One scheduled week of a path, without its resources"""
+        # Determine learning phase
+        progress_percentage = current_week / duration_weeks
+        if progress_percentage <= 0.3:
+            phase = "Foundation Building"
+            focus = "Understanding core concepts and building fundamental skills"
+        elif progress_percentage <= 0.7:
+            phase = "Skill Development"
+            focus = "Applying knowledge through hands-on practice and projects"
+        else:
+            phase = "Mastery & Integration"
+            focus = "Advanced implementation and portfolio development"
+        
+        # Generate specific activities for the week
+        activities = self.generate_weekly_activities(topic, week_in_topic, weeks_for_topic, phase)
+        
+        # Calculate deliverables
+        deliverables = self.generate_weekly_deliverables(topic, week_in_topic, weeks_for_topic)
+        
+        return {
+            "week": current_week,
+            "phase": phase,
+            "focus": focus,
+            "primary_topic": topic['name'],
+            "subtopics": topic['subtopics'][week_in_topic:week_in_topic+2] if week_in_topic < len(topic['subtopics']) else topic['subtopics'][-2:],
+            "learning_objectives": self.generate_weekly_objectives(topic, week_in_topic),
+            "activities": activities,
+            "deliverables": deliverables,
+            "estimated_hours": hours_per_week,
+            "difficulty_level": topic['difficulty'],
+            "resources_needed": [],
+            "assessment": self.generate_weekly_assessment(topic, week_in_topic),
+            "completed": False,
+            "completed_at": None
+        }
+    
+    def _schedule_weeks(self, topics, duration_weeks, hours_per_week, start_week=1, topic_index=0, weeks_done=0, hours_done=0):
+        """Yield (week, topic, week_in_topic, weeks_for_topic) for every scheduled week.
+        
+        A re-plan resumes at ``start_week`` in ``topics[topic_index]``, of which ``weeks_done``
+        weeks and ``hours_done`` hours are already behind the learner.
+        """
+        current_week = start_week
+        current_topic_index = topic_index
         
         while current_week <= duration_weeks and current_topic_index < len(topics):
             topic = topics[current_topic_index]
-            weeks_for_topic = max(1, round(topic['estimated_hours'] / hours_per_week))
+            if weeks_done:
+                # Resuming part-way through a topic: what is left of it, at the current pace
+                weeks_for_topic = weeks_done + max(1, round((topic['estimated_hours'] - hours_done) / hours_per_week))
+            else:
+                weeks_for_topic = max(1, round(topic['estimated_hours'] / hours_per_week))
             
-            for week_in_topic in range(weeks_for_topic):
+            for week_in_topic in range(weeks_done, weeks_for_topic):
                 if current_week > duration_weeks:
                     break
-                
-                # Determine learning phase
-                progress_percentage = current_week / duration_weeks
-                if progress_percentage <= 0.3:
-                    phase = "Foundation Building"
-                    focus = "Understanding core concepts and building fundamental skills"
-                elif progress_percentage <= 0.7:
-                    phase = "Skill Development"
-                    focus = "Applying knowledge through hands-on practice and projects"
-                else:
-                    phase = "Mastery & Integration"
-                    focus = "Advanced implementation and portfolio development"
-                
-                # Generate specific activities for the week
-                activities = self.generate_weekly_activities(topic, week_in_topic, weeks_for_topic, phase)
-                
-                # Calculate deliverables
-                deliverables = self.generate_weekly_deliverables(topic, week_in_topic, weeks_for_topic)
-                
-                # Get real resources for this topic
-                topic_resources = self.get_topic_resources(domain, subdomain, topic, difficulty)
-                
-                weekly_plan.append({
-                    "week": current_week,
-                    "phase": phase,
-                    "focus": focus,
-                    "primary_topic": topic['name'],
-                    "subtopics": topic['subtopics'][week_in_topic:week_in_topic+2] if week_in_topic < len(topic['subtopics']) else topic['subtopics'][-2:],
-                    "learning_objectives": self.generate_weekly_objectives(topic, week_in_topic),
-                    "activities": activities,
-                    "deliverables": deliverables,
-                    "estimated_hours": hours_per_week,
-                    "difficulty_level": topic['difficulty'],
-                    "resources_needed": topic_resources,
-                    "assessment": self.generate_weekly_assessment(topic, week_in_topic),
-                    "completed": False,
-                    "completed_at": None
-                })
-                
+                yield current_week, topic, week_in_topic, weeks_for_topic
                 current_week += 1
             
+            weeks_done = hours_done = 0
             current_topic_index += 1
+    
+    def prefetch_topic_resources(self, domain, topics, difficulty, deadline=None):
+        """Fetch resources for several topics in parallel under one deadline, keyed by topic name"""
+        cache_keys = {topic['name']: self._topic_cache_key(domain, topic, difficulty) for topic in topics}
+        resolved = self.resolve_resources({
+            self._topic_cache_key(domain, topic, difficulty): self._topic_job(domain, topic, difficulty, deadline)
+            for topic in topics
+        }, deadline)
+        return {name: resolved[cache_key] for name, cache_key in cache_keys.items()}
+    
+    def resolve_resources(self, jobs, deadline=None):
+        """Resolve resource cache keys in parallel under one deadline, each key once.
+        
+        ``jobs`` maps a cache key to (fetch, fallback, section). Cached keys are read inline,
+        the rest fetched on the prefetch pool. A key with a fallback that misses the deadline,
+        or the request's latency budget, gets the fallback and its section is marked degraded;
+        its fetch keeps running and caches its result for the next request. Keys without a
+        fallback bound their own fetch and are waited for.
+        """
+        results = {}
+        futures = {}
+        
+        for cache_key, (fetch, _, _) in jobs.items():
+            if self.cache.peek(cache_key):
+                # Cached: read inline, refreshing a soft-expired entry in the background
+                results[cache_key] = fetch()
+                continue
+            futures[self.prefetch_executor.submit(fetch)] = cache_key
+        
+        if futures:
+            timeout = deadline.bounded(self.prefetch_deadline) if deadline is not None else self.prefetch_deadline
+            done, _ = wait([future for future, cache_key in futures.items() if jobs[cache_key][1] is not None], timeout=timeout)
+            for future, cache_key in futures.items():
+                _, fallback, section = jobs[cache_key]
+                if fallback is None or future in done:
+                    results[cache_key] = future.result()
+                else:
+                    logger.warning(f"Resources for {section} missed the {timeout:.2f}s deadline, using fallback")
+                    results[cache_key] = fallback()
+                    if deadline is not None:
+                        deadline.mark_degraded(section)
         
-        return weekly_plan
+        return results
     
-    def get_topic_resources(self, domain, subdomain, topic, difficulty):
+    def _topic_job(self, domain, topic, difficulty, deadline=None):
+        """(fetch, fallback, section) resolving a topic's resources"""
+        return (
+            partial(self.get_topic_resources, domain, topic, difficulty, deadline),
+            partial(self._fallback_topic_resources, topic, difficulty),
+            f"weekly_plan.{topic['name']}"
+        )
+    
+    def _comprehensive_job(self, domain, subdomain, difficulty, deadline=None):
+        """(fetch, fallback, section) resolving a path's comprehensive resources; the fetch bounds itself"""
+        return (partial(self.generate_comprehensive_resources, domain, subdomain, difficulty, deadline), None, "resources")
+    
+    def _topic_cache_key(self, domain, topic, difficulty):
+        """Cache key for a topic's resources; they do not depend on the subdomain"""
+        return f"{domain}_{topic['name']}_{difficulty}"
+    
+    def get_topic_resources(self, domain, topic, difficulty, deadline=None):
         """Get real resources for a specific topic"""
         try:
             # Create cache key
-            cache_key = f"{domain}_{subdomain}_{topic['name']}_{difficulty}"
-            
-            # Check cache first
-            cached_resources = self.cache.get(cache_key)
-            if cached_resources:
-                logger.info(f"Using cached resources for {cache_key}")
-                return cached_resources
+            cache_key = self._topic_cache_key(domain, topic, difficulty)
             
             # Get keywords for this topic
             keywords = topic.get('keywords', [topic['name']])
+            fetch = lambda: self._fetch_topic_resources(topic, keywords, difficulty)
             
-            # Fetch resources using the resource fetcher
-            resources = []
-            
-            # Get videos (limit to 3 for weekly plan)
-            videos = self.resource_fetcher.get_youtube_videos(keywords, difficulty, 3)
-            resources.extend(videos)
+            if deadline is not None and deadline.expired():
+                # Out of latency budget: answer with curated fallbacks and fill the cache in the background
+                cached_resources = self.cache.get(cache_key)
+                if cached_resources:
+                    return cached_resources
+                self.cache.refresh_in_background(cache_key, fetch)
+                deadline.mark_degraded(f"weekly_plan.{topic['name']}")
+                return (self.resource_fetcher._get_fallback_videos(keywords, difficulty)
+                        + self.resource_fetcher._get_fallback_projects(keywords, difficulty)
+                        + self.resource_fetcher._get_fallback_articles(keywords))
             
-            # Get projects (limit to 2)
-            projects = self.resource_fetcher.get_github_projects(keywords, difficulty, 2)
-            resources.extend(projects)
+            # Cached resources are served right away; soft-expired ones are refreshed in the background.
+            # A fetch made for this request waits for rate-limit tokens no longer than its deadline.
+            def fetch_for_request():
+                with fetch_deadline(deadline):
+                    return fetch()
             
-            # Get articles (limit to 2)
-            articles = self.resource_fetcher.get_dev_articles(keywords, 2)
-            resources.extend(articles)
-            
-            # Cache the results
-            self.cache.set(cache_key, resources)
-            
-            logger.info(f"Fetched {len(resources)} resources for topic: {topic['name']}")
-            return resources
+            return self.cache.get_or_fetch(cache_key, fetch_for_request, refresh_fn=fetch)
             
         except Exception as e:
             logger.error(f"Error fetching topic resources: {str(e)}")
-            return [{
-                "title": f"Learn {topic['name']}",
-                "url": "#",
-                "description": f"Resources for learning {topic['name']}",
-                "type": "fallback",
-                "free": True,
-                "difficulty": difficulty
-            }]
+            return self._fallback_topic_resources(topic, difficulty)
     
-    def generate_comprehensive_resources(self, domain, subdomain, difficulty):
+    def _fetch_topic_resources(self, topic, keywords, difficulty):
+        """Fetch a topic's resources from every provider"""
+        resources = []
+        
+        # Get videos (limit to 3 for weekly plan)
+        videos = self.resource_fetcher.get_youtube_videos(keywords, difficulty, 3)
+        resources.extend(videos)
+        
+        # Get projects (limit to 2)
+        projects = self.resource_fetcher.get_github_projects(keywords, difficulty, 2)
+        resources.extend(projects)
+        
+        # Get articles (limit to 2)
+        articles = self.resource_fetcher.get_dev_articles(keywords, 2)
+        resources.extend(articles)
+        
+        logger.info(f"Fetched {len(resources)} resources for topic: {topic['name']}")
+        return resources
+    
+    def _fallback_topic_resources(self, topic, difficulty):
+        """Placeholder resources when a topic's resources are unavailable"""
+        return [{
+            "title": f"Learn {topic['name']}",
+            "url": "#",
+            "description": f"Resources for learning {topic['name']}",
+            "type": "fallback",
+            "free": True,
+            "difficulty": difficulty
+        }]
+    
+    def _comprehensive_cache_key(self, domain, subdomain, difficulty):
+        """Cache key for a path's comprehensive resources"""
+        return f"comprehensive_{domain}_{subdomain}_{difficulty}"
+    
+    def generate_comprehensive_resources(self, domain, subdomain, difficulty, deadline=None):
         """Get comprehensive resource list with real APIs"""
         try:
             # Create cache key
-            cache_key = f"comprehensive_{domain}_{subdomain}_{difficulty}"
-            
-            # Check cache first
-            cached_resources = self.cache.get(cache_key)
-            if cached_resources:
-                logger.info(f"Using cached comprehensive resources for {cache_key}")
-                return cached_resources
-            
-            # Fetch comprehensive resources
-            resources = self.resource_fetcher.get_comprehensive_resources(domain, subdomain, difficulty)
-            
-            # Cache the results
-            self.cache.set(cache_key, resources)
+            cache_key = self._comprehensive_cache_key(domain, subdomain, difficulty)
             
-            logger.info(f"Generated comprehensive resources for {domain}/{subdomain}")
-            return resources
+            # Cached resources are served right away; soft-expired ones are refreshed in the background,
+            # outside the request's latency budget. Results with sections cut short by the budget are not cached.
+            return self.cache.get_or_fetch(
+                cache_key,
+                lambda: self.resource_fetcher.get_comprehensive_resources(domain, subdomain, difficulty, deadline),
+                cacheable=lambda resources: not (
+                    deadline is not None and any(section.startswith("resources.") for section in deadline.degraded)
+                ),
+                refresh_fn=lambda: self.resource_fetcher.get_comprehensive_resources(domain, subdomain, difficulty)
+            )
             
         except Exception as e:
             logger.error(f"Error generating comprehensive resources: {str(e)}")
@@ -1056,122 +1214,480 @@ class AdvancedLearningPathGenerator:
     def generate_path(self, user_input):
         """Generate a comprehensive, production-ready learning path with real resources"""
         try:
-            # Extract and validate user input - FLEXIBLE INPUT HANDLING
-            title = user_input.get('title', '')
-            description = user_input.get('description', '')
-            goals = user_input.get('goals', [])
-            duration_weeks = int(user_input.get('durationWeeks', 12))
-            difficulty = user_input.get('preferredDifficulty', 'beginner').lower()
-            hours_per_week = int(user_input.get('availableTimePerWeek', 10))
-            preferred_topics = user_input.get('preferredTopics', [])
+            plan = self._plan_path(user_input)
             
-            # NEW: Handle explicit domain/subdomain from frontend
-            explicit_domain = user_input.get('domain')
-            explicit_subdomain = user_input.get('subdomain')
+            # Latency budget for the whole request: fetches still pending when it runs out
+            # are answered with curated/fallback data instead of failing the request
+            deadline = Deadline(self.latency_budget_seconds(user_input.get('latencyBudgetMs'), self.latency_budget))
             
-            # Analyze user input to determine optimal path
-            analysis = self.analyze_user_input(user_input)
-            domain = explicit_domain or analysis['domain']
-            subdomain = explicit_subdomain or analysis['subdomain']
+            # Generate comprehensive components: the parameter-determined skeleton is built once per
+            # combination, then each request only adds resources and fresh ids. The comprehensive
+            # and topic fetches all start together and resolve under the one budget.
+            domain, subdomain, difficulty = plan['domain'], plan['subdomain'], plan['difficulty']
+            topics = plan['skeleton']['topics']
+            comprehensive_key = self._comprehensive_cache_key(domain, subdomain, difficulty)
+            jobs = {comprehensive_key: self._comprehensive_job(domain, subdomain, difficulty, deadline)}
+            jobs.update({self._topic_cache_key(domain, topic, difficulty): self._topic_job(domain, topic, difficulty, deadline)
+                         for topic in topics})
+            resolved = self.resolve_resources(jobs, deadline)
             
-            logger.info(f"Generating path for domain: {domain}, subdomain: {subdomain}, difficulty: {difficulty}")
-            logger.info(f"Explicit domain selection: {explicit_domain}, Explicit subdomain: {explicit_subdomain}")
-            
-            # Validate domain and difficulty
-            if domain not in self.database:
-                domain = 'web-development'  # fallback
-            if difficulty not in self.database[domain]:
-                difficulty = 'beginner'  # fallback
-            
-            # Get domain-specific content
-            domain_content = self.database[domain][difficulty]
+            weekly_plan = self._weeks_with_resources(plan['skeleton'], {
+                topic['name']: resolved[self._topic_cache_key(domain, topic, difficulty)] for topic in topics
+            })
+            return self._assemble_path(plan, weekly_plan, resolved[comprehensive_key], deadline, list(deadline.degraded))
             
-            # Generate comprehensive components
-            weekly_plan = self.generate_detailed_weekly_plan(domain, subdomain, difficulty, duration_weeks, hours_per_week, goals)
-            milestones = self.generate_comprehensive_milestones(weekly_plan, domain, subdomain, difficulty)
-            resources = self.generate_comprehensive_resources(domain, subdomain, difficulty)
-            learning_metrics = self.calculate_learning_metrics(weekly_plan, duration_weeks, hours_per_week, domain, subdomain)
+        except Exception as e:
+            logger.error(f"Error generating learning path: {str(e)}")
+            return self._failed_path(e)
+    
+    def generate_path_events(self, user_input):
+        """Yield a learning path piece by piece, for streaming responses.
+        
+        The path's header comes first, before any resource is fetched. Each week follows
+        as soon as its topic's resources resolve, then milestones, comprehensive resources,
+        metrics and a final "complete" event. Weeks are not kept once yielded, so memory
+        per request stays flat however long the path is.
+        """
+        try:
+            plan = self._plan_path(user_input)
+            deadline = Deadline(self.latency_budget_seconds(user_input.get('latencyBudgetMs'), self.latency_budget))
+            domain, subdomain, difficulty = plan['domain'], plan['subdomain'], plan['difficulty']
+            skeleton = plan['skeleton']
             
-            # Calculate dates
-            start_date = datetime.now()
-            completion_date = start_date + timedelta(weeks=duration_weeks)
+            header = self._path_header(plan)
+            yield {"event": "path", "learning_path": header}
             
-            # Create comprehensive learning path
-            learning_path = {
-                "id": str(uuid.uuid4()),
-                "title": title,
-                "description": description,
-                "overview": f"This comprehensive {duration_weeks}-week {difficulty}-level learning path in {domain} "
-                           f"({subdomain}) is designed to help you achieve: {title}. You'll invest {hours_per_week} hours per week "
-                           f"in structured learning, hands-on projects, and skill development with real-world resources.",
-                
-                # Core path information
-                "domain": domain,
-                "subdomain": subdomain,
-                "difficulty": difficulty,
-                "duration_weeks": duration_weeks,
-                "hours_per_week": hours_per_week,
-                "total_hours": duration_weeks * hours_per_week,
-                
-                # Learning structure
-                "prerequisites": domain_content['prerequisites'],
-                "learning_objectives": domain_content['learning_objectives'],
-                "weekly_plan": weekly_plan,
-                "milestones": milestones,
-                "resources": resources,
-                
-                # Metrics and tracking
-                "learning_metrics": learning_metrics,
-                "progress_tracking": {
-                    "completed_weeks": 0,
-                    "completed_milestones": 0,
-                    "total_hours_logged": 0,
-                    "current_week": 1,
-                    "completion_percentage": 0
-                },
-                
-                # Dates
-                "created_at": start_date.isoformat(),
-                "start_date": start_date.isoformat(),
-                "estimated_completion": completion_date.isoformat(),
-                "last_updated": start_date.isoformat(),
-                
-                # Metadata
-                "version": "2.0",
-                "generated_by": "PathCrafter Enhanced ML Service",
-                "confidence_score": analysis['confidence'],
-                "analysis_details": analysis
+            # Every fetch starts now; cached topics are read inline when their first week comes up
+            resources_future = self.prefetch_executor.submit(
+                self.generate_comprehensive_resources, domain, subdomain, difficulty, deadline
+            )
+            jobs = {topic['name']: self._topic_job(domain, topic, difficulty, deadline) for topic in skeleton['topics']}
+            futures = {
+                topic['name']: self.prefetch_executor.submit(jobs[topic['name']][0])
+                for topic in skeleton['topics']
+                if not self.cache.peek(self._topic_cache_key(domain, topic, difficulty))
             }
+            wait_until = time.monotonic() + deadline.bounded(self.prefetch_deadline)
             
-            logger.info(f"Successfully generated learning path: {learning_path['id']}")
+            topic_resources = {}
+            total_resources = 0
+            for week in skeleton['weekly_plan']:
+                name = week['primary_topic']
+                if name not in topic_resources:
+                    topic_resources[name] = self._resolve_streamed_topic(jobs[name], futures.get(name), wait_until, deadline)
+                total_resources += len(topic_resources[name])
+                yield {"event": "week", "week": {**week, "resources_needed": topic_resources[name]}}
             
-            return {
+            resources = resources_future.result()
+            yield {"event": "milestones", "milestones": [{"id": str(uuid.uuid4()), **milestone} for milestone in skeleton['milestones']]}
+            yield {"event": "resources", "resources": resources}
+            yield {"event": "learning_metrics", "learning_metrics": {**skeleton['learning_metrics'], "total_resources_provided": total_resources}}
+            
+            logger.info(f"Successfully streamed learning path: {header['id']}")
+            yield {
+                "event": "complete",
                 "success": True,
-                "learning_path": learning_path,
                 "message": f"Comprehensive {domain} ({subdomain}) learning path generated successfully with real resources!",
                 "generation_time": datetime.now().isoformat(),
-                "path_id": learning_path["id"],
-                "resource_count": {
-                    "videos": len(resources.get("videos", [])),
-                    "projects": len(resources.get("projects", [])),
-                    "articles": len(resources.get("articles", [])),
-                    "courses": len(resources.get("courses", [])),
-                    "total": sum(len(r) for r in resources.values())
-                }
+                "path_id": header["id"],
+                "resource_count": self._resource_count(resources),
+                "latency_budget_ms": int(deadline.seconds * 1000),
+                "degraded_sections": list(deadline.degraded)
             }
-            
+        
         except Exception as e:
-            logger.error(f"Error generating learning path: {str(e)}")
-            return {
-                "success": False,
-                "error": str(e),
-                "message": "Failed to generate comprehensive learning path",
-                "timestamp": datetime.now().isoformat()
-            }
+            logger.error(f"Error streaming learning path: {str(e)}")
+            yield {"event": "error", **self._failed_path(e)}
+    
+    def _resolve_streamed_topic(self, job, future, wait_until, deadline):
+        """A topic's resources from its pending fetch, or its fallback once the deadline has passed"""
+        fetch, fallback, section = job
+        if future is None:
+            return fetch()
+        try:
+            return future.result(timeout=max(0.0, wait_until - time.monotonic()))
+        except FutureTimeoutError:
+            logger.warning(f"Resources for {section} missed the streaming deadline, using fallback")
+            deadline.mark_degraded(section)
+            return fallback()
+    
+    def generate_paths(self, user_inputs, budget_ms=None):
+        """Generate several learning paths at once, fetching each resource they share only once.
+        
+        Every input is planned first; the union of their topic and comprehensive resource keys
+        is then resolved in parallel under one latency budget, and each path is assembled from
+        those results. Results, including per-input failures, come back in input order.
+        """
+        deadline = Deadline(self.latency_budget_seconds(budget_ms, self.batch_latency_budget))
+        
+        plans = []
+        for user_input in user_inputs:
+            try:
+                plans.append(self._plan_path(user_input))
+            except Exception as e:
+                logger.error(f"Error planning learning path: {str(e)}")
+                plans.append(e)
+        
+        # Union of the resource keys of every path; comprehensive fetches get their own deadline
+        # (sharing the batch's expiry) so sections they cut short are reported only on their paths
+        jobs = {}
+        comprehensive_deadlines = {}
+        requested_keys = 0
+        for plan in plans:
+            if isinstance(plan, Exception):
+                continue
+            domain, subdomain, difficulty = plan['domain'], plan['subdomain'], plan['difficulty']
+            comprehensive_key = self._comprehensive_cache_key(domain, subdomain, difficulty)
+            if comprehensive_key not in jobs:
+                comprehensive_deadlines[comprehensive_key] = Deadline(deadline.remaining())
+                jobs[comprehensive_key] = self._comprehensive_job(
+                    domain, subdomain, difficulty, comprehensive_deadlines[comprehensive_key]
+                )
+            for topic in plan['skeleton']['topics']:
+                topic_key = self._topic_cache_key(domain, topic, difficulty)
+                if topic_key not in jobs:
+                    jobs[topic_key] = self._topic_job(domain, topic, difficulty, deadline)
+            requested_keys += 1 + len(plan['skeleton']['topics'])
+        
+        logger.info(f"Resolving {len(jobs)} resource keys for {len(plans)} learning paths "
+                    f"({requested_keys} without deduplication)")
+        resolved = self.resolve_resources(jobs, deadline)
+        
+        results = []
+        for plan in plans:
+            if isinstance(plan, Exception):
+                results.append(self._failed_path(plan))
+                continue
+            try:
+                domain, subdomain, difficulty = plan['domain'], plan['subdomain'], plan['difficulty']
+                topic_resources = {
+                    topic['name']: resolved[self._topic_cache_key(domain, topic, difficulty)]
+                    for topic in plan['skeleton']['topics']
+                }
+                comprehensive_key = self._comprehensive_cache_key(domain, subdomain, difficulty)
+                topic_sections = {f"weekly_plan.{name}" for name in topic_resources}
+                degraded = ([section for section in deadline.degraded if section in topic_sections]
+                            + comprehensive_deadlines[comprehensive_key].degraded)
+                results.append(self._assemble_path(
+                    plan, self._weeks_with_resources(plan['skeleton'], topic_resources),
+                    resolved[comprehensive_key], deadline, degraded
+                ))
+            except Exception as e:
+                logger.error(f"Error assembling learning path: {str(e)}")
+                results.append(self._failed_path(e))
+        
+        return results
+    
+    def replan_path(self, learning_path, completed_weeks=None, duration_weeks=None, hours_per_week=None, deadline=None):
+        """Re-plan the weeks of an existing path after its completed ones, and return what changed.
+        
+        The completed prefix of ``weekly_plan`` is kept as is and the scheduling loop resumes
+        right after it, part-way through the current topic if need be, with the new duration
+        and weekly time. Weeks keep the resources of their topic from the existing plan; only
+        topics new to the plan, or that only had fallback resources, are fetched. Raises
+        ValueError for a plan or parameters that cannot be re-planned.
+        """
+        domain, subdomain = learning_path.get('domain'), learning_path.get('subdomain', 'general')
+        difficulty = learning_path.get('difficulty')
+        old_weeks = learning_path.get('weekly_plan')
+        if domain not in self.database or difficulty not in self.database.get(domain, {}) or not isinstance(old_weeks, list):
+            raise ValueError("learningPath needs a known domain and difficulty and its weekly_plan")
+        self._check_weekly_plan(old_weeks)
+        
+        if completed_weeks is None:
+            # Default to the weeks completed in order from the start
+            completed_weeks = next((index for index, week in enumerate(old_weeks) if not week.get('completed')), len(old_weeks))
+        try:
+            completed_weeks = int(completed_weeks)
+            duration_weeks = int(duration_weeks if duration_weeks is not None else learning_path.get('duration_weeks', len(old_weeks)))
+            hours_per_week = int(hours_per_week if hours_per_week is not None else learning_path.get('hours_per_week', 10))
+        except TypeError:
+            raise ValueError("completedWeeks, durationWeeks and availableTimePerWeek must be whole numbers")
+        if not 0 <= completed_weeks <= len(old_weeks):
+            raise ValueError(f"completedWeeks must be between 0 and {len(old_weeks)}")
+        if duration_weeks < completed_weeks or hours_per_week <= 0:
+            raise ValueError("durationWeeks must cover the completed weeks and availableTimePerWeek must be positive")
+        
+        # Re-run the scheduling loop for the remaining weeks only
+        topics = self.database[domain][difficulty]['topics']
+        resume_point = self._resume_point(topics, old_weeks, completed_weeks, hours_per_week)
+        new_weeks = [
+            self._build_week(current_week, topic, week_in_topic, weeks_for_topic, duration_weeks, hours_per_week)
+            for current_week, topic, week_in_topic, weeks_for_topic
+            in self._schedule_weeks(topics, duration_weeks, hours_per_week, completed_weeks + 1, *resume_point)
+        ]
+        
+        # Resources depend only on the topic: reuse the plan's real ones, fetch topics it did not have
+        # and topics it only had fallback resources for
+        topic_resources = {week['primary_topic']: week.get('resources_needed', []) for week in old_weeks}
+        new_topics = list({
+            week['primary_topic']: None for week in new_weeks
+            if week['primary_topic'] not in topic_resources or self.cache._is_negative(topic_resources[week['primary_topic']])
+        })
+        topic_resources.update(self.prefetch_topic_resources(
+            domain, [topic for topic in topics if topic['name'] in new_topics], difficulty, deadline
+        ))
+        new_weeks = [{**week, "resources_needed": topic_resources[week['primary_topic']]} for week in new_weeks]
+        
+        old_remaining = {week.get('week'): week for week in old_weeks[completed_weeks:]}
+        new_numbers = {week['week'] for week in new_weeks}
+        weekly_plan = list(old_weeks[:completed_weeks]) + new_weeks
+        
+        # Milestones are recomputed for the whole plan, keeping the ids and progress of matching ones
+        old_milestones = {(m.get('title'), m.get('target_week')): m for m in learning_path.get('milestones') or [] if isinstance(m, dict)}
+        milestones = []
+        for milestone in self.generate_comprehensive_milestones(weekly_plan, domain, subdomain, difficulty):
+            previous = old_milestones.get((milestone['title'], milestone['target_week']))
+            if previous is not None:
+                milestone.update({key: previous[key] for key in ("id", "completed", "completion_date") if key in previous})
+            milestones.append(milestone)
+        
+        try:
+            start_date = datetime.fromisoformat(learning_path['start_date'])
+        except (KeyError, TypeError, ValueError):
+            start_date = datetime.now()
+        
+        logger.info(f"Re-planned {learning_path.get('id')} from week {completed_weeks + 1}: {len(new_weeks)} weeks, "
+                    f"{len(new_topics)} topics fetched")
+        
+        return {
+            "success": True,
+            "path_id": learning_path.get('id'),
+            "replanned_from_week": completed_weeks + 1,
+            "diff": {
+                "kept_weeks": completed_weeks,
+                "unchanged_weeks": [week['week'] for week in new_weeks if old_remaining.get(week['week']) == week],
+                "updated_weeks": [week for week in new_weeks if week['week'] in old_remaining and old_remaining[week['week']] != week],
+                "added_weeks": [week for week in new_weeks if week['week'] not in old_remaining],
+                "removed_weeks": sorted(number for number in old_remaining if number not in new_numbers)
+            },
+            "path_updates": {
+                "duration_weeks": duration_weeks,
+                "hours_per_week": hours_per_week,
+                "total_hours": sum(week.get('estimated_hours', 0) for week in weekly_plan),
+                "estimated_completion": (start_date + timedelta(weeks=duration_weeks)).isoformat(),
+                "last_updated": datetime.now().isoformat(),
+                "milestones": milestones,
+                "learning_metrics": self.calculate_learning_metrics(weekly_plan, duration_weeks, hours_per_week, domain, subdomain)
+            },
+            "fetched_topics": new_topics,
+            "degraded_sections": list(deadline.degraded) if deadline is not None else []
+        }
+    
+    def _check_weekly_plan(self, weekly_plan):
+        """Raise ValueError unless every week of a submitted plan has the fields re-planning reads"""
+        for number, week in enumerate(weekly_plan, 1):
+            if not isinstance(week, dict) or not isinstance(week.get('primary_topic'), str):
+                raise ValueError(f"week {number} of weekly_plan needs a primary_topic")
+            if week.get('week') != number:
+                raise ValueError(f"week {number} of weekly_plan is numbered {week.get('week')!r}")
+            if (not isinstance(week.get('estimated_hours', 0), (int, float))
+                    or not isinstance(week.get('resources_needed', []), list)):
+                raise ValueError(f"week {number} of weekly_plan needs numeric estimated_hours and a resources_needed list")
+    
+    def _resume_point(self, topics, weekly_plan, completed_weeks, hours_per_week):
+        """(topic_index, weeks_done, hours_done) to resume scheduling after the completed weeks"""
+        if completed_weeks == 0:
+            return 0, 0, 0
+        
+        names = [topic['name'] for topic in topics]
+        current = weekly_plan[completed_weeks - 1].get('primary_topic')
+        if current not in names:
+            raise ValueError(f"Week {completed_weeks} covers {current}, which is not in this path's catalog")
+        topic_index = names.index(current)
+        
+        # Weeks and hours already spent on the current topic, at whatever pace they were planned
+        weeks_done = hours_done = 0
+        for week in reversed(weekly_plan[:completed_weeks]):
+            if week.get('primary_topic') != current:
+                break
+            weeks_done += 1
+            hours_done += week.get('estimated_hours', 0)
+        
+        # The topic is finished if the existing plan moved on after it, or nothing is left of it
+        if completed_weeks < len(weekly_plan):
+            finished = weekly_plan[completed_weeks].get('primary_topic') != current
+        else:
+            finished = round((topics[topic_index]['estimated_hours'] - hours_done) / hours_per_week) <= 0
+        return (topic_index + 1, 0, 0) if finished else (topic_index, weeks_done, hours_done)
+    
+    def latency_budget_seconds(self, budget_ms, default_seconds):
+        """A request's latencyBudgetMs in seconds, or the default; ValueError unless it is a positive number"""
+        if budget_ms is None:
+            return default_seconds
+        try:
+            seconds = float(budget_ms) / 1000 if not isinstance(budget_ms, bool) else None
+        except (TypeError, ValueError):
+            seconds = None
+        if seconds is None or not 0 < seconds < float('inf'):
+            raise ValueError(f"latencyBudgetMs must be a positive number of milliseconds, got {budget_ms!r}")
+        return seconds
+    
+    def _plan_path(self, user_input):
+        """Resolve a request to its path parameters and skeleton, before any resource is fetched"""
+        # Extract and validate user input - FLEXIBLE INPUT HANDLING
+        title = user_input.get('title', '')
+        description = user_input.get('description', '')
+        duration_weeks = int(user_input.get('durationWeeks', 12))
+        difficulty = user_input.get('preferredDifficulty', 'beginner').lower()
+        hours_per_week = int(user_input.get('availableTimePerWeek', 10))
+        
+        # NEW: Handle explicit domain/subdomain from frontend
+        explicit_domain = user_input.get('domain')
+        explicit_subdomain = user_input.get('subdomain')
+        
+        # Analyze user input to determine optimal path
+        analysis = self.analyze_user_input(user_input)
+        domain = explicit_domain or analysis['domain']
+        subdomain = explicit_subdomain or analysis['subdomain']
+        
+        logger.info(f"Generating path for domain: {domain}, subdomain: {subdomain}, difficulty: {difficulty}")
+        logger.info(f"Explicit domain selection: {explicit_domain}, Explicit subdomain: {explicit_subdomain}")
+        
+        # Validate domain and difficulty
+        if domain not in self.database:
+            domain = 'web-development'  # fallback
+        if difficulty not in self.database[domain]:
+            difficulty = 'beginner'  # fallback
+        
+        return {
+            "title": title,
+            "description": description,
+            "duration_weeks": duration_weeks,
+            "difficulty": difficulty,
+            "hours_per_week": hours_per_week,
+            "domain": domain,
+            "subdomain": subdomain,
+            "analysis": analysis,
+            "skeleton": self.path_skeleton(domain, subdomain, difficulty, duration_weeks, hours_per_week)
+        }
+    
+    def _assemble_path(self, plan, weekly_plan, resources, deadline, degraded_sections):
+        """The response for a planned path, from its resolved weekly plan and comprehensive resources"""
+        domain, subdomain, skeleton = plan['domain'], plan['subdomain'], plan['skeleton']
+        
+        milestones = [{"id": str(uuid.uuid4()), **milestone} for milestone in skeleton['milestones']]
+        learning_metrics = {
+            **skeleton['learning_metrics'],
+            "total_resources_provided": sum(len(week['resources_needed']) for week in weekly_plan)
+        }
+        
+        # Create comprehensive learning path
+        learning_path = {
+            **self._path_header(plan),
+            "weekly_plan": weekly_plan,
+            "milestones": milestones,
+            "resources": resources,
+            "learning_metrics": learning_metrics
+        }
+        
+        logger.info(f"Successfully generated learning path: {learning_path['id']}")
+        
+        return {
+            "success": True,
+            "learning_path": learning_path,
+            "message": f"Comprehensive {domain} ({subdomain}) learning path generated successfully with real resources!",
+            "generation_time": datetime.now().isoformat(),
+            "path_id": learning_path["id"],
+            "resource_count": self._resource_count(resources),
+            "latency_budget_ms": int(deadline.seconds * 1000),
+            "degraded_sections": degraded_sections
+        }
+    
+    def _path_header(self, plan):
+        """A path's fields apart from its weekly plan, milestones, resources and metrics"""
+        title, description = plan['title'], plan['description']
+        domain, subdomain, difficulty = plan['domain'], plan['subdomain'], plan['difficulty']
+        duration_weeks, hours_per_week = plan['duration_weeks'], plan['hours_per_week']
+        analysis = plan['analysis']
+        
+        # Get domain-specific content
+        domain_content = self.database[domain][difficulty]
+        
+        # Calculate dates
+        start_date = datetime.now()
+        completion_date = start_date + timedelta(weeks=duration_weeks)
+        
+        return {
+            "id": str(uuid.uuid4()),
+            "title": title,
+            "description": description,
+            "overview": f"This comprehensive {duration_weeks}-week {difficulty}-level learning path in {domain} "
+                       f"({subdomain}) is designed to help you achieve: {title}. You'll invest {hours_per_week} hours per week "
+                       f"in structured learning, hands-on projects, and skill development with real-world resources.",
+            
+            # Core path information
+            "domain": domain,
+            "subdomain": subdomain,
+            "difficulty": difficulty,
+            "duration_weeks": duration_weeks,
+            "hours_per_week": hours_per_week,
+            "total_hours": duration_weeks * hours_per_week,
+            
+            # Learning structure
+            "prerequisites": domain_content['prerequisites'],
+            "learning_objectives": domain_content['learning_objectives'],
+            
+            # Progress tracking
+            "progress_tracking": {
+                "completed_weeks": 0,
+                "completed_milestones": 0,
+                "total_hours_logged": 0,
+                "current_week": 1,
+                "completion_percentage": 0
+            },
+            
+            # Dates
+            "created_at": start_date.isoformat(),
+            "start_date": start_date.isoformat(),
+            "estimated_completion": completion_date.isoformat(),
+            "last_updated": start_date.isoformat(),
+            
+            # Metadata
+            "version": "2.0",
+            "generated_by": "PathCrafter Enhanced ML Service",
+            "confidence_score": analysis['confidence'],
+            "analysis_details": analysis
+        }
+    
+    def _resource_count(self, resources):
+        """Counts of a path's comprehensive resources by kind"""
+        return {
+            "videos": len(resources.get("videos", [])),
+            "projects": len(resources.get("projects", [])),
+            "articles": len(resources.get("articles", [])),
+            "courses": len(resources.get("courses", [])),
+            "total": sum(len(r) for r in resources.values())
+        }
+    
+    def _failed_path(self, error):
+        """The response for a path that could not be generated"""
+        return {
+            "success": False,
+            "error": str(error),
+            "message": "Failed to generate comprehensive learning path",
+            "timestamp": datetime.now().isoformat()
+        }
 
 # Initialize the enhanced generator
 path_generator = AdvancedLearningPathGenerator()
 
+# Warm-start the resource cache from the last snapshot (loaded in the background) and keep saving it
+cache_snapshot = None
+if os.getenv('RESOURCE_CACHE_SNAPSHOT', 'true').lower() == 'true':
+    cache_snapshot = CacheSnapshot(resource_cache)
+    cache_snapshot.start()
+
+# Optionally fill the cache for the whole catalog in the background, after the snapshot has loaded
+if os.getenv('CACHE_WARM_ON_STARTUP', 'false').lower() == 'true':
+    cache_warmer = CacheWarmer(path_generator)
+    cache_warmer.start(ready=cache_snapshot.loaded if cache_snapshot is not None else None)
+
+# Optionally pre-warm provider connections so the first cold fetch skips the TCP+TLS handshake.
+# Off by default: every worker would open its own connections at import
+if os.getenv('HTTP_PREWARM', 'false').lower() == 'true':
+    resource_fetcher.warm_connections()
+
 @app.route('/health', methods=['GET'])
 def health_check():
     """Comprehensive health check with service information"""
@@ -1197,10 +1713,51 @@ def health_check():
             "dev_to": True,
             "caching": True
         },
+        "youtube_quota": resource_fetcher.quota_ledger.snapshot(),
+        "provider_circuits": {
+            provider: breaker.snapshot() for provider, breaker in resource_fetcher.breakers.items()
+        },
         "timestamp": datetime.now().isoformat(),
         "uptime": "Service running with enhanced capabilities"
     })
 
+# Fields every path input needs; the rest have defaults
+REQUIRED_PATH_FIELDS = ["title", "durationWeeks", "preferredDifficulty", "availableTimePerWeek"]
+
+# Inputs accepted by one /generate-paths call
+MAX_BATCH_PATHS = int(os.getenv('BATCH_MAX_PATHS', 500))
+
+def missing_path_fields(user_input):
+    """Required fields absent or empty in a path input"""
+    return [field for field in REQUIRED_PATH_FIELDS if field not in user_input or user_input[field] == ""]
+
+# Streaming formats for /generate-path, chosen with ?stream= or the Accept header
+PATH_STREAM_MIMETYPES = {"ndjson": "application/x-ndjson", "sse": "text/event-stream"}
+
+def path_stream_format():
+    """The streaming format a /generate-path request asks for, or None for one JSON document"""
+    requested = request.args.get('stream', '').lower()
+    if requested in PATH_STREAM_MIMETYPES:
+        return requested
+    accepted = [mimetype for mimetype, _ in request.accept_mimetypes]
+    for stream_format, mimetype in PATH_STREAM_MIMETYPES.items():
+        if mimetype in accepted:
+            return stream_format
+    return None
+
+def stream_path(user_input, stream_format):
+    """Stream a path's events as NDJSON lines or server-sent events, each sent as soon as it is ready"""
+    def render():
+        for event in path_generator.generate_path_events(user_input):
+            if stream_format == "sse":
+                yield f"event: {event['event']}\ndata: {json.dumps(event)}\n\n"
+            else:
+                yield json.dumps(event) + "\n"
+    
+    # No proxy buffering, so each event reaches the client when it is written
+    return Response(render(), mimetype=PATH_STREAM_MIMETYPES[stream_format],
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
 @app.route('/generate-path', methods=['POST'])
 def generate_learning_path():
     """Generate comprehensive learning path with real resources - FLEXIBLE INPUT HANDLING"""
@@ -1211,24 +1768,33 @@ def generate_learning_path():
             return jsonify({
                 "success": False,
                 "message": "No input data provided",
-                "required_fields": ["title", "durationWeeks", "preferredDifficulty", "availableTimePerWeek"]
+                "required_fields": REQUIRED_PATH_FIELDS
             }), 400
         
         # FLEXIBLE validation - only check essential fields
-        essential_fields = ["title", "durationWeeks", "preferredDifficulty", "availableTimePerWeek"]
-        missing_fields = [field for field in essential_fields if field not in user_input or user_input[field] == ""]
+        missing_fields = missing_path_fields(user_input)
         
         if missing_fields:
             return jsonify({
                 "success": False,
                 "message": f"Missing required fields: {', '.join(missing_fields)}",
                 "provided_fields": list(user_input.keys()),
-                "required_fields": essential_fields
+                "required_fields": REQUIRED_PATH_FIELDS
             }), 400
         
+        try:
+            path_generator.latency_budget_seconds(user_input.get('latencyBudgetMs'), path_generator.latency_budget)
+        except ValueError as e:
+            return jsonify({"success": False, "message": str(e)}), 400
+        
         logger.info(f"Generating learning path for: {user_input.get('title')}")
         logger.info(f"Input parameters: {user_input}")
         
+        # Streaming mode: the path header first, then each week as soon as its resources resolve
+        stream_format = path_stream_format()
+        if stream_format:
+            return stream_path(user_input, stream_format)
+        
         # Generate the comprehensive learning path
         result = path_generator.generate_path(user_input)
         
@@ -1249,6 +1815,111 @@ def generate_learning_path():
             "timestamp": datetime.now().isoformat()
         }), 500
 
+@app.route('/generate-paths', methods=['POST'])
+def generate_learning_paths():
+    """Generate learning paths for a list of inputs, fetching resources they share only once"""
+    try:
+        data = request.get_json()
+        user_inputs = data.get('paths') if isinstance(data, dict) else data
+        
+        if not isinstance(user_inputs, list) or not user_inputs:
+            return jsonify({
+                "success": False,
+                "message": "Provide a non-empty list of path inputs as 'paths'",
+                "required_fields": REQUIRED_PATH_FIELDS
+            }), 400
+        if len(user_inputs) > MAX_BATCH_PATHS:
+            return jsonify({
+                "success": False,
+                "message": f"At most {MAX_BATCH_PATHS} paths per batch, got {len(user_inputs)}"
+            }), 400
+        
+        # Inputs failing validation are answered in place; the rest are generated together
+        results = [None] * len(user_inputs)
+        valid = []
+        for index, user_input in enumerate(user_inputs):
+            if not isinstance(user_input, dict):
+                results[index] = {"success": False, "message": "Path input must be an object"}
+                continue
+            missing_fields = missing_path_fields(user_input)
+            if missing_fields:
+                results[index] = {
+                    "success": False,
+                    "message": f"Missing required fields: {', '.join(missing_fields)}",
+                    "provided_fields": list(user_input.keys()),
+                    "required_fields": REQUIRED_PATH_FIELDS
+                }
+                continue
+            valid.append(index)
+        
+        budget_ms = data.get('latencyBudgetMs') if isinstance(data, dict) else None
+        try:
+            path_generator.latency_budget_seconds(budget_ms, path_generator.batch_latency_budget)
+        except ValueError as e:
+            return jsonify({"success": False, "message": str(e)}), 400
+        
+        logger.info(f"Generating {len(valid)} learning paths in one batch ({len(user_inputs) - len(valid)} invalid)")
+        generated = path_generator.generate_paths([user_inputs[index] for index in valid], budget_ms)
+        for index, result in zip(valid, generated):
+            results[index] = result
+        
+        succeeded = sum(1 for result in results if result["success"])
+        return jsonify({
+            "success": True,
+            "results": results,
+            "total": len(results),
+            "succeeded": succeeded,
+            "failed": len(results) - succeeded,
+            "generation_time": datetime.now().isoformat()
+        }), 200
+        
+    except Exception as e:
+        logger.error(f"Error in generate_learning_paths: {str(e)}")
+        return jsonify({
+            "success": False,
+            "message": "Internal server error",
+            "error": str(e),
+            "timestamp": datetime.now().isoformat()
+        }), 500
+
+@app.route('/replan', methods=['POST'])
+def replan_learning_path():
+    """Re-plan the remaining weeks of an existing path for a new duration or weekly time, returning a diff"""
+    try:
+        data = request.get_json()
+        learning_path = data.get('learningPath') if isinstance(data, dict) else None
+        
+        if not isinstance(learning_path, dict):
+            return jsonify({
+                "success": False,
+                "message": "Provide the existing learning path as 'learningPath'",
+                "optional_fields": ["completedWeeks", "durationWeeks", "availableTimePerWeek", "latencyBudgetMs"]
+            }), 400
+        
+        deadline = Deadline(path_generator.latency_budget_seconds(data.get('latencyBudgetMs'), path_generator.latency_budget))
+        result = path_generator.replan_path(
+            learning_path,
+            completed_weeks=data.get('completedWeeks'),
+            duration_weeks=data.get('durationWeeks'),
+            hours_per_week=data.get('availableTimePerWeek'),
+            deadline=deadline
+        )
+        return jsonify(result), 200
+        
+    except ValueError as e:
+        return jsonify({
+            "success": False,
+            "message": f"Cannot re-plan this path: {str(e)}"
+        }), 400
+    except Exception as e:
+        logger.error(f"Error in replan_learning_path: {str(e)}")
+        return jsonify({
+            "success": False,
+            "message": "Internal server error",
+            "error": str(e),
+            "timestamp": datetime.now().isoformat()
+        }), 500
+
 @app.route('/domains', methods=['GET'])
 def get_available_domains():
     """Get detailed information about available learning domains"""
@@ -1344,19 +2015,9 @@ def preview_resources():
         subdomain = data.get('subdomain', 'frontend')
         difficulty = data.get('difficulty', 'beginner')
         
-        # Get a small preview of resources
-        cache_key = f"preview_{domain}_{subdomain}_{difficulty}"
-        cached_preview = resource_cache.get(cache_key)
-        
-        if cached_preview:
-            return jsonify({
-                "success": True,
-                "preview": cached_preview,
-                "cached": True
-            })
-        
-        # Fetch fresh preview
-        resources = resource_fetcher.get_comprehensive_resources(domain, subdomain, difficulty)
+        # The preview is a slice of the path's comprehensive resources, sharing their cache entry
+        cached = resource_cache.peek_for("preview", path_generator._comprehensive_cache_key(domain, subdomain, difficulty)) is not None
+        resources = path_generator.generate_comprehensive_resources(domain, subdomain, difficulty)
         
         # Create preview (limit items)
         preview = {
@@ -1366,9 +2027,6 @@ def preview_resources():
             "courses": resources.get("courses", [])[:2]
         }
         
-        # Cache preview
-        resource_cache.set(cache_key, preview)
-        
         return jsonify({
             "success": True,
             "preview": preview,
@@ -1378,7 +2036,7 @@ def preview_resources():
                 "articles": len(resources.get("articles", [])),
                 "courses": len(resources.get("courses", []))
             },
-            "cached": False
+            "cached": cached
         })
         
     except Exception as e:
@@ -1391,14 +2049,25 @@ def preview_resources():
 
 @app.route('/cache/stats', methods=['GET'])
 def get_cache_stats():
-    """Get cache statistics"""
+    """Get cache statistics, per-namespace counters and one page (or a sample) of cached keys"""
+    cache_stats = resource_cache.stats()
+    limit = min(max(request.args.get('limit', 50, type=int), 0), 500)
+    sample = request.args.get('sample', type=int)
     return jsonify({
         "success": True,
         "cache_stats": {
-            "total_cached_items": len(resource_cache.cache),
+            **cache_stats,
+            "total_cached_items": cache_stats["entries"],
             "cache_duration_hours": resource_cache.cache_duration.total_seconds() / 3600,
-            "cached_keys": list(resource_cache.cache.keys())
+            "cached_keys": resource_cache.key_page(
+                namespace=request.args.get('namespace'),
+                offset=max(request.args.get('offset', 0, type=int), 0),
+                limit=limit,
+                sample=min(max(sample, 0), 500) if sample is not None else None
+            )
         },
+        "path_skeletons": path_generator.path_skeleton.cache_info()._asdict(),
+        "youtube_quota": resource_fetcher.quota_ledger.snapshot(),
         "message": "Cache statistics retrieved successfully"
     })
 
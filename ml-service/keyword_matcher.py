@@ -0,0 +1,80 @@
+from collections import deque
+from typing import Dict, FrozenSet, Hashable, Iterable, List, Set
+
+class KeywordMatcher:
+    """Aho-Corasick automaton that finds every keyword of every group in one pass over a text.
+
+    Keywords match as plain substrings, like ``keyword in text``, and each group is
+    scored by how many of its distinct keywords occur, so results are the same as
+    checking every keyword separately. The automaton is compiled into a transition
+    table once; matching then costs one dict lookup per character of text, however
+    many keywords there are.
+    """
+
+    def __init__(self, groups: Dict[Hashable, Iterable[str]]):
+        self.keywords: List[str] = []
+        self.owners: List[List[Hashable]] = []  # groups each keyword belongs to
+        index: Dict[str, int] = {}
+        for label, keywords in groups.items():
+            for keyword in keywords:
+                keyword = keyword.lower()
+                if keyword not in index:
+                    index[keyword] = len(self.keywords)
+                    self.keywords.append(keyword)
+                    self.owners.append([])
+                if label not in self.owners[index[keyword]]:
+                    self.owners[index[keyword]].append(label)
+
+        self.transitions: List[Dict[str, int]] = []
+        self.outputs: List[FrozenSet[int]] = []
+        self._compile()
+
+    def _compile(self):
+        # Trie of all keywords
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[Set[int]] = [set()]
+        for keyword_id, keyword in enumerate(self.keywords):
+            state = 0
+            for char in keyword:
+                if char not in goto[state]:
+                    goto.append({})
+                    outputs.append(set())
+                    goto[state][char] = len(goto) - 1
+                state = goto[state][char]
+            outputs[state].add(keyword_id)
+
+        # Breadth-first failure links, folded into a full transition table so
+        # matching never has to follow them
+        transitions: List[Dict[str, int]] = [dict(goto[0])] + [{} for _ in goto[1:]]
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            transitions[state] = {**transitions[fail[state]], **goto[state]}
+            outputs[state] |= outputs[fail[state]]
+            for char, child in goto[state].items():
+                fail[child] = transitions[fail[state]].get(char, 0) if state else 0
+                queue.append(child)
+
+        self.transitions = transitions
+        self.outputs = [frozenset(output) for output in outputs]
+
+    def find(self, text: str) -> Set[int]:
+        """Ids of the keywords occurring in ``text``"""
+        transitions = self.transitions
+        outputs = self.outputs
+        found: Set[int] = set()
+        state = 0
+        for char in text:
+            state = transitions[state].get(char, 0)
+            if outputs[state]:
+                found |= outputs[state]
+        return found
+
+    def counts(self, text: str) -> Dict[Hashable, int]:
+        """Distinct keywords found per group, for groups with at least one"""
+        counts: Dict[Hashable, int] = {}
+        for keyword_id in self.find(text):
+            for label in self.owners[keyword_id]:
+                counts[label] = counts.get(label, 0) + 1
+        return counts
@@ -0,0 +1,135 @@
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Optional
+import logging
+
+from rate_limiter import default_state_dir, locked_state_file
+
+logger = logging.getLogger(__name__)
+
+try:
+    from zoneinfo import ZoneInfo
+    QUOTA_TIMEZONE = ZoneInfo("America/Los_Angeles")  # YouTube quotas reset at midnight Pacific Time
+except Exception:  # No tz database in the image: use Pacific Standard Time
+    QUOTA_TIMEZONE = timezone(timedelta(hours=-8))
+
+class QuotaLedger:
+    """Daily API quota usage recorded in a state file shared by all workers and kept across restarts"""
+
+    def __init__(self, name: str, daily_limit: int, state_dir: Optional[str] = None):
+        self.name = name
+        self.daily_limit = daily_limit
+        self.path = os.path.join(state_dir or os.getenv('QUOTA_STATE_DIR') or default_state_dir(), f"{name}.quota.json")
+        self._lock = threading.Lock()
+
+    def _day_bounds(self, now: float):
+        """Quota day label, its start and the next reset, as timestamps"""
+        local_now = datetime.fromtimestamp(now, QUOTA_TIMEZONE)
+        day_start = local_now.replace(hour=0, minute=0, second=0, microsecond=0)
+        next_reset = day_start + timedelta(days=1)
+        return day_start.date().isoformat(), day_start.timestamp(), next_reset.timestamp()
+
+    def _current(self, state: Dict, now: float) -> Dict:
+        """Today's counters, starting a new day when the quota has reset"""
+        day, _, _ = self._day_bounds(now)
+        if state.get("day") != day:
+            state.clear()
+            state.update({"day": day, "used": 0, "calls": 0})
+        return state
+
+    def record(self, cost: int, calls: int = 1):
+        """Record the cost of API calls already made"""
+        with self._lock, locked_state_file(self.path) as state:
+            now = time.time()
+            self._charge(self._current(state, now), cost, calls, now)
+
+    def try_spend(self, cost: int, allowed: Callable[[Dict], bool]) -> bool:
+        """Charge one call's cost if ``allowed(snapshot)`` agrees, checking and charging under one host-wide lock"""
+        with self._lock, locked_state_file(self.path) as state:
+            now = time.time()
+            current = self._current(state, now)
+            if not allowed(self._usage(current, now)):
+                return False
+            self._charge(current, cost, 1, now)
+            return True
+
+    def _charge(self, state: Dict, cost: int, calls: int, now: float):
+        state["used"] += cost
+        state["calls"] += calls
+        state["last_call_at"] = now
+
+    def mark_exhausted(self):
+        """The provider reported the quota as exceeded: stop spending until the reset"""
+        with self._lock, locked_state_file(self.path) as state:
+            self._current(state, time.time())
+            state["used"] = max(state["used"], self.daily_limit)
+        logger.warning(f"{self.name} quota exhausted until the next reset")
+
+    def snapshot(self) -> Dict:
+        """Usage, remaining budget and projected exhaustion for today"""
+        with self._lock, locked_state_file(self.path) as state:
+            now = time.time()
+            current = dict(self._current(state, now))
+        return self._usage(current, now)
+
+    def _usage(self, current: Dict, now: float) -> Dict:
+        _, day_start, next_reset = self._day_bounds(now)
+        used = current["used"]
+        remaining = max(0, self.daily_limit - used)
+
+        # Project exhaustion from today's average burn rate
+        elapsed = max(1.0, now - day_start)
+        burn_rate = used / elapsed
+        projected_exhaustion = None
+        if remaining == 0:
+            projected_exhaustion = now
+        elif burn_rate > 0 and now + remaining / burn_rate < next_reset:
+            projected_exhaustion = now + remaining / burn_rate
+
+        return {
+            "daily_limit": self.daily_limit,
+            "used": used,
+            "remaining": remaining,
+            "calls": current["calls"],
+            "day_elapsed_fraction": round(elapsed / (next_reset - day_start), 4),
+            "resets_at": datetime.fromtimestamp(next_reset, timezone.utc).isoformat(),
+            "projected_exhaustion": (
+                datetime.fromtimestamp(projected_exhaustion, timezone.utc).isoformat()
+                if projected_exhaustion is not None else None
+            )
+        }
+
+class QuotaScheduler:
+    """Decides whether a cold query is worth spending quota on.
+
+    Spending is paced across the quota day: a call is allowed while today's usage
+    stays under the share of the daily limit earned so far plus a burst allowance.
+    Background work (cache warming) gets no burst and must also leave a reserve
+    untouched for interactive requests. ``reserve`` charges an allowed call in the same
+    locked step as the check, so workers deciding at the same time cannot overspend.
+    """
+
+    def __init__(self, ledger: QuotaLedger, burst_units: int, reserve_units: int):
+        self.ledger = ledger
+        self.burst_units = burst_units
+        self.reserve_units = reserve_units
+
+    def should_spend(self, cost: int, priority: str = "interactive") -> bool:
+        """Whether a call would be allowed now, without charging it"""
+        return self._allows(self.ledger.snapshot(), cost, priority)
+
+    def reserve(self, cost: int, priority: str = "interactive") -> bool:
+        """Charge a call before it is made, if it is allowed"""
+        return self.ledger.try_spend(cost, lambda snapshot: self._allows(snapshot, cost, priority))
+
+    def _allows(self, snapshot: Dict, cost: int, priority: str) -> bool:
+        if snapshot["remaining"] < cost:
+            return False
+
+        paced_budget = self.ledger.daily_limit * snapshot["day_elapsed_fraction"]
+        if priority == "background":
+            return (snapshot["used"] + cost <= paced_budget
+                    and snapshot["remaining"] - cost >= self.reserve_units)
+        return snapshot["used"] + cost <= paced_budget + self.burst_units
@@ -0,0 +1,105 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+import logging
+
+try:
+    import fcntl
+except ImportError:  # Windows: state is still shared through the file, but only locked per process
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+def default_state_dir() -> str:
+    """Directory for state shared by every worker on this host"""
+    state_dir = os.getenv('RATE_LIMIT_STATE_DIR', os.path.join(tempfile.gettempdir(), 'pathcrafter'))
+    os.makedirs(state_dir, exist_ok=True)
+    return state_dir
+
+@contextmanager
+def locked_state_file(path: str) -> Iterator[Dict]:
+    """Open a small JSON state file under an exclusive lock and write back any changes.
+
+    The lock is an flock on the file itself, so it serializes every process on the
+    host that uses the same path; the yielded dict is persisted when the block exits.
+    """
+    with open(path, "a+") as handle:
+        if fcntl is not None:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+        try:
+            handle.seek(0)
+            raw = handle.read()
+            try:
+                state = json.loads(raw) if raw else {}
+            except ValueError:
+                logger.warning(f"Resetting corrupt state file {path}")
+                state = {}
+            original = dict(state)
+
+            yield state
+
+            if state != original:
+                handle.seek(0)
+                handle.truncate()
+                handle.write(json.dumps(state))
+                handle.flush()
+        finally:
+            if fcntl is not None:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+class SharedTokenBucket:
+    """Token bucket whose state lives in a lock-protected file shared by all workers on the host.
+
+    try_acquire answers immediately; acquire waits a bounded time for the bucket to
+    refill, giving up at once if enough tokens cannot arrive in time. A denied caller
+    is expected to serve cached or curated data instead.
+    """
+
+    def __init__(self, name: str, rate: float, capacity: float, state_dir: Optional[str] = None):
+        self.name = name
+        self.rate = rate  # tokens added per second
+        self.capacity = capacity
+        self.path = os.path.join(state_dir or default_state_dir(), f"{name}.bucket.json")
+        self._lock = threading.Lock()
+
+    def _refill(self, state: Dict, now: float) -> float:
+        """Tokens available at ``now`` given the stored state"""
+        tokens = state.get("tokens", self.capacity)
+        updated = state.get("updated", now)
+        return min(self.capacity, tokens + max(0.0, now - updated) * self.rate)
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """Take tokens if available, without waiting"""
+        return self._take(tokens) == 0
+
+    def acquire(self, tokens: float = 1.0, timeout: float = 0.0) -> bool:
+        """Take tokens, waiting up to ``timeout`` seconds for the bucket to refill"""
+        give_up_at = time.monotonic() + timeout
+        while True:
+            wait_seconds = self._take(tokens)
+            if wait_seconds == 0:
+                return True
+            if wait_seconds > give_up_at - time.monotonic():
+                return False
+            time.sleep(wait_seconds)
+
+    def _take(self, tokens: float) -> float:
+        """Take tokens if available and return 0, else the seconds until enough have refilled"""
+        with self._lock, locked_state_file(self.path) as state:
+            now = time.time()
+            available = self._refill(state, now)
+            granted = available >= tokens
+            if granted:
+                available -= tokens
+            state["tokens"] = available
+            state["updated"] = now
+            return 0.0 if granted else (tokens - available) / self.rate
+
+    def available(self) -> float:
+        """Tokens currently available, for stats"""
+        with self._lock, locked_state_file(self.path) as state:
+            return self._refill(state, time.time())
@@ -1,26 +1,216 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
 import time
 from datetime import datetime, timedelta
 import os
-from typing import Dict, List, Optional
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+import random
+import threading
+import zlib
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
+from typing import Any, Callable, Dict, List, Optional, Tuple
 import logging
 
+from cache_metrics import CacheMetrics, cache_namespace
+from cache_store import create_cache_store, freeze
+from circuit_breaker import CircuitBreaker
+from quota_ledger import QuotaLedger, QuotaScheduler
+from rate_limiter import SharedTokenBucket
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-class UniversalResourceFetcher:
+# Quota units charged for one YouTube search.list call
+YOUTUBE_SEARCH_COST = 100
+
+# Priority of the provider calls made in the current context: "interactive" for requests,
+# "background" for cache warming. The quota scheduler keeps a reserve for interactive calls.
+FETCH_PRIORITY: ContextVar[str] = ContextVar("fetch_priority", default="interactive")
+
+# Deadline of the request the provider calls in the current context are made for, if any
+FETCH_DEADLINE: ContextVar[Optional["Deadline"]] = ContextVar("fetch_deadline", default=None)
+
+@contextmanager
+def background_priority():
+    """Spend quota for the provider calls made in this block as background work"""
+    token = FETCH_PRIORITY.set("background")
+    try:
+        yield
+    finally:
+        FETCH_PRIORITY.reset(token)
+
+@contextmanager
+def fetch_deadline(deadline: Optional["Deadline"]):
+    """Make the provider calls in this block wait for rate-limit tokens no longer than ``deadline``"""
+    token = FETCH_DEADLINE.set(deadline)
+    try:
+        yield
+    finally:
+        FETCH_DEADLINE.reset(token)
+
+class SingleFlight:
+    """Coalesce concurrent calls that share a key into one execution.
+    
+    The first caller runs the function; callers arriving while it is in flight wait
+    for and share its result (or exception). Nothing is remembered afterwards.
+    """
+    
     def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, Future] = {}
+    
+    def do(self, key: str, fn: Callable):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = Future()
+                self._calls[key] = call
+        
+        if not leader:
+            logger.info(f"Joining in-flight provider call: {key}")
+            return call.result()
+        
+        try:
+            result = fn()
+            call.set_result(result)
+            return result
+        except BaseException as e:
+            call.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+class Deadline:
+    """Latency budget for one request, shared by every fetch made on its behalf.
+    
+    Waits are capped with ``bounded``; sections answered with fallback data because
+    the budget ran out are recorded in ``degraded``.
+    """
+    
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+        self.degraded: List[str] = []
+        self._lock = threading.Lock()
+    
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+    
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+    
+    def bounded(self, timeout: float) -> float:
+        """The given timeout, shortened to what is left of the budget"""
+        return min(timeout, self.remaining())
+    
+    def mark_degraded(self, section: str):
+        with self._lock:
+            if section not in self.degraded:
+                self.degraded.append(section)
+
+class ValidatorStore:
+    """Response validators (ETags), keyed by provider cache key.
+    
+    Bounded LRU: a provider refresh sends the stored ETag as If-None-Match, and a 304
+    answer reuses the result still held by the resource cache, without downloading or
+    parsing the page again. Only the ETag is kept here, so results are not held twice.
+    """
+    
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+    
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            etag = self._entries.get(key)
+            if etag is not None:
+                self._entries.move_to_end(key)
+            return etag
+    
+    def set(self, key: str, etag: Optional[str]):
+        with self._lock:
+            if not etag:
+                self._entries.pop(key, None)
+                return
+            self._entries[key] = etag
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def __len__(self):
+        return len(self._entries)
+
+class UniversalResourceFetcher:
+    def __init__(self, cache: Optional["ResourceCache"] = None, base_urls: Optional[Dict[str, str]] = None):
         # API Keys from environment variables
         self.youtube_api_key = os.getenv('YOUTUBE_API_KEY')
         self.github_token = os.getenv('GITHUB_TOKEN')
         
-        # Rate limiting
-        self.last_youtube_call = 0
-        self.last_github_call = 0
-        self.youtube_delay = 1  # seconds between calls
-        self.github_delay = 0.5
+        # Rate limiting: token buckets shared by every worker on this host. The burst covers one path's
+        # parallel fetches (its topic prefetch plus the comprehensive fan-out), and interactive calls
+        # wait briefly for a token, within their request's deadline, instead of falling back at once
+        self.youtube_delay = float(os.getenv('YOUTUBE_DELAY_SECONDS', 1))  # seconds between calls
+        self.github_delay = float(os.getenv('GITHUB_DELAY_SECONDS', 0.5))
+        prefetch_fanout = int(os.getenv('TOPIC_PREFETCH_WORKERS', 8)) + 1
+        self.youtube_limiter = SharedTokenBucket(
+            "youtube", rate=1 / self.youtube_delay, capacity=float(os.getenv('YOUTUBE_RATE_BURST', prefetch_fanout))
+        )
+        self.github_limiter = SharedTokenBucket(
+            "github", rate=1 / self.github_delay, capacity=float(os.getenv('GITHUB_RATE_BURST', prefetch_fanout))
+        )
+        self.rate_limit_wait = float(os.getenv('RATE_LIMIT_WAIT_SECONDS', 2))
+        
+        # YouTube daily quota: every search is recorded, cold queries are paced across the day
+        self.quota_ledger = QuotaLedger("youtube", daily_limit=int(os.getenv('YOUTUBE_DAILY_QUOTA', 10000)))
+        self.quota_scheduler = QuotaScheduler(
+            self.quota_ledger,
+            burst_units=int(os.getenv('YOUTUBE_QUOTA_BURST_UNITS', 1000)),
+            reserve_units=int(os.getenv('YOUTUBE_QUOTA_RESERVE_UNITS', 2000))
+        )
+        
+        # Concurrent provider fan-out: bounded pool shared by all requests in this worker
+        self.cache = cache
+        self.fetch_workers = int(os.getenv('RESOURCE_FETCH_WORKERS', 8))
+        self.fanout_deadline = float(os.getenv('RESOURCE_FANOUT_DEADLINE_SECONDS', 12))
+        self.executor = ThreadPoolExecutor(max_workers=self.fetch_workers, thread_name_prefix="resource-fetch")
+        
+        # Identical provider queries in flight at the same time share one call
+        self.single_flight = SingleFlight()
+        
+        # Provider queries are cached a full page at a time, shared by every caller of the same query
+        self.provider_page_size = int(os.getenv('PROVIDER_QUERY_RESULTS', 8))
+        
+        # ETags of provider responses, so cache refreshes can be conditional requests
+        self.validators = ValidatorStore(int(os.getenv('VALIDATOR_STORE_SIZE', 2048)))
+        
+        # Long-lived keep-alive HTTP sessions, one per provider
+        self.base_urls = {
+            "youtube": os.getenv('YOUTUBE_BASE_URL', "https://www.googleapis.com"),
+            "github": os.getenv('GITHUB_BASE_URL', "https://api.github.com"),
+            "devto": os.getenv('DEVTO_BASE_URL', "https://dev.to")
+        }
+        self.base_urls.update(base_urls or {})
+        self.http_pool_size = int(os.getenv('HTTP_POOL_SIZE', self.fetch_workers))
+        self.http_retries = int(os.getenv('HTTP_RETRIES', 2))
+        self.http_timeout = (float(os.getenv('HTTP_CONNECT_TIMEOUT_SECONDS', 3)), float(os.getenv('HTTP_READ_TIMEOUT_SECONDS', 10)))
+        self.provider_headers = {"github": {"Accept": "application/vnd.github.v3+json"}}
+        if self.github_token:
+            self.provider_headers["github"]["Authorization"] = f"token {self.github_token}"
+        self.sessions = {
+            provider: self._build_session(self.provider_headers.get(provider))
+            for provider in self.base_urls
+        }
+        
+        # Circuit breakers: a failing or slow provider is skipped in favour of cached or fallback results
+        self.breakers = {provider: self._build_breaker(provider) for provider in self.base_urls}
         
         # Domain-specific keywords and search terms
         self.domain_keywords = {
@@ -279,72 +469,88 @@ class UniversalResourceFetcher:
             }
         }
 
-    def _rate_limit_youtube(self):
-        """Ensure we don't exceed YouTube API rate limits"""
-        current_time = time.time()
-        if current_time - self.last_youtube_call < self.youtube_delay:
-            time.sleep(self.youtube_delay - (current_time - self.last_youtube_call))
-        self.last_youtube_call = time.time()
+    def _build_session(self, headers: Optional[Dict] = None) -> requests.Session:
+        """Create a pooled keep-alive session that retries only failed connection attempts.
+        
+        A request that reached the provider is never repeated: read timeouts and server
+        errors go to the circuit breaker and the caller's fallback instead, so one call
+        takes at most the retried connect timeouts plus a single read timeout.
+        """
+        retry = Retry(
+            total=self.http_retries,
+            connect=self.http_retries,
+            read=0,
+            status=0,
+            other=0,
+            backoff_factor=0.1,
+            allowed_methods=frozenset(["GET", "HEAD"]),
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.http_pool_size, max_retries=retry)
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        if headers:
+            session.headers.update(headers)
+        return session
+
+    def _build_breaker(self, provider: str) -> CircuitBreaker:
+        """Circuit breaker for one provider, tuned from the environment"""
+        return CircuitBreaker(
+            provider,
+            failure_rate=float(os.getenv('CIRCUIT_FAILURE_RATE', 0.5)),
+            min_calls=int(os.getenv('CIRCUIT_MIN_CALLS', 5)),
+            window_seconds=float(os.getenv('CIRCUIT_WINDOW_SECONDS', 60)),
+            slow_call_seconds=float(os.getenv('CIRCUIT_SLOW_CALL_SECONDS', 5)),
+            recovery_seconds=float(os.getenv('CIRCUIT_RECOVERY_SECONDS', 30)),
+            half_open_probes=int(os.getenv('CIRCUIT_HALF_OPEN_PROBES', 1))
+        )
 
-    def _rate_limit_github(self):
-        """Ensure we don't exceed GitHub API rate limits"""
-        current_time = time.time()
-        if current_time - self.last_github_call < self.github_delay:
-            time.sleep(self.github_delay - (current_time - self.last_github_call))
-        self.last_github_call = time.time()
+    def warm_connections(self):
+        """Open connections to the configured providers in the background so the first fetch skips the handshake"""
+        enabled = {
+            "youtube": bool(self.youtube_api_key),
+            "github": bool(self.github_token),
+            "devto": True
+        }
+        for provider, base_url in self.base_urls.items():
+            if enabled[provider]:
+                self.executor.submit(self._warm_connection, provider, base_url)
+
+    def _warm_connection(self, provider: str, base_url: str):
+        """Issue a cheap HEAD request so the session keeps a live connection in its pool"""
+        try:
+            self.sessions[provider].head(base_url, timeout=5)
+            logger.info(f"Warmed {provider} connection to {base_url}")
+        except Exception as e:
+            logger.warning(f"Could not warm {provider} connection: {str(e)}")
 
     def get_youtube_videos(self, keywords: List[str], difficulty: str = "beginner", max_results: int = 5) -> List[Dict]:
         """Fetch educational videos from YouTube API"""
         if not self.youtube_api_key:
             logger.warning("YouTube API key not found, using fallback")
-            return self._get_fallback_videos(keywords, difficulty)
+            return self._disabled_fallback(self._get_fallback_videos(keywords, difficulty))
+        
+        cache_key = self._provider_cache_key("youtube", keywords, difficulty)
+        page_size = max(max_results, self.provider_page_size)
+        return self._cached_query(cache_key, max_results, lambda: self._fetch_youtube_videos(cache_key, keywords, difficulty, page_size))
+
+    def _fetch_youtube_videos(self, cache_key: str, keywords: List[str], difficulty: str, max_results: int) -> List[Dict]:
+        """Quota-aware, rate-limited provider call behind get_youtube_videos"""
+        if not self._youtube_call_allowed():
+            return self._stale_or_fallback(cache_key, lambda: self._get_fallback_videos(keywords, difficulty))
         
         try:
-            self._rate_limit_youtube()
-            
-            # Create search query
-            search_terms = " ".join(keywords[:3])  # Use first 3 keywords
-            if difficulty == "beginner":
-                search_terms += " tutorial beginner"
-            elif difficulty == "intermediate":
-                search_terms += " course intermediate"
-            else:
-                search_terms += " advanced masterclass"
-            
-            # YouTube API request
-            url = "https://www.googleapis.com/youtube/v3/search"
-            params = {
-                "part": "snippet",
-                "q": search_terms,
-                "type": "video",
-                "videoDuration": "medium",  # 4-20 minutes
-                "videoDefinition": "high",
-                "order": "relevance",
-                "maxResults": max_results,
-                "key": self.youtube_api_key
-            }
-            
-            response = requests.get(url, params=params, timeout=10)
+            url, params, search_terms = self._youtube_request(keywords, difficulty, max_results)
+            etag = self._stored_etag(cache_key)
+            response = self._provider_get("youtube", url, params, etag)
+            self._record_youtube_response(response.status_code, response.text, self._retried_attempts(response))
+            if etag and response.status_code == 304:
+                return self._revalidated(cache_key)
             response.raise_for_status()
             
-            data = response.json()
-            videos = []
-            
-            for item in data.get("items", []):
-                video = {
-                    "title": item["snippet"]["title"],
-                    "url": f"https://www.youtube.com/watch?v={item['id']['videoId']}",
-                    "description": item["snippet"]["description"][:200] + "...",
-                    "thumbnail": item["snippet"]["thumbnails"]["medium"]["url"],
-                    "channel": item["snippet"]["channelTitle"],
-                    "type": "video",
-                    "platform": "YouTube",
-                    "free": True,
-                    "estimated_time": "10-20 minutes",
-                    "difficulty": difficulty
-                }
-                videos.append(video)
-            
+            videos = self._parse_youtube_videos(response.json(), difficulty)
+            self.validators.set(cache_key, response.headers.get("ETag") if videos else None)
             logger.info(f"Fetched {len(videos)} YouTube videos for: {search_terms}")
             return videos
             
@@ -356,54 +562,27 @@ class UniversalResourceFetcher:
         """Fetch relevant GitHub repositories"""
         if not self.github_token:
             logger.warning("GitHub token not found, using fallback")
-            return self._get_fallback_projects(keywords, difficulty)
+            return self._disabled_fallback(self._get_fallback_projects(keywords, difficulty))
+        
+        cache_key = self._provider_cache_key("github", keywords, difficulty)
+        page_size = max(max_results, self.provider_page_size)
+        return self._cached_query(cache_key, max_results, lambda: self._fetch_github_projects(cache_key, keywords, difficulty, page_size))
+
+    def _fetch_github_projects(self, cache_key: str, keywords: List[str], difficulty: str, max_results: int) -> List[Dict]:
+        """Rate-limited provider call behind get_github_projects"""
+        if not self._github_call_allowed():
+            return self._stale_or_fallback(cache_key, lambda: self._get_fallback_projects(keywords, difficulty))
         
         try:
-            self._rate_limit_github()
-            
-            # Create search query
-            search_terms = " ".join(keywords[:2])
-            if difficulty == "beginner":
-                search_terms += " tutorial example starter"
-            elif difficulty == "intermediate":
-                search_terms += " project example"
-            else:
-                search_terms += " advanced framework library"
-            
-            # GitHub API request
-            url = "https://api.github.com/search/repositories"
-            headers = {
-                "Authorization": f"token {self.github_token}",
-                "Accept": "application/vnd.github.v3+json"
-            }
-            params = {
-                "q": search_terms,
-                "sort": "stars",
-                "order": "desc",
-                "per_page": max_results
-            }
-            
-            response = requests.get(url, headers=headers, params=params, timeout=10)
+            url, params, search_terms = self._github_request(keywords, difficulty, max_results)
+            etag = self._stored_etag(cache_key)
+            response = self._provider_get("github", url, params, etag)
+            if etag and response.status_code == 304:
+                return self._revalidated(cache_key)
             response.raise_for_status()
             
-            data = response.json()
-            projects = []
-            
-            for item in data.get("items", []):
-                project = {
-                    "title": item["name"],
-                    "url": item["html_url"],
-                    "description": item["description"] or "No description available",
-                    "stars": item["stargazers_count"],
-                    "language": item["language"],
-                    "type": "project",
-                    "platform": "GitHub",
-                    "free": True,
-                    "difficulty": difficulty,
-                    "last_updated": item["updated_at"]
-                }
-                projects.append(project)
-            
+            projects = self._parse_github_projects(response.json(), difficulty)
+            self.validators.set(cache_key, response.headers.get("ETag") if projects else None)
             logger.info(f"Fetched {len(projects)} GitHub projects for: {search_terms}")
             return projects
             
@@ -413,37 +592,25 @@ class UniversalResourceFetcher:
 
     def get_dev_articles(self, keywords: List[str], max_results: int = 5) -> List[Dict]:
         """Fetch articles from Dev.to"""
+        cache_key = self._provider_cache_key("devto", keywords, "any")
+        page_size = max(max_results, self.provider_page_size)
+        return self._cached_query(cache_key, max_results, lambda: self._fetch_dev_articles(cache_key, keywords, page_size))
+
+    def _fetch_dev_articles(self, cache_key: str, keywords: List[str], max_results: int) -> List[Dict]:
+        """Provider call behind get_dev_articles"""
+        if not self._circuit_allows("devto"):
+            return self._stale_or_fallback(cache_key, lambda: self._get_fallback_articles(keywords))
+        
         try:
-            search_terms = " ".join(keywords[:2])
-            
-            url = "https://dev.to/api/articles"
-            params = {
-                "tag": keywords[0].lower().replace(" ", "").replace(".", ""),
-                "per_page": max_results,
-                "top": "7"  # Top articles from last 7 days
-            }
-            
-            response = requests.get(url, params=params, timeout=10)
+            url, params, search_terms = self._devto_request(keywords, max_results)
+            etag = self._stored_etag(cache_key)
+            response = self._provider_get("devto", url, params, etag)
+            if etag and response.status_code == 304:
+                return self._revalidated(cache_key)
             response.raise_for_status()
             
-            data = response.json()
-            articles = []
-            
-            for item in data:
-                article = {
-                    "title": item["title"],
-                    "url": item["url"],
-                    "description": item["description"] or item["title"],
-                    "author": item["user"]["name"],
-                    "reading_time": f"{item.get('reading_time_minutes', 5)} min read",
-                    "tags": item["tag_list"],
-                    "type": "article",
-                    "platform": "Dev.to",
-                    "free": True,
-                    "published_at": item["published_at"]
-                }
-                articles.append(article)
-            
+            articles = self._parse_dev_articles(response.json())
+            self.validators.set(cache_key, response.headers.get("ETag") if articles else None)
             logger.info(f"Fetched {len(articles)} Dev.to articles for: {search_terms}")
             return articles
             
@@ -451,55 +618,251 @@ class UniversalResourceFetcher:
             logger.error(f"Dev.to API error: {str(e)}")
             return self._get_fallback_articles(keywords)
 
-    def get_comprehensive_resources(self, domain: str, subdomain: str, difficulty: str) -> Dict:
+    def _cached_query(self, cache_key: str, max_results: int, fetch: Callable) -> List[Dict]:
+        """Serve a provider query from the query cache, calling the provider at most once at a time.
+        
+        Entries hold a full page of results for the normalized query, so topic
+        resources, comprehensive sections and previews asking for fewer items all share
+        one entry. Fallback results are returned but never cached.
+        """
+        fetch_once = lambda: self.single_flight.do(cache_key, fetch)
+        if self.cache is None:
+            return fetch_once()[:max_results]
+        return self.cache.get_or_fetch(cache_key, fetch_once, cacheable=self._is_real_result)[:max_results]
+
+    def _is_real_result(self, items: List[Dict]) -> bool:
+        """Whether provider items are real results worth caching, not empty or fallback data"""
+        return bool(items) and not any(item.get("fallback") for item in items)
+
+    def _youtube_call_allowed(self) -> bool:
+        """Check the circuit and the rate limit, then reserve the search's quota before it is sent.
+        
+        An open circuit refuses before a token or any quota is taken; a call the
+        circuit let through but the limit or the quota then refuses is handed back.
+        """
+        if not self._circuit_allows("youtube"):
+            return False
+        if not self.youtube_limiter.acquire(timeout=self._token_wait()):
+            logger.warning("YouTube rate limit reached, serving stale or fallback videos")
+            self.breakers["youtube"].cancel_request()
+            return False
+        if not self.quota_scheduler.reserve(YOUTUBE_SEARCH_COST, FETCH_PRIORITY.get()):
+            logger.warning("YouTube quota budget reached, serving stale or fallback videos")
+            self.breakers["youtube"].cancel_request()
+            return False
+        return True
+
+    def _github_call_allowed(self) -> bool:
+        """Check the circuit, then the rate limit, before calling GitHub"""
+        if not self._circuit_allows("github"):
+            return False
+        if not self.github_limiter.acquire(timeout=self._token_wait()):
+            logger.warning("GitHub rate limit reached, serving stale or fallback projects")
+            self.breakers["github"].cancel_request()
+            return False
+        return True
+
+    def _token_wait(self) -> float:
+        """How long a call may wait for a rate-limit token: interactive calls briefly, within their deadline"""
+        if FETCH_PRIORITY.get() == "background":
+            return 0.0
+        deadline = FETCH_DEADLINE.get()
+        return deadline.bounded(self.rate_limit_wait) if deadline is not None else self.rate_limit_wait
+
+    def _circuit_allows(self, provider: str) -> bool:
+        """Whether the provider's circuit lets a call through"""
+        if self.breakers[provider].allow_request():
+            return True
+        logger.warning(f"{provider} circuit open, serving stale or fallback results")
+        return False
+
+    def _provider_get(self, provider: str, url: str, params: Dict, etag: Optional[str] = None) -> requests.Response:
+        """GET a provider endpoint through its session, reporting the outcome to its circuit breaker.
+        
+        With a stored ETag the request is conditional, and may be answered with a 304.
+        """
+        headers = {"If-None-Match": etag} if etag else None
+        start = time.monotonic()
+        try:
+            response = self.sessions[provider].get(url, params=params, headers=headers, timeout=self.http_timeout)
+        except Exception:
+            self._record_provider_outcome(provider, None, time.monotonic() - start)
+            raise
+        self._record_provider_outcome(provider, response.status_code, time.monotonic() - start)
+        return response
+
+    def _record_provider_outcome(self, provider: str, status_code: Optional[int], latency: float):
+        """Feed one call's status and latency to the provider's circuit breaker"""
+        # Server errors, throttling and transport errors count against the provider
+        if status_code is None or status_code >= 500 or status_code in (403, 429):
+            self.breakers[provider].record_failure(latency)
+        else:
+            self.breakers[provider].record_success(latency)
+
+    def _retried_attempts(self, response: requests.Response) -> int:
+        """Attempts of this request that reached the provider before the one that answered"""
+        retries = getattr(response.raw, "retries", None)
+        return sum(1 for attempt in getattr(retries, "history", ()) if attempt.status is not None)
+
+    def _record_youtube_response(self, status_code: int, body: str, retried_attempts: int = 0):
+        """Settle a YouTube search whose first attempt was reserved: charge any retries, note exhaustion"""
+        if retried_attempts:
+            self.quota_ledger.record(YOUTUBE_SEARCH_COST * retried_attempts, calls=retried_attempts)
+        if status_code == 403 and "quotaExceeded" in body:
+            self.quota_ledger.mark_exhausted()
+
+    def _stored_etag(self, cache_key: str) -> Optional[str]:
+        """The ETag to revalidate a query with, while the cache still holds the result it validates"""
+        etag = self.validators.get(cache_key)
+        if etag and self.cache is not None and self.cache.store.peek(cache_key) is not None:
+            return etag
+        return None
+
+    def _revalidated(self, cache_key: str) -> List[Dict]:
+        """The provider answered 304: reuse the cached result and extend its cache entry"""
+        result = self.cache.get_stale(cache_key)
+        if result is None:
+            # Evicted since the request was sent; the next refresh downloads the page again
+            self.validators.set(cache_key, None)
+            raise ValueError(f"Cached result for {cache_key} is gone, cannot reuse it")
+        result = self.cache.set(cache_key, result)
+        logger.info(f"Not modified, reusing cached result for {cache_key}")
+        return result
+
+    def _stale_or_fallback(self, cache_key: str, fallback: Callable) -> List[Dict]:
+        """Serve an expired cached result for this query if there is one, else the fallback"""
+        stale = self.cache.get_stale(cache_key) if self.cache is not None else None
+        if stale:
+            logger.info(f"Serving stale cached result for {cache_key}")
+            return stale
+        return fallback()
+
+    def _youtube_request(self, keywords: List[str], difficulty: str, max_results: int) -> Tuple[str, Dict, str]:
+        """Build the YouTube search URL, params and search terms"""
+        search_terms = " ".join(keywords[:3])  # Use first 3 keywords
+        if difficulty == "beginner":
+            search_terms += " tutorial beginner"
+        elif difficulty == "intermediate":
+            search_terms += " course intermediate"
+        else:
+            search_terms += " advanced masterclass"
+        
+        url = f"{self.base_urls['youtube']}/youtube/v3/search"
+        params = {
+            "part": "snippet",
+            "q": search_terms,
+            "type": "video",
+            "videoDuration": "medium",  # 4-20 minutes
+            "videoDefinition": "high",
+            "order": "relevance",
+            "maxResults": max_results,
+            "key": self.youtube_api_key
+        }
+        return url, params, search_terms
+
+    def _parse_youtube_videos(self, data: Dict, difficulty: str) -> List[Dict]:
+        """Convert a YouTube search response into resource items"""
+        videos = []
+        for item in data.get("items", []):
+            video = {
+                "title": item["snippet"]["title"],
+                "url": f"https://www.youtube.com/watch?v={item['id']['videoId']}",
+                "description": item["snippet"]["description"][:200] + "...",
+                "thumbnail": item["snippet"]["thumbnails"]["medium"]["url"],
+                "channel": item["snippet"]["channelTitle"],
+                "type": "video",
+                "platform": "YouTube",
+                "free": True,
+                "estimated_time": "10-20 minutes",
+                "difficulty": difficulty
+            }
+            videos.append(video)
+        return videos
+
+    def _github_request(self, keywords: List[str], difficulty: str, max_results: int) -> Tuple[str, Dict, str]:
+        """Build the GitHub repository search URL, params and search terms"""
+        search_terms = " ".join(keywords[:2])
+        if difficulty == "beginner":
+            search_terms += " tutorial example starter"
+        elif difficulty == "intermediate":
+            search_terms += " project example"
+        else:
+            search_terms += " advanced framework library"
+        
+        url = f"{self.base_urls['github']}/search/repositories"
+        params = {
+            "q": search_terms,
+            "sort": "stars",
+            "order": "desc",
+            "per_page": max_results
+        }
+        return url, params, search_terms
+
+    def _parse_github_projects(self, data: Dict, difficulty: str) -> List[Dict]:
+        """Convert a GitHub search response into resource items"""
+        projects = []
+        for item in data.get("items", []):
+            project = {
+                "title": item["name"],
+                "url": item["html_url"],
+                "description": item["description"] or "No description available",
+                "stars": item["stargazers_count"],
+                "language": item["language"],
+                "type": "project",
+                "platform": "GitHub",
+                "free": True,
+                "difficulty": difficulty,
+                "last_updated": item["updated_at"]
+            }
+            projects.append(project)
+        return projects
+
+    def _devto_request(self, keywords: List[str], max_results: int) -> Tuple[str, Dict, str]:
+        """Build the Dev.to articles URL, params and search terms"""
+        search_terms = " ".join(keywords[:2])
+        url = f"{self.base_urls['devto']}/api/articles"
+        params = {
+            "tag": keywords[0].lower().replace(" ", "").replace(".", ""),
+            "per_page": max_results,
+            "top": "7"  # Top articles from last 7 days
+        }
+        return url, params, search_terms
+
+    def _parse_dev_articles(self, data: List[Dict]) -> List[Dict]:
+        """Convert a Dev.to articles response into resource items"""
+        articles = []
+        for item in data:
+            article = {
+                "title": item["title"],
+                "url": item["url"],
+                "description": item["description"] or item["title"],
+                "author": item["user"]["name"],
+                "reading_time": f"{item.get('reading_time_minutes', 5)} min read",
+                "tags": item["tag_list"],
+                "type": "article",
+                "platform": "Dev.to",
+                "free": True,
+                "published_at": item["published_at"]
+            }
+            articles.append(article)
+        return articles
+
+    def get_comprehensive_resources(self, domain: str, subdomain: str, difficulty: str, deadline: Optional[Deadline] = None) -> Dict:
         """Get comprehensive resources for a specific domain and subdomain"""
         try:
-            # Get keywords for this domain/subdomain
-            domain_data = self.domain_keywords.get(domain, {})
-            subdomain_data = domain_data.get(subdomain, {})
+            subdomain_data = self.domain_keywords.get(domain, {}).get(subdomain, {})
             
             if not subdomain_data:
                 logger.warning(f"No keywords found for {domain}/{subdomain}")
                 return self._get_fallback_comprehensive_resources(domain, difficulty)
             
-            # Extract keywords
-            primary_keywords = subdomain_data.get("primary", [])
-            secondary_keywords = subdomain_data.get("secondary", [])
-            technologies = subdomain_data.get("technologies", [])
-            
-            # Fetch resources from different sources
-            resources = {
-                "videos": [],
-                "projects": [],
-                "articles": [],
-                "courses": [],
-                "documentation": [],
-                "practice": []
-            }
-            
-            # Get videos (YouTube)
-            video_keywords = primary_keywords[:3]
-            resources["videos"] = self.get_youtube_videos(video_keywords, difficulty, 8)
-            
-            # Get projects (GitHub)
-            project_keywords = technologies[:2] if technologies else primary_keywords[:2]
-            resources["projects"] = self.get_github_projects(project_keywords, difficulty, 6)
-            
-            # Get articles (Dev.to)
-            article_keywords = primary_keywords[:2]
-            resources["articles"] = self.get_dev_articles(article_keywords, 6)
-            
-            # Add curated courses and documentation
-            curated = self.curated_resources.get(domain, {})
-            resources["courses"] = curated.get("courses", [])
-            resources["documentation"] = curated.get("documentation", [])
-            
-            # Add practice resources
-            resources["practice"] = self._get_practice_resources(domain, subdomain, technologies)
-            
-            # Filter by difficulty and add metadata
-            resources = self._filter_and_enhance_resources(resources, difficulty, domain, subdomain)
+            # Fetch videos (YouTube), projects (GitHub) and articles (Dev.to) concurrently
+            queries = self._comprehensive_queries(subdomain_data)
+            provider_calls = self._comprehensive_calls(self, queries, difficulty)
+            with fetch_deadline(deadline):
+                fetched = self._fetch_concurrently(provider_calls, self.fanout_deadline, deadline)
             
+            resources = self._assemble_comprehensive_resources(domain, subdomain, difficulty, subdomain_data, fetched)
             logger.info(f"Generated comprehensive resources for {domain}/{subdomain} ({difficulty})")
             return resources
             
@@ -507,6 +870,113 @@ class UniversalResourceFetcher:
             logger.error(f"Error generating comprehensive resources: {str(e)}")
             return self._get_fallback_comprehensive_resources(domain, difficulty)
 
+    def _comprehensive_queries(self, subdomain_data: Dict) -> Dict[str, List[str]]:
+        """Pick the keywords used for each provider section of a comprehensive fetch"""
+        primary_keywords = subdomain_data.get("primary", [])
+        technologies = subdomain_data.get("technologies", [])
+        return {
+            "videos": primary_keywords[:3],
+            "projects": technologies[:2] if technologies else primary_keywords[:2],
+            "articles": primary_keywords[:2]
+        }
+
+    def _comprehensive_calls(self, fetcher, queries: Dict[str, List[str]], difficulty: str) -> Dict[str, Tuple[str, Callable, Callable]]:
+        """Provider calls for a comprehensive fetch as (cache_key, fetch, fallback) tuples.
+        
+        ``fetcher`` supplies the get_* methods, so the same calls serve the sync fetcher
+        and its asyncio counterpart.
+        """
+        return {
+            "videos": (
+                self._provider_cache_key("youtube", queries["videos"], difficulty),
+                lambda: fetcher.get_youtube_videos(queries["videos"], difficulty, 8),
+                lambda: self._get_fallback_videos(queries["videos"], difficulty)
+            ),
+            "projects": (
+                self._provider_cache_key("github", queries["projects"], difficulty),
+                lambda: fetcher.get_github_projects(queries["projects"], difficulty, 6),
+                lambda: self._get_fallback_projects(queries["projects"], difficulty)
+            ),
+            "articles": (
+                self._provider_cache_key("devto", queries["articles"], "any"),
+                lambda: fetcher.get_dev_articles(queries["articles"], 6),
+                lambda: self._get_fallback_articles(queries["articles"])
+            )
+        }
+
+    def _assemble_comprehensive_resources(self, domain: str, subdomain: str, difficulty: str,
+                                          subdomain_data: Dict, fetched: Dict[str, List[Dict]]) -> Dict:
+        """Combine fetched provider sections with curated and practice resources"""
+        resources = {
+            "videos": fetched.get("videos", []),
+            "projects": fetched.get("projects", []),
+            "articles": fetched.get("articles", []),
+            "courses": [],
+            "documentation": [],
+            "practice": []
+        }
+        
+        # Add curated courses and documentation
+        curated = self.curated_resources.get(domain, {})
+        resources["courses"] = curated.get("courses", [])
+        resources["documentation"] = curated.get("documentation", [])
+        
+        # Add practice resources
+        resources["practice"] = self._get_practice_resources(domain, subdomain, subdomain_data.get("technologies", []))
+        
+        # Filter by difficulty and add metadata
+        return self._filter_and_enhance_resources(resources, difficulty, domain, subdomain)
+
+    def _provider_cache_key(self, provider: str, keywords: List[str], difficulty: str) -> str:
+        """Normalized key for one provider query: (provider, effective query, difficulty).
+        
+        The result count is left out: entries hold a full page and callers take what they need.
+        """
+        if provider == "youtube":
+            query = self._youtube_request(keywords, difficulty, self.provider_page_size)[1]["q"]
+        elif provider == "github":
+            query = self._github_request(keywords, difficulty, self.provider_page_size)[1]["q"]
+        else:
+            query = self._devto_request(keywords, self.provider_page_size)[1]["tag"]
+            difficulty = "any"
+        normalized = " ".join(query.lower().split())
+        return f"provider_{provider}_{normalized}_{difficulty}"
+
+    def _fetch_concurrently(self, calls: Dict[str, Tuple[str, Callable, Callable]], timeout: float,
+                            deadline: Optional[Deadline] = None) -> Dict[str, List[Dict]]:
+        """Run provider calls on the worker pool and wait for all of them under one deadline.
+        
+        Each call is a (cache_key, fetch, fallback) tuple. Calls whose query is warm in the
+        cache are answered inline. Calls that miss the deadline are answered with their
+        fallback; their real result is still cached once it arrives. The wait is also
+        capped by the request's latency budget when one is given.
+        """
+        results = {}
+        futures = {}
+        
+        for section, (cache_key, fetch, fallback) in calls.items():
+            if self.cache is not None and self.cache.is_warm(cache_key):
+                results[section] = fetch()
+                continue
+            
+            # Pool threads run the call in the caller's context, so it spends quota at the caller's priority
+            futures[self.executor.submit(copy_context().run, fetch)] = (section, fallback)
+        
+        if futures:
+            if deadline is not None:
+                timeout = deadline.bounded(timeout)
+            done, _ = wait(futures, timeout=timeout)
+            for future, (section, fallback) in futures.items():
+                if future in done and future.exception() is None:
+                    results[section] = future.result()
+                else:
+                    logger.warning(f"Provider call for {section} missed the {timeout:.2f}s deadline, using fallback")
+                    results[section] = fallback()
+                    if deadline is not None and future not in done:
+                        deadline.mark_degraded(f"resources.{section}")
+        
+        return results
+
     def _get_practice_resources(self, domain: str, subdomain: str, technologies: List[str]) -> List[Dict]:
         """Get practice platforms and coding challenges"""
         practice_resources = []
@@ -561,6 +1031,9 @@ class UniversalResourceFetcher:
         for category, items in resources.items():
             enhanced_items = []
             for item in items:
+                # Copy so provider results shared through the cache are never mutated
+                item = dict(item)
+                
                 # Add difficulty if not present
                 if "difficulty" not in item:
                     item["difficulty"] = difficulty
@@ -576,6 +1049,14 @@ class UniversalResourceFetcher:
         
         return enhanced_resources
 
+    def _disabled_fallback(self, items: List[Dict]) -> List[Dict]:
+        """Mark fallback items standing in for a provider with no credentials configured.
+        
+        Unlike a failed call, retrying soon will not help, so the cache keeps these for
+        the full TTL (see ResourceCache._is_negative).
+        """
+        return [{**item, "provider_disabled": True} for item in items]
+
     def _get_fallback_videos(self, keywords: List[str], difficulty: str) -> List[Dict]:
         """Fallback videos when API fails"""
         return [
@@ -633,28 +1114,253 @@ class UniversalResourceFetcher:
 
 # Cache system for resources
 class ResourceCache:
-    def __init__(self, cache_duration_hours: int = 24):
-        self.cache = {}
+    """TTL cache for fetched resources on top of a pluggable store.
+    
+    The store (see cache_store) holds entries and enforces the size limits: an
+    in-memory LRU per worker by default, or a SQLite file shared by every worker on
+    the host. ``cache_duration`` is the hard TTL. ``get_or_fetch`` also applies a soft
+    TTL, jittered per key so popular entries do not all expire together: past it the
+    cached value is still served while one background refresh replaces it. Empty
+    results, and results where a provider section holds only fallback items, get the
+    short ``negative_ttl`` instead, so a failing provider is retried soon. Expired entries stay available to ``get_stale`` for
+    ``stale_duration``; a periodic sweep, run from lookups, ``set`` and ``stats``,
+    drops them after that, so a cache that is only read still gives up the memory.
+    
+    Values are frozen on the way in (read-only dicts and tuples, see cache_store.freeze)
+    by the store itself, whoever writes them, so every reader shares the stored object
+    and none can change it for the others.
+    """
+    
+    def __init__(self, cache_duration_hours: int = 24, max_entries: Optional[int] = None, max_bytes: Optional[int] = None,
+                 store=None):
+        self.store = store or create_cache_store(max_entries, max_bytes)
         self.cache_duration = timedelta(hours=cache_duration_hours)
+        self.soft_ttl = timedelta(hours=min(cache_duration_hours, float(os.getenv('RESOURCE_CACHE_SOFT_TTL_HOURS', 20))))
+        self.negative_ttl = timedelta(seconds=float(os.getenv('NEGATIVE_CACHE_TTL_SECONDS', 300)))
+        self.stale_duration = timedelta(hours=float(os.getenv('RESOURCE_CACHE_STALE_HOURS', 24)))
+        self.sweep_interval = float(os.getenv('RESOURCE_CACHE_SWEEP_SECONDS', 300))
+        self.last_sweep = time.time()
+        self._sweep_lock = threading.Lock()
+        
+        # Hit/miss/latency counters per key namespace (topic, comprehensive, provider, preview)
+        self.metrics = CacheMetrics()
+        self.store.on_evict = lambda key: self.metrics.record(key, "evictions")
+        
+        # Background refreshes of soft-expired entries, at most one per key at a time
+        self.refresh_executor = ThreadPoolExecutor(
+            max_workers=int(os.getenv('RESOURCE_CACHE_REFRESH_WORKERS', 4)), thread_name_prefix="cache-refresh"
+        )
+        self._refreshing = set()
+        self._refresh_lock = threading.Lock()
     
     def get(self, key: str) -> Optional[Dict]:
         """Get cached resources if still valid"""
-        if key in self.cache:
-            cached_data, timestamp = self.cache[key]
-            if datetime.now() - timestamp < self.cache_duration:
+        self._maybe_sweep()
+        cached_data = self._valid(self.store.get(key))
+        self.metrics.record(key, "misses" if cached_data is None else "hits")
+        return cached_data
+    
+    def peek(self, key: str) -> Optional[Dict]:
+        """Cached resources if still valid, without counting a lookup or touching recency"""
+        return self._valid(self.store.peek(key))
+    
+    def peek_for(self, namespace: str, key: str) -> Optional[Dict]:
+        """Like peek, but counted as a lookup under ``namespace``, for views served from another namespace's entry"""
+        cached_data = self.peek(key)
+        self.metrics.record(f"{namespace}_{key}", "misses" if cached_data is None else "hits")
+        return cached_data
+    
+    def _valid(self, entry) -> Optional[Dict]:
+        if entry is not None:
+            cached_data, stored_at, ttl = entry
+            if time.time() - stored_at < (ttl if ttl is not None else self.cache_duration.total_seconds()):
                 return cached_data
-            else:
-                del self.cache[key]
         return None
     
+    def get_or_fetch(self, key: str, fetch_fn: Callable, cacheable: Optional[Callable] = None,
+                     refresh_fn: Optional[Callable] = None):
+        """Cached value for ``key``, fetching it only when there is none younger than the hard TTL.
+        
+        Between the soft and hard TTL the cached value is returned immediately and
+        ``refresh_fn`` (default ``fetch_fn``) runs in the background to replace it.
+        Fetched values are cached unless ``cacheable(value)`` is false. Negative entries
+        have no soft TTL: once their short TTL is over the next caller fetches again.
+        """
+        found, cached_data, soft_expired = self.lookup(key)
+        if found:
+            if soft_expired:
+                self.refresh_in_background(key, refresh_fn or fetch_fn, cacheable)
+            return cached_data
+        
+        value = self._timed_fetch(key, fetch_fn)
+        if self._is_cacheable(value, cacheable):
+            return self.set(key, value)
+        return value
+    
+    def lookup(self, key: str) -> Tuple[bool, Any, bool]:
+        """(found, value, past its soft TTL) for ``key``, counting the lookup.
+        
+        The building block of get_or_fetch, for callers that fetch on their own (the
+        asyncio fetcher). Negative entries are never past a soft TTL.
+        """
+        self._maybe_sweep()
+        entry = self.store.get(key)
+        if entry is not None:
+            cached_data, stored_at, ttl = entry
+            age = time.time() - stored_at
+            if ttl is not None:
+                if age < ttl:
+                    self.metrics.record(key, "hits")
+                    return True, cached_data, False
+            elif age < self.cache_duration.total_seconds():
+                soft_expired = age >= self._soft_ttl_seconds(key)
+                self.metrics.record(key, "stale_hits" if soft_expired else "hits")
+                return True, cached_data, soft_expired
+        
+        self.metrics.record(key, "misses")
+        return False, None, False
+    
+    def _soft_ttl_seconds(self, key: str) -> float:
+        """Soft TTL for a key, spread over -10%..+10% by a stable hash of the key"""
+        spread = (zlib.crc32(key.encode()) % 1000) / 1000
+        soft_ttl = self.soft_ttl.total_seconds() * (0.9 + 0.2 * spread)
+        return min(soft_ttl, self.cache_duration.total_seconds())
+    
+    def is_warm(self, key: str) -> bool:
+        """Whether ``key`` holds a real (non-negative) value that is not yet due for a refresh"""
+        entry = self.store.peek(key)
+        if entry is None or entry[2] is not None:
+            return False
+        return time.time() - entry[1] < self._soft_ttl_seconds(key)
+    
+    def refresh_in_background(self, key: str, fetch_fn: Callable, cacheable: Optional[Callable] = None):
+        """Fetch and cache ``key`` in the background, unless a refresh for it is already running.
+        
+        The refresh runs at background priority: it never waits for rate-limit tokens and
+        leaves the quota reserved for interactive requests alone.
+        """
+        with self._refresh_lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+        self.refresh_executor.submit(self._refresh, key, fetch_fn, cacheable)
+    
+    def _refresh(self, key: str, fetch_fn: Callable, cacheable: Optional[Callable]):
+        try:
+            with background_priority():
+                value = self._timed_fetch(key, fetch_fn)
+            if self._set_if_cacheable(key, value, cacheable):
+                logger.info(f"Refreshed cached resources for {key}")
+        except Exception as e:
+            logger.error(f"Background refresh failed for {key}: {str(e)}")
+        finally:
+            with self._refresh_lock:
+                self._refreshing.discard(key)
+    
+    def _timed_fetch(self, key: str, fetch_fn: Callable):
+        """Run a fetch for ``key``, recording its latency and whether it raised"""
+        started = time.monotonic()
+        try:
+            value = fetch_fn()
+        except Exception:
+            self.metrics.record_fetch(key, time.monotonic() - started, failed=True)
+            raise
+        self.metrics.record_fetch(key, time.monotonic() - started)
+        return value
+    
+    def _set_if_cacheable(self, key: str, value, cacheable: Optional[Callable]) -> bool:
+        if not self._is_cacheable(value, cacheable):
+            return False
+        self.set(key, value)
+        return True
+    
+    def _is_cacheable(self, value, cacheable: Optional[Callable]) -> bool:
+        return value is not None and (cacheable is None or cacheable(value))
+    
+    def get_stale(self, key: str) -> Optional[Dict]:
+        """Get cached resources even if expired, for when a fresh fetch is not allowed"""
+        entry = self.store.peek(key)
+        if entry is None:
+            return None
+        self.metrics.record(key, "stale_hits")
+        return entry[0]
+    
     def set(self, key: str, data: Dict):
-        """Cache resources with timestamp"""
-        self.cache[key] = (data, datetime.now())
+        """Cache a frozen copy of resources with timestamp and return it; empty or fallback results only for the negative TTL"""
+        now = time.time()
+        data = freeze(data)
+        ttl = self.negative_ttl.total_seconds() if self._is_negative(data) else None
+        self.store.put(key, data, now, ttl)
+        self._maybe_sweep()
+        return data
+    
+    def _is_negative(self, data) -> bool:
+        """Whether a result is empty or any provider section in it holds only fallback items.
+        
+        Sections are the lists of a comprehensive result, or the items of a flat list
+        grouped by platform. A provider disabled by configuration is not a miss.
+        """
+        if isinstance(data, dict):
+            sections = [section for section in data.values() if isinstance(section, (list, tuple))]
+            if not sections:
+                return not data
+        elif isinstance(data, (list, tuple)):
+            sections = {}
+            for item in data:
+                key = (item.get("platform") or item.get("type")) if isinstance(item, dict) else None
+                sections.setdefault(key, []).append(item)
+            sections = list(sections.values())
+        else:
+            return not data
+        if not any(sections):
+            return True
+        return any(section and all(self._is_fallback_item(item) for item in section) for section in sections)
+    
+    def _is_fallback_item(self, item) -> bool:
+        """A fallback standing in for a failed or skipped provider call"""
+        return (isinstance(item, dict) and not item.get("provider_disabled")
+                and (item.get("fallback") is True or item.get("type") == "fallback"))
+    
+    def sweep(self):
+        """Drop entries that have been expired for longer than the stale window"""
+        self.last_sweep = time.time()
+        self.store.sweep(self.last_sweep - (self.cache_duration + self.stale_duration).total_seconds())
+    
+    def _maybe_sweep(self):
+        """Sweep once ``sweep_interval`` has passed since the last sweep; one caller sweeps, the others go on"""
+        if time.time() - self.last_sweep < self.sweep_interval or not self._sweep_lock.acquire(blocking=False):
+            return
+        try:
+            if time.time() - self.last_sweep >= self.sweep_interval:
+                self.sweep()
+        finally:
+            self._sweep_lock.release()
     
     def clear(self):
         """Clear all cached data"""
-        self.cache.clear()
+        self.store.clear()
+    
+    def keys(self) -> List[str]:
+        """Cached keys, from least to most recently used"""
+        return self.store.keys()
+    
+    def key_page(self, namespace: Optional[str] = None, offset: int = 0, limit: int = 50,
+                 sample: Optional[int] = None) -> Dict:
+        """One page, or a random sample, of cached keys, optionally from a single namespace"""
+        keys = self.store.keys()
+        if namespace:
+            keys = [key for key in keys if cache_namespace(key) == namespace]
+        if sample is not None:
+            return {"namespace": namespace, "total": len(keys), "sample": sample,
+                    "keys": random.sample(keys, min(sample, len(keys)))}
+        return {"namespace": namespace, "total": len(keys), "offset": offset, "limit": limit,
+                "keys": keys[offset:offset + limit]}
+    
+    def stats(self) -> Dict:
+        """Backend, occupancy against the configured limits, evictions and per-namespace counters"""
+        self._maybe_sweep()
+        return {**self.store.stats(), "namespaces": self.metrics.snapshot(self.store.key_sizes())}
 
 # Global instances
-resource_fetcher = UniversalResourceFetcher()
 resource_cache = ResourceCache()
+resource_fetcher = UniversalResourceFetcher(cache=resource_cache)
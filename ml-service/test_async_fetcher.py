@@ -0,0 +1,364 @@
+import asyncio
+import json
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+from quota_ledger import QuotaLedger, QuotaScheduler
+from rate_limiter import SharedTokenBucket
+from resource_fetcher import Deadline, SingleFlight, UniversalResourceFetcher, ResourceCache, background_priority
+from async_resource_fetcher import AsyncResourceFetcher, SyncFetcherBridge
+
+PROVIDER_DELAY_SECONDS = 0.2
+RESPONSE_ETAG = '"v1"'
+
+class FakeProviderHandler(BaseHTTPRequestHandler):
+    """Serves YouTube, GitHub and Dev.to shaped responses from localhost"""
+    protocol_version = "HTTP/1.1"
+    not_modified = 0
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_HEAD(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_GET(self):
+        time.sleep(PROVIDER_DELAY_SECONDS)
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+
+        if self.headers.get("If-None-Match") == RESPONSE_ETAG:
+            type(self).not_modified += 1
+            self.send_response(304)
+            self.send_header("ETag", RESPONSE_ETAG)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        if url.path == "/youtube/v3/search":
+            count = int(query["maxResults"][0])
+            body = {"items": [{
+                "id": {"videoId": f"video{i}"},
+                "snippet": {
+                    "title": f"Video {i}",
+                    "description": "A fake video",
+                    "thumbnails": {"medium": {"url": "https://example.com/thumb.png"}},
+                    "channelTitle": "Fake Channel"
+                }
+            } for i in range(count)]}
+        elif url.path == "/search/repositories":
+            count = int(query["per_page"][0])
+            body = {"items": [{
+                "name": f"repo{i}",
+                "html_url": f"https://example.com/repo{i}",
+                "description": None,
+                "stargazers_count": i,
+                "language": "JavaScript",
+                "updated_at": "2024-01-01T00:00:00Z"
+            } for i in range(count)]}
+        elif url.path == "/api/articles":
+            count = int(query["per_page"][0])
+            body = [{
+                "title": f"Article {i}",
+                "url": f"https://example.com/article{i}",
+                "description": "",
+                "user": {"name": "Fake Author"},
+                "tag_list": [query["tag"][0]],
+                "published_at": "2024-01-01T00:00:00Z"
+            } for i in range(count)]
+        else:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        payload = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("ETag", RESPONSE_ETAG)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+class UnavailableProviderHandler(BaseHTTPRequestHandler):
+    """Answers every request with a 503 and counts them"""
+    protocol_version = "HTTP/1.1"
+    requests = 0
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        type(self).requests += 1
+        self.send_response(503)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+def start_fake_provider_server(handler=FakeProviderHandler):
+    """Start the fake provider server on a free local port"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+def make_fetcher(base_url):
+    """Sync fetcher pointed at the fake server, with generous rate limits and quota"""
+    fetcher = UniversalResourceFetcher(
+        cache=ResourceCache(),
+        base_urls={"youtube": base_url, "github": base_url, "devto": base_url}
+    )
+    fetcher.youtube_api_key = "test-key"
+    fetcher.github_token = "test-token"
+    state_dir = tempfile.mkdtemp()
+    fetcher.youtube_limiter = SharedTokenBucket("youtube", rate=1000, capacity=1000, state_dir=state_dir)
+    fetcher.github_limiter = SharedTokenBucket("github", rate=1000, capacity=1000, state_dir=state_dir)
+    fetcher.quota_ledger = QuotaLedger("youtube", daily_limit=1000000, state_dir=state_dir)
+    fetcher.quota_scheduler = QuotaScheduler(fetcher.quota_ledger, burst_units=1000000, reserve_units=0)
+    return fetcher
+
+def test_async_provider_methods():
+    """Each async provider method parses the fake provider response"""
+    server, base_url = start_fake_provider_server()
+    fetcher = AsyncResourceFetcher(make_fetcher(base_url))
+
+    async def run():
+        try:
+            return await asyncio.gather(
+                fetcher.get_youtube_videos(["React"], "beginner", 3),
+                fetcher.get_github_projects(["React"], "beginner", 2),
+                fetcher.get_dev_articles(["React"], 2)
+            )
+        finally:
+            await fetcher.close()
+
+    videos, projects, articles = asyncio.run(run())
+    server.shutdown()
+
+    assert [v["platform"] for v in videos] == ["YouTube"] * 3
+    assert [p["platform"] for p in projects] == ["GitHub"] * 2
+    assert [a["platform"] for a in articles] == ["Dev.to"] * 2
+    assert not any(item.get("fallback") for item in videos + projects + articles)
+
+def test_async_calls_overlap_on_one_loop():
+    """Many in-flight provider calls take about one round trip, not the sum of all"""
+    server, base_url = start_fake_provider_server()
+    fetcher = AsyncResourceFetcher(make_fetcher(base_url))
+    calls = 50
+
+    async def run():
+        try:
+            return await asyncio.gather(*[fetcher.get_dev_articles([f"tag{i}"], 1) for i in range(calls)])
+        finally:
+            await fetcher.close()
+
+    start = time.time()
+    results = asyncio.run(run())
+    elapsed = time.time() - start
+    server.shutdown()
+
+    assert all(len(articles) == 1 and not articles[0].get("fallback") for articles in results)
+    assert elapsed < calls * PROVIDER_DELAY_SECONDS / 4
+
+def test_sync_bridge_comprehensive_resources():
+    """The sync bridge exposes the blocking fetcher interface"""
+    server, base_url = start_fake_provider_server()
+    bridge = SyncFetcherBridge(AsyncResourceFetcher(make_fetcher(base_url)))
+
+    resources = bridge.get_comprehensive_resources("web-development", "frontend", "beginner")
+    server.shutdown()
+
+    assert len(resources["videos"]) == 8
+    assert len(resources["projects"]) == 6
+    assert len(resources["articles"]) == 6
+    assert all(item["domain"] == "web-development" for item in resources["videos"])
+    assert bridge.domain_keywords is bridge.fetcher.base.domain_keywords
+
+def record_call_checks(fetcher):
+    """Record the priority of every quota reservation and every token wait the fetcher makes"""
+    reserve, token_wait = fetcher.quota_scheduler.reserve, fetcher._token_wait
+    checks = {"reserve": [], "token_wait": []}
+
+    def recording_reserve(cost, priority="interactive"):
+        checks["reserve"].append(priority)
+        return reserve(cost, priority)
+
+    def recording_token_wait():
+        checks["token_wait"].append(token_wait())
+        return checks["token_wait"][-1]
+
+    fetcher.quota_scheduler.reserve, fetcher._token_wait = recording_reserve, recording_token_wait
+    return checks
+
+def test_sync_bridge_runs_in_the_callers_context():
+    """Calls through the bridge keep the caller's priority and deadline: background calls never wait for tokens"""
+    server, base_url = start_fake_provider_server()
+    base = make_fetcher(base_url)
+    base.rate_limit_wait = 2
+    checks = record_call_checks(base)
+    bridge = SyncFetcherBridge(AsyncResourceFetcher(base))
+
+    with background_priority():
+        bridge.get_comprehensive_resources("web-development", "frontend", "beginner")
+    bridge.get_youtube_videos(["Interactive"], "beginner", 1)
+    bridge.get_comprehensive_resources("web-development", "backend", "beginner", Deadline(1))
+    server.shutdown()
+
+    assert checks["reserve"] == ["background", "interactive", "interactive"]
+    background, interactive, within_deadline = checks["token_wait"][:2], checks["token_wait"][2], checks["token_wait"][3:]
+    assert background == [0.0, 0.0] and interactive == 2
+    assert len(within_deadline) == 2 and all(0 < wait <= 1 for wait in within_deadline)
+
+def test_open_circuit_skips_provider():
+    """Failing calls open the provider circuit; later calls get fallbacks without a request"""
+    fetcher = make_fetcher("http://127.0.0.1:1")  # nothing listens here
+    breaker = fetcher.breakers["devto"]
+
+    for i in range(breaker.min_calls):
+        assert fetcher.get_dev_articles([f"tag{i}"], 1)[0]["fallback"]
+    assert breaker.state == breaker.OPEN
+
+    breaker.outcomes.clear()
+    assert fetcher.get_dev_articles(["tag"], 1)[0]["fallback"]
+    assert breaker.snapshot()["recent_calls"] == 0
+
+def test_open_circuit_spends_no_token_or_quota():
+    """An open circuit refuses before the rate limit and the quota are touched"""
+    fetcher = make_fetcher("http://127.0.0.1:1")
+    fetcher.youtube_limiter = SharedTokenBucket("youtube", rate=0.001, capacity=1, state_dir=tempfile.mkdtemp())
+    breaker = fetcher.breakers["youtube"]
+    breaker.state, breaker.opened_at = breaker.OPEN, time.monotonic()
+
+    assert not fetcher._youtube_call_allowed()
+    assert fetcher.youtube_limiter.try_acquire()
+    assert fetcher.quota_ledger.snapshot()["calls"] == 0
+
+def test_provider_errors_are_not_retried():
+    """A request that reached the provider is sent once; its 5xx goes straight to the fallback"""
+    server, base_url = start_fake_provider_server(UnavailableProviderHandler)
+    fetcher = make_fetcher(base_url)
+
+    articles = fetcher.get_dev_articles(["tag"], 1)
+    server.shutdown()
+
+    assert articles[0]["fallback"]
+    assert UnavailableProviderHandler.requests == 1
+
+def test_conditional_refresh_reuses_parsed_result():
+    """A refresh revalidates with the stored ETag; the 304 reuses the cached result and re-caches it"""
+    server, base_url = start_fake_provider_server()
+    fetcher = make_fetcher(base_url)
+    cache_key = fetcher._provider_cache_key("github", ["React"], "beginner")
+    FakeProviderHandler.not_modified = 0
+
+    first = fetcher.get_github_projects(["React"], "beginner", 2)
+    data, _, ttl = fetcher.cache.store.peek(cache_key)
+    fetcher.cache.store.put(cache_key, data, time.time() - fetcher.cache.cache_duration.total_seconds() - 1, ttl)
+    second = fetcher.get_github_projects(["React"], "beginner", 2)
+    recached = fetcher.cache.get(cache_key)
+    fetcher.cache.clear()
+    etag_without_result = fetcher._stored_etag(cache_key)
+    server.shutdown()
+
+    assert second == first
+    assert FakeProviderHandler.not_modified == 1
+    assert recached[:2] == second
+    assert fetcher.validators.get(cache_key) == RESPONSE_ETAG and etag_without_result is None
+
+def test_query_cache_is_shared_across_result_counts():
+    """Callers of the same query share one cached page, whatever number of items they ask for"""
+    server, base_url = start_fake_provider_server()
+    fetcher = make_fetcher(base_url)
+
+    topic_videos = fetcher.get_youtube_videos(["React"], "beginner", 3)
+    section_videos = fetcher.get_youtube_videos(["react"], "beginner", 8)
+    server.shutdown()
+
+    assert len(topic_videos) == 3 and len(section_videos) == 8
+    assert section_videos[:3] == topic_videos
+    assert fetcher.cache.stats()["namespaces"]["provider"]["fetches"] == 1
+    assert (fetcher.quota_ledger.snapshot()["calls"], fetcher.quota_ledger.snapshot()["used"]) == (1, 100)
+
+def test_slow_provider_is_cut_off_at_the_deadline():
+    """A provider still running at the request's deadline gets its fallback; the other sections still return"""
+    fetcher = UniversalResourceFetcher(cache=ResourceCache())
+    release = threading.Event()
+
+    def slow_fetch():
+        release.wait(5)
+        return [{"title": "Late"}]
+
+    def fast_fetch():
+        time.sleep(0.05)
+        return [{"title": "Article"}]
+
+    calls = {
+        "videos": ("provider_youtube_slow", slow_fetch, lambda: [{"title": "Fallback", "fallback": True}]),
+        "projects": ("provider_github_fast", lambda: [{"title": "Project"}], lambda: []),
+        "articles": ("provider_devto_fast", fast_fetch, lambda: [])
+    }
+    deadline = Deadline(0.3)
+    started = time.monotonic()
+    results = fetcher._fetch_concurrently(calls, timeout=10, deadline=deadline)
+    elapsed = time.monotonic() - started
+    release.set()
+
+    assert 0.25 < elapsed < 1
+    assert results == {"videos": [{"title": "Fallback", "fallback": True}],
+                       "projects": [{"title": "Project"}], "articles": [{"title": "Article"}]}
+    assert deadline.degraded == ["resources.videos"]
+
+def run_concurrently(single_flight, fn, callers=8):
+    """Call ``single_flight.do`` from several threads at once; returns each caller's result or exception"""
+    barrier = threading.Barrier(callers)
+    outcomes = []
+
+    def caller():
+        barrier.wait()
+        try:
+            outcomes.append(single_flight.do("key", fn))
+        except Exception as e:
+            outcomes.append(e)
+
+    threads = [threading.Thread(target=caller) for _ in range(callers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return outcomes
+
+def test_single_flight_shares_one_call_and_its_error():
+    """Concurrent identical calls make one upstream call; the leader's exception reaches every waiter"""
+    single_flight = SingleFlight()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        time.sleep(0.2)  # long enough for every caller to join
+        return ["result"]
+
+    def failing_fetch():
+        calls.append(1)
+        time.sleep(0.2)
+        raise ConnectionError("provider down")
+
+    assert run_concurrently(single_flight, fetch) == [["result"]] * 8
+    assert len(calls) == 1
+
+    errors = run_concurrently(single_flight, failing_fetch)
+    assert len(calls) == 2
+    assert len(errors) == 8 and all(isinstance(error, ConnectionError) for error in errors)
+    assert single_flight.do("key", lambda: "next") == "next"
+
+if __name__ == "__main__":
+    for test in (test_async_provider_methods, test_async_calls_overlap_on_one_loop, test_sync_bridge_comprehensive_resources,
+                 test_sync_bridge_runs_in_the_callers_context,
+                 test_open_circuit_skips_provider, test_open_circuit_spends_no_token_or_quota, test_provider_errors_are_not_retried,
+                 test_conditional_refresh_reuses_parsed_result, test_query_cache_is_shared_across_result_counts,
+                 test_slow_provider_is_cut_off_at_the_deadline, test_single_flight_shares_one_call_and_its_error):
+        test()
+        print(f"✅ {test.__name__}")
@@ -0,0 +1,30 @@
+import random
+
+from keyword_matcher import KeywordMatcher
+
+def test_counts_distinct_substring_matches_per_group():
+    """Overlapping and repeated keywords count once per group, as ``keyword in text`` would"""
+    matcher = KeywordMatcher({
+        "mobile": ["react native", "app", "app development"],
+        "web": ["react", "app", "web"],
+        "ai": ["ai"]
+    })
+
+    assert matcher.counts("react native app development, another app") == {"mobile": 3, "web": 2}
+    assert matcher.counts("maintain a website") == {"web": 1, "ai": 1}
+    assert matcher.counts("") == {}
+
+def test_matches_substring_scoring_on_random_text():
+    """Scores equal a keyword-by-keyword substring check on arbitrary text"""
+    groups = {"a": ["ab", "abc", "bca"], "b": ["c", "cab", "bb"], "c": ["abcab", "b"]}
+    matcher = KeywordMatcher(groups)
+    rng = random.Random(0)
+    for _ in range(500):
+        text = "".join(rng.choice("abc ") for _ in range(rng.randint(0, 20)))
+        expected = {label: sum(k in text for k in keywords) for label, keywords in groups.items()}
+        assert matcher.counts(text) == {label: score for label, score in expected.items() if score}
+
+if __name__ == "__main__":
+    for test in (test_counts_distinct_substring_matches_per_group, test_matches_substring_scoring_on_random_text):
+        test()
+        print(f"✅ {test.__name__}")
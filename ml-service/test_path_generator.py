@@ -0,0 +1,403 @@
+import json
+import os
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+os.environ.setdefault('HTTP_PREWARM', 'false')
+os.environ.setdefault('CACHE_WARM_ON_STARTUP', 'false')
+os.environ.setdefault('RESOURCE_CACHE_SNAPSHOT', 'false')
+
+import enhanced_app
+from enhanced_app import AdvancedLearningPathGenerator
+from resource_fetcher import Deadline, ResourceCache, UniversalResourceFetcher
+
+class StubFetcher:
+    """Provider calls answered locally after ``delay`` seconds and counted per query"""
+
+    _get_fallback_videos = UniversalResourceFetcher._get_fallback_videos
+    _get_fallback_projects = UniversalResourceFetcher._get_fallback_projects
+    _get_fallback_articles = UniversalResourceFetcher._get_fallback_articles
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = Counter()
+        self._lock = threading.Lock()
+
+    def _call(self, provider, query):
+        with self._lock:
+            self.calls[(provider, query)] += 1
+        time.sleep(self.delay)
+
+    def get_youtube_videos(self, keywords, difficulty="beginner", max_results=5):
+        self._call("youtube", tuple(keywords))
+        return [{"title": f"{' '.join(keywords)} video", "url": "https://youtube.test", "platform": "YouTube"}]
+
+    def get_github_projects(self, keywords, difficulty="beginner", max_results=5):
+        self._call("github", tuple(keywords))
+        return [{"title": f"{' '.join(keywords)} project", "url": "https://github.test", "platform": "GitHub"}]
+
+    def get_dev_articles(self, keywords, max_results=5):
+        self._call("devto", tuple(keywords))
+        return [{"title": f"{' '.join(keywords)} article", "url": "https://dev.test", "platform": "Dev.to"}]
+
+    def get_comprehensive_resources(self, domain, subdomain, difficulty, deadline=None):
+        if deadline is not None and deadline.remaining() < self.delay:
+            # Like the real fan-out, the provider wait stops at the request's deadline
+            with self._lock:
+                self.calls[("comprehensive", (domain, subdomain, difficulty))] += 1
+            time.sleep(deadline.remaining())
+            deadline.mark_degraded("resources.videos")
+            return {"videos": self._get_fallback_videos([subdomain], difficulty),
+                    "projects": [], "articles": [], "courses": [], "documentation": [], "practice": []}
+        self._call("comprehensive", (domain, subdomain, difficulty))
+        return {"videos": [{"title": f"{subdomain} course video", "platform": "YouTube"}],
+                "projects": [], "articles": [], "courses": [], "documentation": [], "practice": []}
+
+    def provider_calls(self, provider):
+        return {query: count for (name, query), count in self.calls.items() if name == provider}
+
+@contextmanager
+def stub_generator(fetcher=None):
+    """A path generator on a stub fetcher and an empty cache, serving the app while in use"""
+    generator = AdvancedLearningPathGenerator()
+    generator.resource_fetcher = fetcher or StubFetcher()
+    generator.cache = ResourceCache()
+    original, enhanced_app.path_generator = enhanced_app.path_generator, generator
+    try:
+        yield generator
+    finally:
+        enhanced_app.path_generator = original
+        generator.prefetch_executor.shutdown(wait=True)
+
+def path_input(title="Learn web development", **overrides):
+    return {"title": title, "domain": "web-development", "subdomain": "frontend", "durationWeeks": 8,
+            "preferredDifficulty": "beginner", "availableTimePerWeek": 10, **overrides}
+
+def test_generate_paths_keeps_order_and_fetches_shared_keys_once():
+    """A batch answers in input order, fails bad inputs alone and fetches every shared key once"""
+    inputs = [
+        path_input("First"),
+        path_input("Broken", durationWeeks="many"),
+        path_input("Second", durationWeeks=12),
+        path_input("Third", domain="data-science", subdomain="general")
+    ]
+    with stub_generator() as generator:
+        results = generator.generate_paths(inputs)
+        fetcher = generator.resource_fetcher
+
+    assert [result["success"] for result in results] == [True, False, True, True]
+    assert [result["learning_path"]["title"] for result in results if result["success"]] == ["First", "Second", "Third"]
+    assert "many" in results[1]["error"]
+
+    # "First" and "Second" share their comprehensive key and their common topics
+    assert fetcher.provider_calls("comprehensive") == {
+        ("web-development", "frontend", "beginner"): 1, ("data-science", "general", "beginner"): 1
+    }
+    assert set(fetcher.provider_calls("youtube").values()) == {1}
+    topics = {week["primary_topic"] for result in results if result["success"]
+              for week in result["learning_path"]["weekly_plan"]}
+    assert len(fetcher.provider_calls("youtube")) == len(topics)
+
+def test_resolve_resources_reads_cached_keys_and_falls_back_on_slow_ones():
+    """Cached keys are read inline, slow keys with a fallback are degraded, keys without one are waited for"""
+    with stub_generator() as generator:
+        generator.cache.set("cached", [{"title": "cached"}])
+        fetched = Counter()
+
+        def fetch(key, delay):
+            fetched[key] += 1
+            time.sleep(delay)
+            return [{"title": key}]
+
+        deadline = Deadline(0.2)
+        resolved = generator.resolve_resources({
+            "cached": (lambda: generator.cache.get("cached"), lambda: [], "weekly_plan.cached"),
+            "fast": (lambda: fetch("fast", 0), lambda: [{"title": "fallback"}], "weekly_plan.fast"),
+            "slow": (lambda: fetch("slow", 0.5), lambda: [{"title": "fallback"}], "weekly_plan.slow"),
+            "required": (lambda: fetch("required", 0.3), None, "resources")
+        }, deadline)
+
+    assert resolved["cached"] == ({"title": "cached"},)
+    assert resolved["fast"] == [{"title": "fast"}]
+    assert resolved["slow"] == [{"title": "fallback"}]
+    assert resolved["required"] == [{"title": "required"}]
+    assert deadline.degraded == ["weekly_plan.slow"]
+    assert fetched == {"fast": 1, "slow": 1, "required": 1}
+
+def test_weekly_resources_are_prefetched_once_per_topic():
+    """Each distinct topic is fetched once up front; the weeks only read the prefetched results"""
+    with stub_generator() as generator:
+        skeleton = generator.path_skeleton("web-development", "frontend", "beginner", 24, 10)
+        prefetch = generator.prefetch_topic_resources
+        prefetched = {}
+
+        def recording_prefetch(*args):
+            prefetched.update(prefetch(*args))
+            return prefetched
+
+        generator.prefetch_topic_resources = recording_prefetch
+        weeks = generator._fill_weekly_resources(skeleton, "web-development", "beginner")
+        fetcher = generator.resource_fetcher
+
+    topics = {week["primary_topic"] for week in skeleton["weekly_plan"]}
+    assert len(weeks) > len(topics)
+    assert set(prefetched) == topics
+    assert all(week["resources_needed"] is prefetched[week["primary_topic"]] for week in weeks)
+    for provider in ("youtube", "github", "devto"):
+        assert len(fetcher.provider_calls(provider)) == len(topics)
+        assert set(fetcher.provider_calls(provider).values()) == {1}
+
+def test_paths_from_one_cached_skeleton_share_no_mutable_state():
+    """Requests stamped from the same cached skeleton get their own ids and their own week and milestone dicts"""
+    with stub_generator() as generator:
+        first = generator.generate_path(path_input())["learning_path"]
+        second = generator.generate_path(path_input())["learning_path"]
+        first["weekly_plan"][0]["notes"] = "mine"
+        first["milestones"][0]["notes"] = "mine"
+        third = generator.generate_path(path_input())["learning_path"]
+        skeleton_hits = generator.path_skeleton.cache_info().hits
+
+    assert skeleton_hits == 2
+    assert len({first["id"], second["id"], third["id"]}) == 3
+    assert not {milestone["id"] for milestone in first["milestones"]} & {milestone["id"] for milestone in second["milestones"]}
+    for week, other in zip(first["weekly_plan"], second["weekly_plan"]):
+        assert week is not other
+    for path in (second, third):
+        assert "notes" not in path["weekly_plan"][0] and "notes" not in path["milestones"][0]
+
+def test_generate_paths_endpoint_answers_each_input_in_place():
+    """/generate-paths reports invalid inputs in place and generates the others together"""
+    inputs = [path_input("First"), {"title": "No parameters"}, "not an object", path_input("Second")]
+    with stub_generator() as generator:
+        response = enhanced_app.app.test_client().post('/generate-paths', json={"paths": inputs})
+        fetcher = generator.resource_fetcher
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert (body["total"], body["succeeded"], body["failed"]) == (4, 2, 2)
+    results = body["results"]
+    assert results[0]["learning_path"]["title"] == "First"
+    assert results[1]["message"].startswith("Missing required fields: durationWeeks")
+    assert results[2] == {"success": False, "message": "Path input must be an object"}
+    assert results[3]["learning_path"]["title"] == "Second"
+    assert fetcher.provider_calls("comprehensive") == {("web-development", "frontend", "beginner"): 1}
+    assert set(fetcher.calls.values()) == {1}
+
+def stream_events(generator, stream_format, user_input=None):
+    """POST a path request asking for a stream, and parse its NDJSON lines or SSE frames"""
+    response = enhanced_app.app.test_client().post(f'/generate-path?stream={stream_format}', json=user_input or path_input())
+    assert response.status_code == 200
+    assert response.mimetype == enhanced_app.PATH_STREAM_MIMETYPES[stream_format]
+    body = response.get_data(as_text=True)
+    if stream_format == "ndjson":
+        return [json.loads(line) for line in body.splitlines()]
+    events = []
+    for frame in body.split("\n\n"):
+        if not frame:
+            continue
+        name, data = frame.split("\n")
+        event = json.loads(data[len("data: "):])
+        assert name == f"event: {event['event']}"
+        events.append(event)
+    return events
+
+def test_stream_sends_header_weeks_then_summary():
+    """Both stream formats send the path header first, one event per week, then milestones and metrics"""
+    for stream_format in ("ndjson", "sse"):
+        with stub_generator() as generator:
+            events = stream_events(generator, stream_format)
+            expected = generator.generate_path(path_input())["learning_path"]
+
+        names = [event["event"] for event in events]
+        weeks = len(expected["weekly_plan"])
+        assert names == ["path"] + ["week"] * weeks + ["milestones", "resources", "learning_metrics", "complete"]
+        assert "weekly_plan" not in events[0]["learning_path"]
+        assert [event["week"]["week"] for event in events[1:weeks + 1]] == list(range(1, weeks + 1))
+        assert [event["week"]["resources_needed"] for event in events[1:weeks + 1]] == [
+            list(week["resources_needed"]) for week in expected["weekly_plan"]
+        ]
+        assert events[-2]["learning_metrics"] == expected["learning_metrics"]
+        assert events[-1]["success"] and events[-1]["path_id"] == events[0]["learning_path"]["id"]
+
+def test_stream_failure_ends_with_error_event():
+    """A failure after some weeks were sent ends the stream with an error event"""
+    for stream_format in ("ndjson", "sse"):
+        with stub_generator() as generator:
+            resolve = generator._resolve_streamed_topic
+            resolved = []
+
+            def failing_resolve(*args):
+                if resolved:
+                    raise RuntimeError("topic store unavailable")
+                resolved.append(args)
+                return resolve(*args)
+
+            generator._resolve_streamed_topic = failing_resolve
+            events = stream_events(generator, stream_format)
+
+        names = [event["event"] for event in events]
+        assert names[0] == "path" and "week" in names
+        assert names[-1] == "error" and names.count("error") == 1
+        assert "milestones" not in names and "complete" not in names
+        assert events[-1]["success"] is False and events[-1]["error"] == "topic store unavailable"
+
+def generated_path(generator, **overrides):
+    """A generated path as a client would send it back: plain JSON"""
+    result = generator.generate_path(path_input(durationWeeks=12, availableTimePerWeek=4, **overrides))
+    return json.loads(json.dumps(result["learning_path"]))
+
+def replanned_weeks(learning_path, result):
+    """The full weekly plan after a re-plan, rebuilt from the kept weeks and the diff"""
+    diff = result["diff"]
+    kept = learning_path["weekly_plan"][:diff["kept_weeks"]]
+    unchanged = [week for week in learning_path["weekly_plan"] if week["week"] in diff["unchanged_weeks"]]
+    return sorted(kept + unchanged + diff["updated_weeks"] + diff["added_weeks"], key=lambda week: week["week"])
+
+def test_replan_from_the_start_matches_a_fresh_path():
+    """completedWeeks=0 keeps an unchanged plan as is, and with new parameters equals a fresh path"""
+    with stub_generator() as generator:
+        learning_path = generated_path(generator)
+        same = generator.replan_path(learning_path, completed_weeks=0)
+        changed = generator.replan_path(learning_path, completed_weeks=0, duration_weeks=16, hours_per_week=3)
+        fresh = generator.generate_path(path_input(durationWeeks=16, availableTimePerWeek=3))
+
+    assert same["diff"]["unchanged_weeks"] == list(range(1, 13)) and same["fetched_topics"] == []
+    assert json.loads(json.dumps(replanned_weeks(learning_path, changed))) == json.loads(json.dumps(fresh["learning_path"]["weekly_plan"]))
+    assert changed["path_updates"]["learning_metrics"] == fresh["learning_path"]["learning_metrics"]
+
+def test_replan_resumes_part_way_through_a_topic():
+    """After one of its three weeks, a topic continues at the new pace before the next topic starts"""
+    with stub_generator() as generator:
+        learning_path = generated_path(generator)
+        assert [week["primary_topic"] for week in learning_path["weekly_plan"][1:5]] == [
+            "HTML Fundamentals", "CSS Styling", "CSS Styling", "CSS Styling"
+        ]
+        result = generator.replan_path(learning_path, completed_weeks=3, hours_per_week=8)
+
+    weeks = replanned_weeks(learning_path, result)
+    css = next(topic for topic in enhanced_app.LEARNING_DATABASE["web-development"]["beginner"]["topics"]
+               if topic["name"] == "CSS Styling")
+    assert result["replanned_from_week"] == 4
+    assert [week["primary_topic"] for week in weeks[2:5]] == ["CSS Styling", "CSS Styling", "JavaScript Basics"]
+    assert weeks[3]["subtopics"] == css["subtopics"][1:3]
+    assert weeks[2] == learning_path["weekly_plan"][2]
+
+def test_replan_after_a_finished_topic_starts_the_next_one():
+    """A topic whose last planned week is completed is not scheduled again"""
+    with stub_generator() as generator:
+        learning_path = generated_path(generator)
+        result = generator.replan_path(learning_path, completed_weeks=5, hours_per_week=8)
+
+    weeks = replanned_weeks(learning_path, result)
+    assert weeks[4]["primary_topic"] == "CSS Styling"
+    assert weeks[5]["primary_topic"] == "JavaScript Basics" and weeks[5]["estimated_hours"] == 8
+
+def test_replan_after_the_last_week_and_when_shrinking():
+    """Nothing is left to schedule after the last week; a shorter duration removes the trailing weeks"""
+    with stub_generator() as generator:
+        learning_path = generated_path(generator)
+        finished = generator.replan_path(learning_path, completed_weeks=12, duration_weeks=14)
+        shrunk = generator.replan_path(learning_path, completed_weeks=3, duration_weeks=6)
+
+    assert finished["replanned_from_week"] == 13
+    assert finished["diff"]["added_weeks"] == [] and finished["diff"]["removed_weeks"] == []
+    assert finished["diff"]["kept_weeks"] == 12
+
+    assert [week["week"] for week in replanned_weeks(learning_path, shrunk)] == list(range(1, 7))
+    assert shrunk["diff"]["removed_weeks"] == list(range(7, 13))
+    assert shrunk["path_updates"]["duration_weeks"] == 6
+
+def test_replan_refetches_topics_with_fallback_resources():
+    """Topics whose existing resources are fallbacks are fetched again; real ones are reused"""
+    with stub_generator() as generator:
+        learning_path = generated_path(generator)
+        fallback = [{"title": "Learn JavaScript Basics", "url": "#", "type": "fallback"}]
+        for week in learning_path["weekly_plan"]:
+            if week["primary_topic"] == "JavaScript Basics":
+                week["resources_needed"] = fallback
+        generator.cache.clear()
+        generator.resource_fetcher.calls.clear()
+
+        result = generator.replan_path(learning_path, completed_weeks=2)
+
+    assert result["fetched_topics"] == ["JavaScript Basics"]
+    assert {query for _, query in generator.resource_fetcher.calls} == {tuple(next(
+        topic for topic in enhanced_app.LEARNING_DATABASE["web-development"]["beginner"]["topics"]
+        if topic["name"] == "JavaScript Basics"
+    ).get("keywords", ["JavaScript Basics"]))}
+    javascript = [week for week in replanned_weeks(learning_path, result) if week["primary_topic"] == "JavaScript Basics"]
+    assert javascript and all(week["resources_needed"] != fallback for week in javascript)
+
+def test_replan_rejects_unknown_topics_and_malformed_weeks():
+    """A completed week outside the catalog or a malformed week is a 400, not a server error"""
+    with stub_generator() as generator:
+        learning_path = generated_path(generator)
+        client = enhanced_app.app.test_client()
+
+        unknown = json.loads(json.dumps(learning_path))
+        unknown["weekly_plan"][2]["primary_topic"] = "COBOL"
+        response = client.post('/replan', json={"learningPath": unknown, "completedWeeks": 3})
+        assert response.status_code == 400
+        assert "COBOL" in response.get_json()["message"]
+
+        for malformed_week in ({"week": 1}, "week one", {"week": 7, "primary_topic": "HTML Fundamentals"}):
+            malformed = json.loads(json.dumps(learning_path))
+            malformed["weekly_plan"][0] = malformed_week
+            response = client.post('/replan', json={"learningPath": malformed, "completedWeeks": 3})
+            assert response.status_code == 400, malformed_week
+
+        response = client.post('/replan', json={"learningPath": learning_path, "completedWeeks": [3]})
+        assert response.status_code == 400
+
+def test_generate_path_overlaps_fetches_and_degrades_at_the_budget():
+    """Topic and comprehensive fetches run side by side; what misses the budget falls back and is cached later"""
+    # Each topic makes three provider calls of 0.2s; the comprehensive fetch makes one
+    with stub_generator(StubFetcher(delay=0.2)) as generator:
+        started = time.monotonic()
+        result = generator.generate_path(path_input(latencyBudgetMs=750))
+        assert time.monotonic() - started < 0.75
+        assert result["success"] and result["degraded_sections"] == []
+
+        generator.cache.clear()
+        started = time.monotonic()
+        result = generator.generate_path(path_input(latencyBudgetMs=100))
+        elapsed = time.monotonic() - started
+        topics = {week["primary_topic"] for week in result["learning_path"]["weekly_plan"]}
+        assert elapsed < 0.4
+        assert set(result["degraded_sections"]) == {f"weekly_plan.{name}" for name in topics} | {"resources.videos"}
+        assert all(item["type"] == "fallback" for week in result["learning_path"]["weekly_plan"]
+                   for item in week["resources_needed"])
+        assert result["latency_budget_ms"] == 100
+
+        # The cut-short topic fetches finish in the background and serve the next request
+        time.sleep(0.7)
+        result = generator.generate_path(path_input(latencyBudgetMs=100))
+        assert not any(section.startswith("weekly_plan.") for section in result["degraded_sections"])
+
+def test_invalid_latency_budgets_are_rejected():
+    """A non-numeric, zero or negative latencyBudgetMs is a 400 on every endpoint that takes one"""
+    with stub_generator() as generator:
+        client = enhanced_app.app.test_client()
+        learning_path = generated_path(generator)
+        for budget in ("fast", -5, 0, True, [100]):
+            assert client.post('/generate-path', json=path_input(latencyBudgetMs=budget)).status_code == 400
+            assert client.post('/generate-path?stream=ndjson', json=path_input(latencyBudgetMs=budget)).status_code == 400
+            assert client.post('/generate-paths', json={"paths": [path_input()], "latencyBudgetMs": budget}).status_code == 400
+            assert client.post('/replan', json={"learningPath": learning_path, "latencyBudgetMs": budget}).status_code == 400
+        assert client.post('/generate-path', json=path_input(latencyBudgetMs="1500")).status_code == 200
+
+if __name__ == "__main__":
+    for test in (test_generate_paths_keeps_order_and_fetches_shared_keys_once,
+                 test_resolve_resources_reads_cached_keys_and_falls_back_on_slow_ones,
+                 test_weekly_resources_are_prefetched_once_per_topic,
+                 test_paths_from_one_cached_skeleton_share_no_mutable_state,
+                 test_generate_paths_endpoint_answers_each_input_in_place,
+                 test_stream_sends_header_weeks_then_summary, test_stream_failure_ends_with_error_event,
+                 test_replan_from_the_start_matches_a_fresh_path, test_replan_resumes_part_way_through_a_topic,
+                 test_replan_after_a_finished_topic_starts_the_next_one, test_replan_after_the_last_week_and_when_shrinking,
+                 test_replan_refetches_topics_with_fallback_resources, test_replan_rejects_unknown_topics_and_malformed_weeks,
+                 test_generate_path_overlaps_fetches_and_degrades_at_the_budget, test_invalid_latency_budgets_are_rejected):
+        test()
+        print(f"✅ {test.__name__}")
@@ -0,0 +1,81 @@
+import tempfile
+import threading
+from datetime import datetime
+from unittest import mock
+
+from quota_ledger import QUOTA_TIMEZONE, QuotaLedger, QuotaScheduler
+
+def at(day, hour):
+    """Patch the ledger clock to ``hour`` o'clock of a March 2026 quota day"""
+    return mock.patch("quota_ledger.time.time",
+                      return_value=datetime(2026, 3, day, hour, tzinfo=QUOTA_TIMEZONE).timestamp())
+
+def test_usage_resets_when_the_quota_day_rolls_over():
+    """Counters belong to one Pacific quota day and start from zero on the next"""
+    ledger = QuotaLedger("youtube", daily_limit=10000, state_dir=tempfile.mkdtemp())
+    with at(10, 23):
+        ledger.record(100)
+        ledger.record(300, calls=3)
+        assert (ledger.snapshot()["used"], ledger.snapshot()["calls"]) == (400, 4)
+    with at(11, 0):
+        snapshot = ledger.snapshot()
+        assert (snapshot["used"], snapshot["calls"], snapshot["remaining"]) == (0, 0, 10000)
+
+def test_scheduler_paces_spending_across_the_day():
+    """Interactive calls may run a burst ahead of the day's pace; background calls stay on it and keep the reserve"""
+    ledger = QuotaLedger("youtube", daily_limit=10000, state_dir=tempfile.mkdtemp())
+    scheduler = QuotaScheduler(ledger, burst_units=1000, reserve_units=2000)
+    with at(10, 6):  # a quarter of the day: 2500 units earned so far
+        assert ledger.snapshot()["day_elapsed_fraction"] == 0.25
+        ledger.record(2400)
+        assert scheduler.should_spend(100) and scheduler.should_spend(100, "background")
+        ledger.record(1000)
+        assert scheduler.should_spend(100) and not scheduler.should_spend(100, "background")
+        ledger.record(100)
+        assert not scheduler.should_spend(100)
+    with at(10, 23):  # most of the day's budget is earned, but background work leaves the reserve
+        ledger.record(4300)
+        assert scheduler.should_spend(100) and scheduler.should_spend(100, "background")
+        ledger.record(200)
+        assert scheduler.should_spend(100) and not scheduler.should_spend(100, "background")
+
+def test_mark_exhausted_stops_spending_until_the_reset():
+    """A provider quotaExceeded stops every worker until the next quota day"""
+    state_dir = tempfile.mkdtemp()
+    ledger = QuotaLedger("youtube", daily_limit=10000, state_dir=state_dir)
+    other_worker = QuotaScheduler(QuotaLedger("youtube", daily_limit=10000, state_dir=state_dir), 1000, 0)
+    with at(10, 12):
+        ledger.mark_exhausted()
+        assert ledger.snapshot()["remaining"] == 0
+        assert not other_worker.should_spend(100) and not other_worker.reserve(100)
+    with at(11, 12):
+        assert other_worker.should_spend(100)
+
+def test_concurrent_reservations_never_overspend():
+    """Workers reserving at the same time get exactly the budget between them, checked and charged atomically"""
+    state_dir = tempfile.mkdtemp()
+    schedulers = [QuotaScheduler(QuotaLedger("youtube", daily_limit=1000, state_dir=state_dir), 0, 0) for _ in range(4)]
+    granted = []
+
+    def worker(scheduler):
+        for _ in range(10):
+            if scheduler.reserve(100):
+                granted.append(1)
+
+    with at(10, 23):
+        threads = [threading.Thread(target=worker, args=(scheduler,)) for scheduler in schedulers for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        snapshot = schedulers[0].ledger.snapshot()
+
+    # 23:00 is 23/24 of the day: 958 units earned, so nine searches
+    assert len(granted) == 9
+    assert (snapshot["used"], snapshot["calls"]) == (900, 9)
+
+if __name__ == "__main__":
+    for test in (test_usage_resets_when_the_quota_day_rolls_over, test_scheduler_paces_spending_across_the_day,
+                 test_mark_exhausted_stops_spending_until_the_reset, test_concurrent_reservations_never_overspend):
+        test()
+        print(f"✅ {test.__name__}")
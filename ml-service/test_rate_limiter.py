@@ -0,0 +1,36 @@
+import tempfile
+import time
+
+from rate_limiter import SharedTokenBucket
+from resource_fetcher import Deadline, UniversalResourceFetcher, background_priority, fetch_deadline
+
+def test_acquire_waits_for_a_refill_within_its_timeout():
+    """acquire sleeps until a token refills if that fits its timeout, and gives up at once otherwise"""
+    bucket = SharedTokenBucket("test", rate=20, capacity=1, state_dir=tempfile.mkdtemp())
+
+    assert bucket.acquire()
+    assert not bucket.try_acquire()
+
+    started = time.monotonic()
+    assert not bucket.acquire(timeout=0.01)
+    assert time.monotonic() - started < 0.01
+
+    started = time.monotonic()
+    assert bucket.acquire(timeout=0.5)
+    assert 0.02 < time.monotonic() - started < 0.3
+
+def test_token_wait_follows_priority_and_deadline():
+    """Interactive calls wait up to the configured time within their deadline; background calls never wait"""
+    fetcher = UniversalResourceFetcher()
+    fetcher.rate_limit_wait = 2
+
+    assert fetcher._token_wait() == 2
+    with fetch_deadline(Deadline(0.5)):
+        assert 0.4 < fetcher._token_wait() <= 0.5
+    with background_priority():
+        assert fetcher._token_wait() == 0
+
+if __name__ == "__main__":
+    for test in (test_acquire_waits_for_a_refill_within_its_timeout, test_token_wait_follows_priority_and_deadline):
+        test()
+        print(f"✅ {test.__name__}")
@@ -0,0 +1,331 @@
+import os
+import pickle
+import tempfile
+import time
+from unittest import mock
+
+from cache_snapshot import CacheSnapshot
+from cache_warmer import CacheWarmer
+from cache_store import FrozenDict, MemoryCacheStore, SQLiteCacheStore, ZlibCodec
+from rate_limiter import SharedTokenBucket
+from resource_fetcher import FETCH_PRIORITY, ResourceCache, UniversalResourceFetcher
+
+def age_entry(cache, key, seconds):
+    """Rewrite an entry as if it had been stored ``seconds`` ago"""
+    data, _, ttl = cache.store.peek(key)
+    cache.store.put(key, data, time.time() - seconds, ttl)
+
+def test_lru_eviction_within_limits():
+    """Sets past the entry limit evict the least recently used key"""
+    cache = ResourceCache(store=MemoryCacheStore(max_entries=3, max_bytes=10000))
+    for i in range(3):
+        cache.set(f"key{i}", [{"index": i}])
+
+    cache.get("key0")
+    cache.set("key3", [{"index": 3}])
+
+    assert cache.keys() == ["key2", "key0", "key3"]
+    assert cache.get("key1") is None
+    assert cache.stats()["evictions"] == 1
+
+def test_byte_budget_and_sweep():
+    """The byte budget bounds memory; the periodic sweep drops entries past the stale window, on reads too"""
+    cache = ResourceCache(store=MemoryCacheStore(max_entries=10, max_bytes=100))
+    cache.set("small", ["x" * 10])
+    cache.set("large", ["x" * 200])
+    assert cache.keys() == ["small"]
+
+    age_entry(cache, "small", cache.cache_duration.total_seconds() + 60)
+    assert cache.get("small") is None
+    assert cache.get_stale("small") == ("x" * 10,)
+
+    age_entry(cache, "small", (cache.cache_duration + cache.stale_duration).total_seconds() + 60)
+    cache.get("other")
+    assert cache.keys() == ["small"]
+
+    # Reads alone sweep once the interval has passed
+    cache.last_sweep -= cache.sweep_interval
+    cache.get("other")
+    assert cache.keys() == []
+    assert cache.stats()["bytes"] == 0
+
+def test_sqlite_store_is_shared():
+    """Two caches on the same SQLite file (as two workers would be) see each other's entries"""
+    path = os.path.join(tempfile.mkdtemp(), "cache.sqlite3")
+    first = ResourceCache(store=SQLiteCacheStore(path, max_entries=2, max_bytes=10000))
+    second = ResourceCache(store=SQLiteCacheStore(path, max_entries=2, max_bytes=10000))
+
+    first.set("a", {"videos": [1]})
+    assert second.get("a") == {"videos": (1,)}
+
+    second.set("b", {"videos": [2]})
+    second.set("c", {"videos": [3]})
+    assert first.keys() == ["b", "c"]
+    assert first.stats()["evictions"] == 1
+
+    first.clear()
+    assert second.get("b") is None
+
+def test_snapshot_restores_entries_with_their_timestamps():
+    """A new cache loads the snapshot in the background, keeping TTLs and newer entries"""
+    path = os.path.join(tempfile.mkdtemp(), "cache.snapshot")
+    cache = ResourceCache()
+    cache.set("fresh", {"videos": [1]})
+    cache.set("shared", {"videos": [2]})
+    cache.store.put("expired", {"videos": [3]}, time.time() - cache.cache_duration.total_seconds() - 60)
+    CacheSnapshot(cache, path=path).save()
+
+    restarted = ResourceCache()
+    restarted.set("shared", {"videos": ["newer"]})
+    snapshot = CacheSnapshot(restarted, path=path)
+    snapshot.start()
+    assert snapshot.loaded.wait(5)
+
+    assert restarted.get("fresh") == {"videos": (1,)}
+    assert restarted.get("shared") == {"videos": ("newer",)}
+    assert restarted.get("expired") is None
+    assert restarted.get_stale("expired") == {"videos": (3,)}
+    assert isinstance(restarted.get_stale("expired"), FrozenDict)
+
+def test_snapshots_of_every_worker_are_merged():
+    """Each worker saves its own file; a restart loads all of them, newest copy first, and drops exited workers' files"""
+    path = os.path.join(tempfile.mkdtemp(), "cache.snapshot")
+    first, second = ResourceCache(), ResourceCache()
+    first.set("only-first", {"videos": [1]})
+    first.store.put("both", {"videos": ["older"]}, time.time() - 60)
+    second.set("both", {"videos": ["newer"]})
+    CacheSnapshot(first, path=path, worker_id="first").save()
+    CacheSnapshot(second, path=path, worker_id="second").save()
+
+    restarted = ResourceCache()
+    snapshot = CacheSnapshot(restarted, path=path, worker_id=str(os.getpid()))
+    snapshot.load()
+    assert restarted.get("only-first") == {"videos": (1,)}
+    assert restarted.get("both") == {"videos": ("newer",)}
+
+    exited_pid = 2 ** 22 + 1  # above Linux's pid_max, never a running process
+    os.rename(f"{path}.first", f"{path}.{exited_pid}")
+    snapshot.save()
+    assert sorted(os.listdir(os.path.dirname(path))) == sorted([f"cache.snapshot.{os.getpid()}", "cache.snapshot.second"])
+
+def test_get_or_fetch_serves_stale_while_revalidating():
+    """Past the soft TTL the cached value is served while one background refresh replaces it"""
+    cache = ResourceCache()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        time.sleep(0.1)
+        return {"version": len(calls)}
+
+    assert cache.get_or_fetch("key", fetch) == {"version": 1}
+    assert cache.get_or_fetch("key", fetch) == {"version": 1}
+    assert len(calls) == 1
+
+    age_entry(cache, "key", cache.soft_ttl.total_seconds() * 1.15)
+    assert [cache.get_or_fetch("key", fetch) for _ in range(5)] == [{"version": 1}] * 5
+    cache.refresh_executor.shutdown(wait=True)
+    assert len(calls) == 2
+    assert cache.get("key") == {"version": 2}
+
+    age_entry(cache, "key", cache.cache_duration.total_seconds() + 1)
+    assert cache.get_or_fetch("key", fetch) == {"version": 3}
+
+def test_fallback_results_use_the_negative_ttl():
+    """Fallback and empty results expire after the negative TTL, real ones after the full TTL"""
+    cache = ResourceCache()
+    fallback = [{"title": "Curated", "fallback": True}]
+    cache.set("fallback", fallback)
+    cache.set("empty", [])
+    cache.set("mixed", {"videos": fallback, "articles": [{"title": "Real"}]})
+    cache.set("real", {"videos": [{"title": "Real"}], "practice": []})
+
+    for key in ("fallback", "empty", "mixed", "real"):
+        age_entry(cache, key, cache.negative_ttl.total_seconds() + 1)
+
+    assert cache.get("fallback") is None
+    assert cache.get("empty") is None
+    assert cache.get("mixed") is None
+    assert cache.get("real") == {"videos": ({"title": "Real"},), "practice": ()}
+    assert cache.get_or_fetch("fallback", lambda: [{"title": "Recovered"}]) == ({"title": "Recovered"},)
+
+def test_negative_results_are_classified_per_provider_section():
+    """Only a provider section made entirely of fallback items is a miss; a provider disabled by configuration is not"""
+    cache = ResourceCache()
+    fetcher = UniversalResourceFetcher()
+    videos = fetcher._get_fallback_videos(["python"], "beginner")
+    projects = [{"title": "Real", "platform": "GitHub", "type": "project"}]
+
+    assert cache._is_negative({"videos": videos, "projects": projects})
+    assert not cache._is_negative({"videos": fetcher._disabled_fallback(videos), "projects": projects})
+    assert not cache._is_negative({"videos": videos + [{"title": "Real", "platform": "YouTube"}], "projects": projects})
+    assert cache._is_negative(projects + videos)
+    assert not cache._is_negative(projects + fetcher._disabled_fallback(videos))
+    assert cache._is_negative([{"title": "Topic", "type": "fallback"}])
+
+def test_background_refresh_spends_quota_as_background_work():
+    """A stale-while-revalidate refresh never waits for a token and reserves quota as background work"""
+    cache = ResourceCache()
+    fetcher = UniversalResourceFetcher(cache=ResourceCache())
+    fetcher.youtube_api_key = "test-key"
+    fetcher.youtube_limiter = SharedTokenBucket("youtube", rate=1, capacity=1, state_dir=tempfile.mkdtemp())
+    token_waits = []
+    token_wait = fetcher._token_wait
+
+    def recording_token_wait():
+        token_waits.append(token_wait())
+        return token_waits[-1]
+
+    fetcher._token_wait = recording_token_wait
+
+    with mock.patch.object(fetcher.quota_scheduler, "reserve", return_value=False) as reserve:
+        cache.refresh_in_background("web-development_React_beginner", lambda: fetcher.get_youtube_videos(["React"]))
+        cache.refresh_executor.shutdown(wait=True)
+
+    assert reserve.call_args.args[1] == "background"
+    assert token_waits == [0.0]
+
+class FakeLimiter:
+    def available(self):
+        return 3.0
+
+class FakeFetcher:
+    """Catalog tables and budget checks of UniversalResourceFetcher, with counted fetches"""
+    youtube_limiter = github_limiter = FakeLimiter()
+    youtube_delay = github_delay = 0.01
+
+    def __init__(self):
+        self.quota_scheduler = self
+        self.fetched = []
+
+    def should_spend(self, cost, priority="interactive"):
+        assert priority == "background"
+        return True
+
+    def get_comprehensive_resources(self, domain, subdomain, difficulty):
+        assert FETCH_PRIORITY.get() == "background"
+        self.fetched.append((domain, subdomain, difficulty))
+        return {"videos": [{"title": f"{subdomain} {difficulty}"}]}
+
+class FakeGenerator:
+    database = {"web-development": {"beginner": {"topics": [{"name": "HTML", "keywords": ["html"]}]}}}
+
+    def __init__(self, cache):
+        self.cache = cache
+        self.resource_fetcher = FakeFetcher()
+
+    def _comprehensive_cache_key(self, domain, subdomain, difficulty):
+        return f"comprehensive_{domain}_{subdomain}_{difficulty}"
+
+    def catalog_subdomains(self, domain):
+        return ["frontend", "backend"]
+
+    def _topic_cache_key(self, domain, topic, difficulty):
+        return f"{domain}_{topic['name']}_{difficulty}"
+
+    def _fetch_topic_resources(self, topic, keywords, difficulty):
+        assert FETCH_PRIORITY.get() == "background"
+        self.resource_fetcher.fetched.append(tuple(keywords))
+        return [{"title": topic["name"]}]
+
+def test_cache_warmer_fills_every_catalog_key_and_resumes():
+    """The warmer caches each domain/subdomain/difficulty and topic key once, skipping warm entries"""
+    cache = ResourceCache()
+    generator = FakeGenerator(cache)
+    cache.set("comprehensive_web-development_frontend_beginner", {"videos": [{"title": "already warm"}]})
+
+    progress = CacheWarmer(generator, concurrency=2).run()
+
+    assert progress == {"total": 3, "warmed": 2, "skipped": 1, "fallback": 0, "failed": 0}
+    assert sorted(cache.keys()) == [
+        "comprehensive_web-development_backend_beginner", "comprehensive_web-development_frontend_beginner",
+        "web-development_HTML_beginner"
+    ]
+    assert generator.resource_fetcher.fetched.count(("html",)) == 1
+    assert CacheWarmer(generator).run()["skipped"] == 3
+    assert len(generator.resource_fetcher.fetched) == 2
+
+def test_cached_values_are_frozen_and_shared():
+    """Readers share one read-only copy of a cached value, in memory and through pickling"""
+    cache = ResourceCache()
+    items = [{"title": "Video", "tags": ["react"]}]
+    cache.set("key", items)
+    items[0]["title"] = "Changed by the caller"
+
+    cached = cache.get("key")
+    assert cached is cache.get("key")
+    assert cached == ({"title": "Video", "tags": ("react",)},)
+    for mutate in (lambda: cached[0].update(title="x"), lambda: cached[0].pop("title"),
+                   lambda: cached[0].__setitem__("title", "x")):
+        try:
+            mutate()
+            assert False, "cached value was mutable"
+        except TypeError:
+            pass
+
+    restored = pickle.loads(pickle.dumps(cached))
+    assert restored == cached and isinstance(restored[0], FrozenDict)
+    assert {**cached[0], "title": "Copy"}["title"] == "Copy"
+
+def test_every_store_freezes_what_is_put_into_it():
+    """Writers that bypass ResourceCache.set still store read-only values, in every backend"""
+    path = os.path.join(tempfile.mkdtemp(), "cache.sqlite3")
+    for store in (MemoryCacheStore(max_entries=10, max_bytes=10000),
+                  MemoryCacheStore(max_entries=10, max_bytes=10000, codec=ZlibCodec()),
+                  SQLiteCacheStore(path, max_entries=10, max_bytes=10000)):
+        store.put("key", {"videos": [{"title": "Video"}]}, time.time())
+        data = store.get("key")[0]
+        assert data == {"videos": ({"title": "Video"},)}
+        assert isinstance(data, FrozenDict) and isinstance(data["videos"][0], FrozenDict)
+
+def test_namespace_metrics_and_key_pages():
+    """Lookups, fetches, evictions and bytes are counted per key namespace; keys are paged"""
+    cache = ResourceCache(store=MemoryCacheStore(max_entries=3, max_bytes=10000))
+    cache.get_or_fetch("comprehensive_web_frontend_beginner", lambda: {"videos": [{"title": "Real"}]})
+    cache.get_or_fetch("comprehensive_web_frontend_beginner", lambda: {"videos": []})
+    cache.peek_for("preview", "comprehensive_web_frontend_beginner")
+    cache.peek_for("preview", "comprehensive_web_backend_beginner")
+    cache.get("web_frontend_HTML_beginner")
+    for i in range(3):
+        cache.set(f"web_frontend_Topic{i}_beginner", [{"title": f"Topic {i}"}])
+
+    namespaces = cache.stats()["namespaces"]
+    comprehensive, topic = namespaces["comprehensive"], namespaces["topic"]
+    assert (comprehensive["hits"], comprehensive["misses"], comprehensive["fetches"]) == (1, 1, 1)
+    assert comprehensive["hit_ratio"] == 0.5 and comprehensive["evictions"] == 1
+    assert comprehensive["entries"] == 0 and comprehensive["bytes"] == 0
+    assert (topic["misses"], topic["entries"]) == (1, 3) and topic["bytes"] > 0
+    assert (namespaces["preview"]["hits"], namespaces["preview"]["misses"], namespaces["preview"]["entries"]) == (1, 1, 0)
+
+    page = cache.key_page(namespace="topic", offset=1, limit=1)
+    assert page["total"] == 3 and page["keys"] == ["web_frontend_Topic1_beginner"]
+    assert len(cache.key_page(sample=2)["keys"]) == 2
+
+def test_compressed_store_decodes_on_read():
+    """A compressed store keeps entries as bytes within the budget and reports the ratio"""
+    videos = [{"title": f"Video {i}", "platform": "YouTube", "type": "video", "free": True,
+               "thumbnail": "https://i.ytimg.com/vi/abc/mqdefault.jpg"} for i in range(50)]
+    cache = ResourceCache(store=MemoryCacheStore(max_entries=10, max_bytes=2000, codec=ZlibCodec()))
+    cache.set("provider_youtube_react_beginner_50", videos)
+
+    stats = cache.stats()
+    assert stats["compression"] == "zlib" and stats["bytes"] < 2000
+    assert stats["compression_ratio"] > 5
+    assert isinstance(cache.store.entries["provider_youtube_react_beginner_50"][0], bytes)
+
+    cached = cache.get("provider_youtube_react_beginner_50")
+    assert cached == tuple(videos) and isinstance(cached[0], FrozenDict)
+    assert cache.store.items()[0][1] == cached
+
+if __name__ == "__main__":
+    for test in (test_lru_eviction_within_limits, test_byte_budget_and_sweep, test_sqlite_store_is_shared,
+                 test_snapshot_restores_entries_with_their_timestamps, test_snapshots_of_every_worker_are_merged,
+                 test_get_or_fetch_serves_stale_while_revalidating,
+                 test_fallback_results_use_the_negative_ttl, test_negative_results_are_classified_per_provider_section,
+                 test_background_refresh_spends_quota_as_background_work,
+                 test_cache_warmer_fills_every_catalog_key_and_resumes,
+                 test_cached_values_are_frozen_and_shared, test_every_store_freezes_what_is_put_into_it,
+                 test_namespace_metrics_and_key_pages,
+                 test_compressed_store_decodes_on_read):
+        test()
+        print(f"✅ {test.__name__}")